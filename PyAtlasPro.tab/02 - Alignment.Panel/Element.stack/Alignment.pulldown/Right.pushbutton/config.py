@@ -0,0 +1,5 @@
+from failure_handling import choose_warning_policy
+
+# Shift+Click: choose how Revit warnings raised by Align Right are handled. The
+# setting is shared by every tool that handles Revit warnings.
+choose_warning_policy('Align Right warnings:')
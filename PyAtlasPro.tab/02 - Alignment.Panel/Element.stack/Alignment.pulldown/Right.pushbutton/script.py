@@ -1,7 +1,19 @@
-from element_alignment_utils import align_elements
-from pyrevit import revit
+from element_alignment_utils import align_elements, print_collision_report
+from failure_handling import get_warning_collector, print_failure_summary
+from pyrevit import revit, script
+from tool_profiler import ToolProfile
 
 doc = revit.doc
 selection = revit.get_selection()
 
-align_elements(doc, selection, "right")
\ No newline at end of file
+profile = ToolProfile("Align Right", doc)
+
+try:
+    warnings = get_warning_collector()
+    snapshot = align_elements(doc, selection, "right", profile, warnings)
+
+    output = script.get_output()
+    print_failure_summary(output, warnings)
+    print_collision_report(output, snapshot)
+finally:
+    profile.finish()
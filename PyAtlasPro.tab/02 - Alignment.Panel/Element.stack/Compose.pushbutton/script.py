@@ -0,0 +1,53 @@
+# Import PyRevit
+from pyrevit import forms, revit, script
+
+# Import the layout composer
+from failure_handling import get_warning_collector, print_failure_summary
+from layout_composer import DEFAULT_PIPELINE, LayoutComposer, parse_pipeline, print_composer_report
+from tool_profiler import ToolProfile
+
+# Get the current document
+doc = revit.doc
+
+# Get the selected elements
+selection = revit.get_selection()
+
+# The last pipeline is offered again next time
+config = script.get_config()
+
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Compose Layout', doc)
+
+try:
+    # Check if any elements are selected
+    if not selection or len(selection) < 2:
+        print("Less than two elements selected. Do nothing.")
+    else:
+        pipeline = forms.ask_for_string(default=config.get_option('pipeline', DEFAULT_PIPELINE),
+                                        prompt='Align and Distribute steps in order, separated by commas. '
+                                               'Distribute steps take (anchors), (no overlap) or (gaps):',
+                                        title='Compose Layout')
+        if not pipeline:
+            script.exit()
+        try:
+            steps = parse_pipeline(pipeline)
+        except ValueError as e:
+            forms.alert(str(e), title='Compose Layout')
+            script.exit()
+        config.pipeline = pipeline
+        script.save_config()
+
+        # Read the selection once and run every step against the in-memory positions
+        composer = LayoutComposer(doc, selection).run(steps)
+
+        # Warnings are handled in one pass at commit and listed afterwards
+        warnings = get_warning_collector()
+
+        # Write each element's net move in a single transaction
+        composer.apply(profile, warnings)
+
+        output = script.get_output()
+        print_failure_summary(output, warnings)
+        print_composer_report(output, composer)
+finally:
+    profile.finish()
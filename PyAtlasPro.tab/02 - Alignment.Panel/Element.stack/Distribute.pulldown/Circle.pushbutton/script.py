@@ -1,9 +1,15 @@
 # Import Revit API
-from Autodesk.Revit.DB import Transaction, XYZ, Line, Arc, Curve, ModelCurve, DetailCurve, TextNote, View
-from math import pi, cos, sin
+from Autodesk.Revit.DB import ModelCurve, DetailCurve
+from math import pi
 
 # Import PyRevit
-from pyrevit import revit, DB
+from pyrevit import revit, script, DB
+
+# Import shared location helpers
+from element_location_utils import extract_anchors
+from failure_handling import get_warning_collector, print_failure_summary
+from polar_layout import apply_polar_layout, get_curve_path, get_polar_targets, order_along_path
+from tool_profiler import ToolProfile
 
 # Get the current document
 doc = revit.doc
@@ -11,61 +17,57 @@ doc = revit.doc
 # Get the selected elements
 selection = revit.get_selection()
 
-# Get the active view (you may need to adjust this to get the correct view)
-active_view = doc.ActiveView
+# Turn each element to face the center. Shift+Click to change.
+face_center = script.get_config().get_option('face_center', False)
 
-# Check if any elements are selected
-if not selection or len(selection) < 3:
-    print("Less than three elements selected. Do nothing.")
-else:
-    # Separate the circle and the elements to distribute
-    selected_circle = None
-    elements_to_distribute = []
-    for element in selection:
-        if isinstance(element, (ModelCurve, DetailCurve)) and isinstance(element.GeometryCurve, Arc) and element.GeometryCurve.IsBound == False:
-            selected_circle = element.GeometryCurve
-        else:
-            elements_to_distribute.append(element)
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Distribute Circle', doc)
 
-    if selected_circle is None:
-        print("No circle selected. Do nothing.")
+try:
+    # Get the active view (you may need to adjust this to get the correct view)
+    active_view = doc.ActiveView
+
+    # Check if any elements are selected
+    if not selection or len(selection) < 3:
+        print("Less than three elements selected. Do nothing.")
     else:
-        # Get the center and radius of the circle
-        center = selected_circle.Center
-        radius = selected_circle.Radius
+        # Separate the path (the first circle, arc or ellipse) and the elements to distribute.
+        # Full circles and ellipses start from the top (pi/2 radians or 90 degrees).
+        path = None
+        elements_to_distribute = []
+        for element in selection:
+            if path is None and isinstance(element, (ModelCurve, DetailCurve)):
+                path = get_curve_path(element.GeometryCurve, start_angle=pi / 2)
+                if path is not None:
+                    continue
+            elements_to_distribute.append(element)
+
+        if path is None:
+            print("No circle, arc or ellipse selected. Do nothing.")
+        else:
+            # Read every element's anchor once, skipping elements without a point or curve location
+            anchors = extract_anchors(elements_to_distribute, active_view, include_rotation=face_center)
+
+            # Compute every position along the path in one pass, keeping the elements' order along it
+            anchors = order_along_path(anchors, path)
+            targets = get_polar_targets(path, len(anchors))
+
+            # Warnings are handled in one pass at commit and listed afterwards
+            warnings = get_warning_collector()
 
-        # Calculate the angular distance between each element
-        total_angle = 2 * pi  # Full circle
-        num_gaps = len(elements_to_distribute)
-        angle_between = total_angle / num_gaps
+            # Start a new transaction
+            with profile.transaction('Distribute Elements Along Circle', warnings) as t:
+                t.Start()
 
-        # Start a new transaction
-        with Transaction(doc, 'Distribute Elements Along Circle') as t:
-            t.Start()
+                # Move and turn each element in one write pass, keeping each element's elevation
+                moved, rotated = apply_polar_layout(doc, anchors, targets, keep_elevation=True, face_center=face_center)
 
-            # Distribute each selected element
-            for i, element in enumerate(elements_to_distribute):
-                # Start from the top of the circle (pi/2 radians or 90 degrees)
-                angle = pi / 2 + i * angle_between
-                target_point = XYZ(center.X + radius * cos(angle), center.Y + radius * sin(angle), center.Z)
-                if isinstance(element, TextNote):
-                    # Handle TextNotes
-                    bbox = element.get_BoundingBox(active_view)
-                    if bbox:
-                        center_bbox = (bbox.Min + bbox.Max) / 2
-                        offset = target_point - center_bbox
-                        element.Location.Move(offset)
-                else:
-                    element_location = element.Location
-                    if hasattr(element_location, "Point"):
-                        new_point = XYZ(target_point.X, target_point.Y, element_location.Point.Z)
-                        element.Location.Point = new_point
-                    elif hasattr(element_location, "Curve"):
-                        start_point = element_location.Curve.GetEndPoint(0)
-                        end_point = element_location.Curve.GetEndPoint(1)
-                        new_start_point = XYZ(target_point.X, target_point.Y, start_point.Z)
-                        new_end_point = XYZ(target_point.X, target_point.Y, end_point.Z)
-                        element_location.Curve = Line.CreateBound(new_start_point, new_end_point)
+                # Commit the transaction
+                t.Commit()
 
-            # Commit the transaction
-            t.Commit()
+            print_failure_summary(script.get_output(), warnings)
+            profile.read(len(selection))
+            profile.count('MoveElement', moved)
+            profile.count('RotateElement', rotated)
+finally:
+    profile.finish()
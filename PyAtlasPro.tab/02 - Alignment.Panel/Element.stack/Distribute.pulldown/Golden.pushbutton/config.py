@@ -0,0 +1,20 @@
+from failure_handling import POLICY_OPTIONS, save_warning_policy
+from pyrevit import forms, script
+
+# Shift+Click: choose whether Distribute Golden previews the positions before moving anything
+# or how Revit warnings are handled
+config = script.get_config()
+
+preview_dict = {
+    'Preview Before Applying': True,
+    'Apply Straight Away': False
+}
+choice = forms.CommandSwitchWindow.show(sorted(preview_dict.keys()) + sorted(POLICY_OPTIONS.keys()),
+                                        message='Distribute Golden preview and Revit warnings:')
+
+if choice in POLICY_OPTIONS:
+    # Shared by every tool that handles Revit warnings
+    save_warning_policy(POLICY_OPTIONS[choice])
+elif choice:
+    config.preview = preview_dict[choice]
+    script.save_config()
@@ -1,73 +1,75 @@
-# Import Revit API
-from Autodesk.Revit.DB import Transaction, XYZ
-
 # Import PyRevit
-from pyrevit import revit, DB
+from pyrevit import revit, script, DB
+
+# Import shared location helpers
+from distribute_preview import choose_targets, parse_distances
+from element_location_utils import get_anchor, extract_anchors, move_anchors
+from failure_handling import get_warning_collector, print_failure_summary
+from tool_profiler import ToolProfile
 
 # Golden Ratio
 phi = 1.618033988749895
 
-# Function to convert millimeters to feet
-def mm_to_feet(value):
-    return value * 0.00328084
-
 # Get the current document
 doc = revit.doc
 
 # Get the selected elements
 selection = revit.get_selection()
 
-# Function to get the location point of an element
-def get_location_point(element):
-    element_location = element.Location
-    if hasattr(element_location, "Point"):
-        return element_location.Point
-    elif hasattr(element_location, "Curve"):
-        return element_location.Curve.GetEndPoint(0)
-    else:
-        return None
+# Preview the positions and adjust the distance before anything moves. Shift+Click to change.
+preview = script.get_config().get_option('preview', True)
+
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Distribute Golden', doc)
 
-# Check if any elements are selected
-if not selection or len(selection) < 2:
-    print("Less than two elements selected. Do nothing.")
-else:
-    # Assume the first selected element is the starting point
-    start_element = selection[0]
-    start_point = get_location_point(start_element)
-    if start_point is None:
-        print("Starting element has no point or curve location. Do nothing.")
+try:
+    # Check if any elements are selected
+    if not selection or len(selection) < 2:
+        print("Less than two elements selected. Do nothing.")
     else:
-        # Ask the user for the initial distance in millimeters
-        try:
-            initial_distance_mm = float(input("Enter the initial distance for golden ratio distribution in millimeters: "))
-            initial_distance = mm_to_feet(initial_distance_mm)
-        except ValueError:
-            print("Invalid input. Please enter a numerical value for the initial distance.")
-            exit()
+        # Assume the first selected element is the starting point
+        start_element = selection[0]
+        start_anchor = get_anchor(start_element, doc.ActiveView)
+        if start_anchor is None:
+            print("Starting element has no point or curve location. Do nothing.")
+        else:
+            # Read the remaining elements once, skipping elements without a point or curve location
+            anchors = extract_anchors(selection[1:], doc.ActiveView)
+
+            # Calculate the new position of each element based on the golden ratio
+            def get_targets(values):
+                initial_distance = parse_distances(values)[0]
+                if initial_distance is None:
+                    raise ValueError("Please enter the initial distance in millimeters.")
+                targets = []
+                current_distance = initial_distance
+                for anchor in anchors:
+                    targets.append((start_anchor.x + current_distance, start_anchor.y, start_anchor.z))
+                    current_distance *= phi
+                return targets
 
-        # Start a new transaction
-        with Transaction(doc, 'Golden Ratio Distribution of Elements') as t:
-            t.Start()
+            # Ask the user for the initial distance in millimeters, previewing the result until it is applied
+            targets = choose_targets(doc, revit.uidoc, 'Distribute Golden',
+                                     ["Enter the initial distance for golden ratio distribution in millimeters: "],
+                                     anchors, get_targets, preview)
+            if targets is None:
+                script.exit()
 
-            # Distribute each selected element based on the golden ratio
-            current_distance = initial_distance
-            for element in selection[1:]:
-                element_point = get_location_point(element)
-                if element_point is None:
-                    continue  # Skip elements without a point or curve location
+            # Warnings are handled in one pass at commit and listed afterwards
+            warnings = get_warning_collector()
 
-                # Calculate the new position
-                target_point = XYZ(
-                    start_point.X + current_distance,
-                    start_point.Y,
-                    start_point.Z
-                )
+            # Start a new transaction
+            with profile.transaction('Golden Ratio Distribution of Elements', warnings) as t:
+                t.Start()
 
-                # Move the element to the new position
-                element.Location.Point = target_point
+                # Move each element to its new position
+                moved = move_anchors(doc, anchors, targets)
 
-                # Update the distance for the next element based on the golden ratio
-                current_distance *= phi
+                # Commit the transaction
+                t.Commit()
 
-            # Commit the transaction
-            t.Commit()
+            print_failure_summary(script.get_output(), warnings)
+            profile.read(len(selection))
+            profile.count('MoveElement', moved)
+finally:
+    profile.finish()
@@ -1,12 +1,11 @@
-# Import Revit API
-from Autodesk.Revit.DB import Transaction, XYZ, Line
-
 # Import PyRevit
-from pyrevit import revit, DB
+from pyrevit import revit, script, DB
 
-# Function to convert millimeters to feet
-def mm_to_feet(value):
-    return value * 0.00328084
+# Import shared location helpers
+from distribute_preview import choose_targets, parse_distances
+from element_location_utils import get_anchor, extract_anchors, move_anchors
+from failure_handling import get_warning_collector, print_failure_summary
+from tool_profiler import ToolProfile
 
 # Get the current document
 doc = revit.doc
@@ -14,68 +13,65 @@ doc = revit.doc
 # Get the selected elements
 selection = revit.get_selection()
 
-# Function to get the location point of an element
-def get_location_point(element):
-    element_location = element.Location
-    if hasattr(element_location, "Point"):
-        return element_location.Point
-    elif hasattr(element_location, "Curve"):
-        return element_location.Curve.GetEndPoint(0)
-    else:
-        return None
+# Preview the positions and adjust the distances before anything moves. Shift+Click to change.
+preview = script.get_config().get_option('preview', True)
 
-# Check if any elements are selected
-if not selection or len(selection) < 2:
-    print("Less than two elements selected. Do nothing.")
-else:
-    # Assume the first selected element is the starting point (top-left corner)
-    start_element = selection[0]
-    start_point = get_location_point(start_element)
-    if start_point is None:
-        print("Starting element has no point or curve location. Do nothing.")
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Distribute Grid', doc)
+
+try:
+    # Check if any elements are selected
+    if not selection or len(selection) < 2:
+        print("Less than two elements selected. Do nothing.")
     else:
-        # Ask the user for the horizontal and vertical distances in millimeters
-        try:
-            h_distance_mm = float(input("Enter the horizontal distance between elements in millimeters: "))
-            v_distance_mm = float(input("Enter the vertical distance between elements in millimeters: "))
-            h_distance = mm_to_feet(h_distance_mm)
-            v_distance = mm_to_feet(v_distance_mm)
-        except ValueError:
-            print("Invalid input. Please enter numerical values for the distances.")
-            exit()
+        # Assume the first selected element is the starting point (top-left corner)
+        start_element = selection[0]
+        start_anchor = get_anchor(start_element, doc.ActiveView)
+        if start_anchor is None:
+            print("Starting element has no point or curve location. Do nothing.")
+        else:
+            # Calculate the number of rows and columns for the grid
+            num_elements = len(selection) - 1  # Exclude the starting element
+            num_rows = int(num_elements ** 0.5)
+            num_columns = num_elements // num_rows + (1 if num_elements % num_rows > 0 else 0)
+
+            # Read the remaining elements once, skipping elements without a point or curve location
+            anchors = extract_anchors(selection[1:], doc.ActiveView)
 
-        # Calculate the number of rows and columns for the grid
-        num_elements = len(selection) - 1  # Exclude the starting element
-        num_rows = int(num_elements ** 0.5)
-        num_columns = num_elements // num_rows + (1 if num_elements % num_rows > 0 else 0)
+            # Calculate the new position of each element in a grid pattern
+            def get_targets(values):
+                h_distance, v_distance = parse_distances(values)
+                if h_distance is None or v_distance is None:
+                    raise ValueError("Please enter both distances in millimeters.")
+                targets = []
+                for i in range(len(anchors)):
+                    row, col = divmod(i, num_columns)
+                    targets.append((start_anchor.x + col * h_distance, start_anchor.y + row * v_distance, start_anchor.z))
+                return targets
 
-        # Start a new transaction
-        with Transaction(doc, 'Grid Distribution of Elements') as t:
-            t.Start()
+            # Ask the user for the horizontal and vertical distances in millimeters, previewing the grid until it is applied
+            targets = choose_targets(doc, revit.uidoc, 'Distribute Grid',
+                                     ["Enter the horizontal distance between elements in millimeters: ",
+                                      "Enter the vertical distance between elements in millimeters: "],
+                                     anchors, get_targets, preview)
+            if targets is None:
+                script.exit()
 
-            # Distribute each selected element in a grid pattern
-            row = 0
-            col = 0
-            for element in selection[1:]:
-                element_point = get_location_point(element)
-                if element_point is None:
-                    continue  # Skip elements without a point or curve location
+            # Warnings are handled in one pass at commit and listed afterwards
+            warnings = get_warning_collector()
 
-                # Calculate the new position
-                target_point = XYZ(
-                    start_point.X + col * h_distance,
-                    start_point.Y + row * v_distance,
-                    start_point.Z
-                )
+            # Start a new transaction
+            with profile.transaction('Grid Distribution of Elements', warnings) as t:
+                t.Start()
 
-                # Move the element to the new position
-                element.Location.Point = target_point
+                # Move each element to its new position
+                moved = move_anchors(doc, anchors, targets)
 
-                # Update row and column for the next element
-                col += 1
-                if col >= num_columns:
-                    col = 0
-                    row += 1
+                # Commit the transaction
+                t.Commit()
 
-            # Commit the transaction
-            t.Commit()
+            print_failure_summary(script.get_output(), warnings)
+            profile.read(len(selection))
+            profile.count('MoveElement', moved)
+finally:
+    profile.finish()
@@ -0,0 +1,21 @@
+from failure_handling import POLICY_OPTIONS, save_warning_policy
+from pyrevit import forms, script
+
+# Shift+Click: choose how Distribute Horizontal spaces the selected elements
+# or how Revit warnings are handled
+config = script.get_config()
+
+mode_dict = {
+    'Space Anchor Points Evenly': 'anchors',
+    'Space Anchor Points Evenly, Avoid Overlaps': 'anchors_no_overlap',
+    'Equal Gaps Between Elements': 'gaps'
+}
+choice = forms.CommandSwitchWindow.show(sorted(mode_dict.keys()) + sorted(POLICY_OPTIONS.keys()),
+                                        message='Distribute Horizontal spacing and Revit warnings:')
+
+if choice in POLICY_OPTIONS:
+    # Shared by every tool that handles Revit warnings
+    save_warning_policy(POLICY_OPTIONS[choice])
+elif choice:
+    config.spacing_mode = mode_dict[choice]
+    script.save_config()
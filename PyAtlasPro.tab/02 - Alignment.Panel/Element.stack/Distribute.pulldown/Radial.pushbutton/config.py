@@ -0,0 +1,29 @@
+from failure_handling import POLICY_OPTIONS, save_warning_policy
+from pyrevit import forms, script
+
+# Shift+Click: choose whether Distribute Radial turns the elements to face the center
+# and whether it previews the positions before moving anything, or how Revit
+# warnings are handled
+config = script.get_config()
+
+face_dict = {
+    'Keep Element Rotation': False,
+    'Turn Elements to Face the Center': True
+}
+choice = forms.CommandSwitchWindow.show(sorted(face_dict.keys()) + sorted(POLICY_OPTIONS.keys()),
+                                        message='Distribute Radial rotation and Revit warnings:')
+
+if choice in POLICY_OPTIONS:
+    # Shared by every tool that handles Revit warnings
+    save_warning_policy(POLICY_OPTIONS[choice])
+elif choice:
+    config.face_center = face_dict[choice]
+
+    preview_dict = {
+        'Preview Before Applying': True,
+        'Apply Straight Away': False
+    }
+    choice = forms.CommandSwitchWindow.show(sorted(preview_dict.keys()), message='Distribute Radial preview:')
+    if choice:
+        config.preview = preview_dict[choice]
+    script.save_config()
@@ -1,13 +1,12 @@
-# Import Revit API
-from Autodesk.Revit.DB import Transaction, XYZ, Line
-from math import pi, cos, sin
-
 # Import PyRevit
-from pyrevit import revit, DB
+from pyrevit import revit, script, DB
 
-# Function to convert millimeters to feet
-def mm_to_feet(value):
-    return value * 0.00328084
+# Import shared location helpers
+from distribute_preview import choose_targets, parse_distances
+from element_location_utils import get_anchor, extract_anchors
+from failure_handling import get_warning_collector, print_failure_summary
+from polar_layout import apply_polar_layout, circle_path, get_mean_radius, get_polar_targets, order_along_path
+from tool_profiler import ToolProfile
 
 # Get the current document
 doc = revit.doc
@@ -15,59 +14,69 @@ doc = revit.doc
 # Get the selected elements
 selection = revit.get_selection()
 
-# Function to get the location point of an element
-def get_location_point(element):
-    element_location = element.Location
-    if hasattr(element_location, "Point"):
-        return element_location.Point
-    elif hasattr(element_location, "Curve"):
-        return element_location.Curve.GetEndPoint(0)
-    else:
-        return None
-
-# Check if any elements are selected
-if not selection or len(selection) < 2:
-    print("Less than two elements selected. Do nothing.")
-else:
-    # Assume the first selected element is the center
-    center_element = selection[0]
-    center_point = get_location_point(center_element)
-    if center_point is None:
-        print("Center element has no point or curve location. Do nothing.")
+# Turn each element to face the center. Shift+Click to change.
+config = script.get_config()
+face_center = config.get_option('face_center', False)
+
+# Preview the positions and adjust the radius before anything moves. Shift+Click to change.
+preview = config.get_option('preview', True)
+
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Distribute Radial', doc)
+
+try:
+    # Check if any elements are selected
+    if not selection or len(selection) < 2:
+        print("Less than two elements selected. Do nothing.")
     else:
-        # Ask the user for the fixed distance (radius) in millimeters
-        try:
-            radius_mm = float(input("Enter the fixed distance (radius) for radial distribution in millimeters: "))
-            radius = mm_to_feet(radius_mm)
-        except ValueError:
-            print("Invalid input. Please enter a numerical value for the radius.")
-            exit()
-
-        # Calculate the angular distance between each element
-        total_angle = 2 * pi  # Full circle
-        num_elements = len(selection) - 1  # Exclude the center element
-        angle_between = total_angle / num_elements
-
-        # Start a new transaction
-        with Transaction(doc, 'Radial Distribution of Elements') as t:
-            t.Start()
-
-            # Distribute each selected element radially around the center
-            for i, element in enumerate(selection[1:]):
-                angle = i * angle_between
-                element_point = get_location_point(element)
-                if element_point is None:
-                    continue  # Skip elements without a point or curve location
-
-                # Calculate the new position
-                target_point = XYZ(
-                    center_point.X + radius * cos(angle),
-                    center_point.Y + radius * sin(angle),
-                    center_point.Z
-                )
-
-                # Move the element to the new position
-                element.Location.Point = target_point
-
-            # Commit the transaction
-            t.Commit()
+        # Assume the first selected element is the center
+        center_element = selection[0]
+        center_anchor = get_anchor(center_element, doc.ActiveView)
+        if center_anchor is None:
+            print("Center element has no point or curve location. Do nothing.")
+        else:
+            center = (center_anchor.x, center_anchor.y, center_anchor.z)
+
+            # Read the remaining elements once, skipping elements without a point or curve location
+            anchors = extract_anchors(selection[1:], doc.ActiveView, include_rotation=face_center)
+
+            # Keep the elements' order around the center
+            anchors = order_along_path(anchors, circle_path(center, 1.0))
+
+            # Compute every position on the circle in one pass
+            def get_targets(values):
+                radius = parse_distances(values)[0]
+                if radius is None:
+                    radius = get_mean_radius(anchors, center)
+                if radius <= 0:
+                    raise ValueError("The radius must be greater than zero.")
+                return get_polar_targets(circle_path(center, radius), len(anchors))
+
+            # Ask the user for the fixed distance (radius) in millimeters, previewing the circle until it is applied.
+            # Blank keeps the elements' mean distance.
+            targets = choose_targets(doc, revit.uidoc, 'Distribute Radial',
+                                     ["Enter the fixed distance (radius) for radial distribution in millimeters, "
+                                      "or leave blank to keep the current mean distance: "],
+                                     anchors, get_targets, preview)
+            if targets is None:
+                script.exit()
+
+            # Warnings are handled in one pass at commit and listed afterwards
+            warnings = get_warning_collector()
+
+            # Start a new transaction
+            with profile.transaction('Radial Distribution of Elements', warnings) as t:
+                t.Start()
+
+                # Move and turn each element in one write pass
+                moved, rotated = apply_polar_layout(doc, anchors, targets, face_center=face_center)
+
+                # Commit the transaction
+                t.Commit()
+
+            print_failure_summary(script.get_output(), warnings)
+            profile.read(len(selection))
+            profile.count('MoveElement', moved)
+            profile.count('RotateElement', rotated)
+finally:
+    profile.finish()
@@ -1,8 +1,10 @@
-# Import Revit API
-from Autodesk.Revit.DB import Transaction, XYZ, Line, TextNote, LocationPoint, LocationCurve
-
 # Import PyRevit
-from pyrevit import revit, DB
+from pyrevit import revit, script, DB
+
+# Import shared location helpers
+from element_location_utils import EVEN_ANCHORS, extract_anchors, get_spacing_targets, move_anchors, sort_anchors
+from failure_handling import get_warning_collector, print_failure_summary
+from tool_profiler import ToolProfile
 
 # Get the current document
 doc = revit.doc
@@ -10,59 +12,42 @@ doc = revit.doc
 # Get the selected elements
 selection = revit.get_selection()
 
-# Check if any elements are selected
-if not selection or len(selection) < 3:
-    print("Less than three elements selected. Do nothing.")
-else:
-    # Find the topmost and bottommost Y-coordinates among the selected elements
-    topmost_y = None
-    bottommost_y = None
-    for element in selection:
-        if isinstance(element, TextNote):
-            bbox = element.BoundingBox[doc.ActiveView]
-            y = (bbox.Min.Y + bbox.Max.Y) / 2
+# Evenly spaced anchor points, equal gaps between bounding boxes, or evenly
+# spaced anchor points with overlapping boxes pushed apart. Shift+Click to change.
+spacing_mode = script.get_config().get_option('spacing_mode', EVEN_ANCHORS)
+
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Distribute Vertical', doc)
+
+try:
+    # Check if any elements are selected
+    if not selection or len(selection) < 3:
+        print("Less than three elements selected. Do nothing.")
+    else:
+        # Read every element's anchor once, skipping elements without a point or curve location
+        anchors = sort_anchors(extract_anchors(selection, doc.ActiveView), 'Y')
+
+        if len(anchors) < 3:
+            print("Less than three elements with a location selected. Do nothing.")
         else:
-            element_location = element.Location
-            if isinstance(element_location, LocationPoint):
-                y = element_location.Point.Y
-            elif isinstance(element_location, LocationCurve):
-                y = element_location.Curve.GetEndPoint(0).Y
-            else:
-                continue  # Skip elements without a point or curve location
+            # Space the elements between the bottommost and topmost ones
+            anchors, targets = get_spacing_targets(doc, anchors, 'Y', 'X', spacing_mode)
 
-        if topmost_y is None or y > topmost_y:
-            topmost_y = y
-        if bottommost_y is None or y < bottommost_y:
-            bottommost_y = y
+            # Warnings are handled in one pass at commit and listed afterwards
+            warnings = get_warning_collector()
 
-    # Calculate the distance to distribute each element
-    total_distance = topmost_y - bottommost_y
-    num_gaps = len(selection) - 1
-    distance_between = total_distance / num_gaps
+            # Start a new transaction
+            with profile.transaction('Distribute Elements Vertically', warnings) as t:
+                t.Start()
 
-    # Start a new transaction
-    with Transaction(doc, 'Distribute Elements Vertically') as t:
-        t.Start()
+                # Distribute each selected element
+                moved = move_anchors(doc, anchors, targets)
 
-        # Distribute each selected element
-        for i, element in enumerate(sorted(selection, key=lambda e: e.Location.Point.Y if isinstance(e.Location, LocationPoint) else e.Location.Curve.GetEndPoint(0).Y if isinstance(e.Location, LocationCurve) else 0)):
-            target_y = bottommost_y + i * distance_between
-            if isinstance(element, TextNote):
-                bbox = element.BoundingBox[doc.ActiveView]
-                center_bbox = (bbox.Min + bbox.Max) / 2
-                offset = XYZ(0, target_y - center_bbox.Y, 0)
-                element.Location.Move(offset)
-            else:
-                element_location = element.Location
-                if isinstance(element_location, LocationPoint):
-                    new_point = XYZ(element_location.Point.X, target_y, element_location.Point.Z)
-                    element.Location.Point = new_point
-                elif isinstance(element_location, LocationCurve):
-                    start_point = element_location.Curve.GetEndPoint(0)
-                    end_point = element_location.Curve.GetEndPoint(1)
-                    new_start_point = XYZ(start_point.X, target_y, start_point.Z)
-                    new_end_point = XYZ(end_point.X, target_y, end_point.Z)
-                    element_location.Curve = Line.CreateBound(new_start_point, new_end_point)
+                # Commit the transaction
+                t.Commit()
 
-        # Commit the transaction
-        t.Commit()
+            print_failure_summary(script.get_output(), warnings)
+            profile.read(len(selection))
+            profile.count('MoveElement', moved)
+finally:
+    profile.finish()
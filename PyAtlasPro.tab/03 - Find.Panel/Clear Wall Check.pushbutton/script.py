@@ -0,0 +1,31 @@
+from pyrevit import revit, DB
+from view_filter_utils import get_selection_filter, get_filter_name
+from wall_check_utils import get_highlighted_walls, remember_highlights
+
+doc = revit.doc
+uidoc = revit.uidoc
+current_view = uidoc.ActiveView
+
+# Find the temporary Wall Check filter of the active view
+selection_filter = get_selection_filter(doc, get_filter_name('Wall Check', current_view))
+
+# Walls Wall Check highlighted with per-element overrides in this view during
+# this session; deleted walls are skipped
+overridden_ids = [wall_id for wall_id in get_highlighted_walls(doc, current_view, 'overrides')
+                  if doc.GetElement(DB.ElementId(wall_id)) is not None]
+
+if selection_filter is None and not overridden_ids:
+    print("No Wall Check highlights found in the active view. Do nothing.")
+else:
+    with DB.Transaction(doc, "Clear Wall Check") as t:
+        t.Start()
+        # Deleting the filter removes the filter highlight from the view
+        if selection_filter is not None:
+            doc.Delete(selection_filter.Id)
+        for wall_id in overridden_ids:
+            current_view.SetElementOverrides(DB.ElementId(wall_id), DB.OverrideGraphicSettings())
+        t.Commit()
+
+    # Nothing is highlighted with overrides any more
+    remember_highlights(doc, current_view, 'overrides', [])
+    uidoc.RefreshActiveView()
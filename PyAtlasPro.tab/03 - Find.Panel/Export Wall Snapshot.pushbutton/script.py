@@ -0,0 +1,26 @@
+import os
+
+from pyrevit import revit, script
+from wall_analysis import non_whole_walls, off_axis_walls, room_bounding_walls
+from wall_snapshot import export_wall_snapshot
+
+doc = revit.doc
+output = script.get_output()
+
+# Every wall of the document is read once and written to pyRevit's data folder
+snapshot, path = export_wall_snapshot(doc)
+
+if not snapshot.count:
+    print("No walls in the document. Wrote an empty snapshot.")
+
+output.print_md('**{0}** walls written to `{1}` ({2:.1f} KB)'.format(
+    snapshot.count, path, os.path.getsize(path) / 1024.0))
+
+# The same analyses the Find tools run, straight from the snapshot
+buckets = off_axis_walls(snapshot)
+output.print_table(table_data=[
+    ['Non-whole length', str(len(non_whole_walls(snapshot)))],
+    ['Room-bounding', str(len(room_bounding_walls(snapshot)))],
+    ['Off axis', str(len(buckets['off_axis']))],
+    ['Curved', str(len(buckets['curved']))]
+], title="Walls in Snapshot", columns=['Analysis', 'Walls'])
@@ -1,31 +1,42 @@
-from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, Transaction, BuiltInParameter, ElementId
-from System.Collections.Generic import List
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, BuiltInParameter, ElementId, \
+    ElementParameterFilter, FilterIntegerRule, FilterNumericEquals, ParameterValueProvider
 from pyrevit import revit, DB
+from tool_profiler import ToolProfile
 
 # Get the current document and active view
 doc = revit.doc
 active_view = doc.ActiveView
 
-# Get all walls in the document
-walls = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType().ToElements()
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Bounding Walls', doc)
 
-# Start a new transaction
-with Transaction(doc, 'Isolate Room-Bounding Walls') as t:
-    t.Start()
+# Every run is logged, including those that find nothing to isolate
+try:
+    # Room-bounding test evaluated natively by the collector
+    room_bounding_provider = ParameterValueProvider(ElementId(BuiltInParameter.WALL_ATTR_ROOM_BOUNDING))
+    room_bounding_rule = FilterIntegerRule(room_bounding_provider, FilterNumericEquals(), 1)
+    room_bounding_filter = ElementParameterFilter(room_bounding_rule)
 
-    # List to store the Ids of room-bounding walls
-    room_bounding_wall_ids = List[ElementId]()
+    # Get the Ids of the room-bounding walls visible in the active view, without loading the walls themselves
+    room_bounding_wall_ids = FilteredElementCollector(doc, active_view.Id) \
+        .OfCategory(BuiltInCategory.OST_Walls) \
+        .WhereElementIsNotElementType() \
+        .WherePasses(room_bounding_filter) \
+        .ToElementIds()
 
-    # Iterate over the walls
-    for wall in walls:
-        # Check if the wall is room-bounding
-        is_room_bounding_param = wall.get_Parameter(BuiltInParameter.WALL_ATTR_ROOM_BOUNDING)
-        if is_room_bounding_param and is_room_bounding_param.AsInteger() == 1:
-            # Add the Id of the room-bounding wall to the list
-            room_bounding_wall_ids.Add(wall.Id)
+    if not room_bounding_wall_ids:
+        print("No room-bounding walls in the active view. Do nothing.")
+    else:
+        # Start a new transaction
+        with profile.transaction('Isolate Room-Bounding Walls') as t:
+            t.Start()
 
-    # Isolate the room-bounding walls in the active view
-    active_view.IsolateElementsTemporary(room_bounding_wall_ids)
+            # Isolate the room-bounding walls in the active view
+            active_view.IsolateElementsTemporary(room_bounding_wall_ids)
 
-    # Commit the transaction
-    t.Commit()
+            # Commit the transaction
+            t.Commit()
+
+        profile.read(len(room_bounding_wall_ids))
+finally:
+    profile.finish()
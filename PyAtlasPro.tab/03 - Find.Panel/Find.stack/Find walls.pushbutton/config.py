@@ -0,0 +1,42 @@
+from failure_handling import POLICY_OPTIONS, save_warning_policy
+from pyrevit import revit, forms, script
+from wall_check_utils import collect_view_walls
+
+# Shift+Click: choose how Wall Check highlights the walls it finds and which
+# parameters it lists for them, or how Revit warnings are handled
+config = script.get_config()
+
+mode_dict = {
+    'Highlight with a View Filter': 'filter',
+    'Highlight with Element Overrides': 'overrides'
+}
+export_dict = {
+    'Output Table Only': None,
+    'Export to CSV': 'csv',
+    'Export to JSON Lines': 'jsonl'
+}
+columns_option = 'Choose Table Columns'
+choice = forms.CommandSwitchWindow.show(sorted(mode_dict.keys()) + sorted(export_dict.keys()) + [columns_option] +
+                                        sorted(POLICY_OPTIONS.keys()), message='Wall Check settings:')
+
+if choice in POLICY_OPTIONS:
+    # Shared by every tool that handles Revit warnings
+    save_warning_policy(POLICY_OPTIONS[choice])
+elif choice == columns_option:
+    # Offer the parameters of the first wall in the active view
+    sample_wall = collect_view_walls(revit.doc, revit.uidoc.ActiveView).FirstElement()
+    if sample_wall is None:
+        print("No walls in the active view to read parameters from. Do nothing.")
+    else:
+        parameter_names = sorted(set(p.Definition.Name for p in sample_wall.Parameters))
+        selected_columns = forms.SelectFromList.show(parameter_names, button_name='Select Columns', multiselect=True, title='Select Wall Check Columns')
+        if selected_columns:
+            config.columns = selected_columns
+            script.save_config()
+elif choice in export_dict:
+    # Exports go to pyRevit's data folder unless `export_folder` is set
+    config.export_format = export_dict[choice]
+    script.save_config()
+elif choice:
+    config.highlight_mode = mode_dict[choice]
+    script.save_config()
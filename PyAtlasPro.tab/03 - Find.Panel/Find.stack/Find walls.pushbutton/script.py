@@ -1,56 +1,92 @@
 from pyrevit import revit, DB, script
-from System.Drawing import Color
-
-def is_whole_number(length):
-    return abs(length - round(length)) < 0.01
+from failure_handling import get_warning_collector, print_failure_summary
+from tool_profiler import ToolProfile
+from view_filter_utils import apply_selection_filter, get_filter_name
+from wall_check_utils import DEFAULT_COLUMNS, PREVIEW_ROWS, export_wall_rows, get_export_path, get_flagged_walls, \
+    get_row_cache, get_table_columns, plan_highlights, print_wall_table, remember_highlights, scan_view_walls
 
 doc = revit.doc
 uidoc = revit.uidoc
 current_view = uidoc.ActiveView
 output = script.get_output()
 
-filter = DB.ElementCategoryFilter(DB.BuiltInCategory.OST_Walls)
-walls = DB.FilteredElementCollector(doc, current_view.Id).WherePasses(filter).WhereElementIsNotElementType()
-
-all_walls_info = []
-non_whole_walls_info = []
-output.indeterminate_progress(True)
-
-with DB.Transaction(doc, "Highlight Non-Whole Length Walls") as t:
-    t.Start()
-    output.update_progress
-
-    for wall in walls:
-        wall_params = {}
-        for param in wall.Parameters:
-            if param.HasValue:
-                param_name = param.Definition.Name  # Use parameter name directly
-                wall_params[param_name] = param.AsString() or param.AsValueString()
-
-        length_param = wall.get_Parameter(DB.BuiltInParameter.CURVE_ELEM_LENGTH)
-        if length_param and length_param.HasValue:
-            length = length_param.AsDouble()
-            length_mm = DB.UnitUtils.ConvertFromInternalUnits(length, DB.DisplayUnitType.DUT_MILLIMETERS)
-            wall_params['Length (mm)'] = str(length_mm)
-
-            if not is_whole_number(length_mm):
-                wall_params['ID'] = output.linkify(wall.Id)
-                non_whole_walls_info.append(wall_params)
-                override = DB.OverrideGraphicSettings()
-                override.SetProjectionLineColor(DB.Color(255, 0, 0))
-                override.SetCutLineColor(DB.Color(255, 0, 0))
-                current_view.SetElementOverrides(wall.Id, override)
-
-    t.Commit()
-
-columns = sorted(list(set(param for wall_info in non_whole_walls_info for param in wall_info)))
-table_data = []
-for wall_info in non_whole_walls_info:
-    row = [wall_info.get(column, '') for column in columns]
-    table_data.append(row)
-
-output.print_table(table_data=table_data,
-                   title="Identified Walls",
-                   columns=columns)
-output.indeterminate_progress(False)
-uidoc.RefreshActiveView()
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Find Walls', doc)
+
+try:
+    # 'overrides' sets graphic overrides wall by wall, as the tool always has;
+    # 'filter' highlights every flagged wall through one view filter. Shift+Click
+    # to change the mode and the parameter columns shown in the table.
+    config = script.get_config()
+    highlight_mode = config.get_option('highlight_mode', 'overrides')
+    columns = get_table_columns(config.get_option('columns', DEFAULT_COLUMNS))
+    # 'csv' or 'jsonl' streams every flagged wall to a file and only previews
+    # the first rows in the output window
+    export_format = config.get_option('export_format', None)
+
+    override = DB.OverrideGraphicSettings()
+    override.SetProjectionLineColor(DB.Color(255, 0, 0))
+    override.SetCutLineColor(DB.Color(255, 0, 0))
+
+    # Lengths and table rows are cached per wall for the session; only walls
+    # added or changed since the last run are read again. Parameters are read
+    # for flagged walls only, when the table is printed.
+    view_ids, lengths, changed_ids = scan_view_walls(doc, current_view, output.update_progress)
+    non_whole_walls = get_flagged_walls(view_ids, lengths)
+    non_whole_wall_ids = [wall_id for wall_id, length_mm in non_whole_walls]
+
+    # The file is written as soon as the lengths are known, before any highlight;
+    # flagged walls are loaded again one chunk at a time
+    row_count = 0
+    if export_format:
+        export_path = get_export_path(doc, current_view, export_format, config.get_option('export_folder', None))
+        row_count = export_wall_rows(doc, non_whole_walls, columns, export_path, export_format,
+                                     progress=output.update_progress)
+        output.print_md('Exported **{0}** walls to `{1}`'.format(row_count, export_path))
+
+    # Only highlights that differ from the previous run in this view are touched
+    to_highlight, to_clear, full_refresh = plan_highlights(doc, current_view, highlight_mode, non_whole_wall_ids, changed_ids)
+    # Deleted walls and walls outside the view are left alone
+    to_clear &= set(view_ids)
+
+    # Warnings raised by the highlights are handled in one pass at commit
+    warnings = get_warning_collector()
+    if to_highlight or to_clear or (full_refresh and highlight_mode != 'overrides'):
+        with profile.transaction("Highlight Non-Whole Length Walls", warnings) as t:
+            t.Start()
+
+            selection_filter = None
+            if highlight_mode == 'overrides':
+                for wall_id in to_highlight:
+                    current_view.SetElementOverrides(DB.ElementId(wall_id), override)
+                # Walls that are no longer flagged get their default graphics back
+                for wall_id in to_clear:
+                    current_view.SetElementOverrides(DB.ElementId(wall_id), DB.OverrideGraphicSettings())
+                profile.count('SetElementOverrides', len(to_highlight) + len(to_clear))
+            else:
+                selection_filter = apply_selection_filter(doc, current_view, get_filter_name('Wall Check', current_view),
+                                                          [DB.ElementId(wall_id) for wall_id in non_whole_wall_ids], override)
+
+            t.Commit()
+
+        remember_highlights(doc, current_view, highlight_mode, non_whole_wall_ids,
+                            selection_filter.Id.IntegerValue if selection_filter else None)
+
+    print_failure_summary(output, warnings)
+
+    if len(changed_ids) < len(view_ids):
+        output.print_md('**{0}** of {1} walls changed since the last check.'.format(len(changed_ids), len(view_ids)))
+
+    if export_format:
+        preview = sorted(non_whole_walls)[:PREVIEW_ROWS]
+        title = "Identified Walls (first {0} of {1})".format(len(preview), row_count) \
+            if row_count > len(preview) else "Identified Walls"
+        print_wall_table(output, doc, preview, columns, title=title, rows=get_row_cache(doc, columns))
+    else:
+        print_wall_table(output, doc, non_whole_walls, columns, rows=get_row_cache(doc, columns))
+    output.reset_progress()
+    uidoc.RefreshActiveView()
+
+    profile.read(len(changed_ids))
+finally:
+    profile.finish()
@@ -0,0 +1,29 @@
+from pyrevit import forms, script
+from wall_axis_utils import DEFAULT_TOLERANCE, GRID, PROJECT_NORTH, TRUE_NORTH
+
+# Shift+Click: choose the reference axis, the angle tolerance and whether curved walls are isolated
+config = script.get_config()
+
+reference_dict = {
+    'Measure Against Project North': PROJECT_NORTH,
+    'Measure Against True North': TRUE_NORTH,
+    'Measure Against a Picked Grid': GRID
+}
+tolerance_option = 'Set Angle Tolerance'
+curved_option = 'Include Curved Walls: {}'.format('Yes' if config.get_option('include_curved', True) else 'No')
+
+choice = forms.CommandSwitchWindow.show(sorted(reference_dict.keys()) + [tolerance_option, curved_option], message='Isolate Off Axis settings:')
+
+if choice in reference_dict:
+    config.reference = reference_dict[choice]
+    script.save_config()
+elif choice == tolerance_option:
+    value = forms.ask_for_string(default=str(config.get_option('tolerance', DEFAULT_TOLERANCE)), prompt='Angle tolerance in degrees:', title='Isolate Off Axis')
+    try:
+        config.tolerance = abs(float(value))
+        script.save_config()
+    except (TypeError, ValueError):
+        print("Invalid input. Please enter a numerical value for the tolerance.")
+elif choice == curved_option:
+    config.include_curved = not config.get_option('include_curved', True)
+    script.save_config()
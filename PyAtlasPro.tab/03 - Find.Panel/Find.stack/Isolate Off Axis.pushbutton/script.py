@@ -1,9 +1,15 @@
 # Import Revit API
-from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, ElementId, LocationCurve, Transaction
+from Autodesk.Revit.DB import ElementId, Grid, TemporaryViewMode
 from System.Collections.Generic import List
 
 # Import PyRevit
-from pyrevit import revit, DB
+from pyrevit import revit, DB, script
+
+# Import shared off-axis engine
+from wall_axis_utils import (DEFAULT_TOLERANCE, GRID, OFF_AXIS, ON_AXIS, CURVED, PROJECT_NORTH, forget_isolation,
+                             get_reference_angle, get_wall_buckets, is_own_isolation, remember_isolation)
+from change_tracking import get_revision
+from tool_profiler import ToolProfile
 
 # Get the current document
 doc = revit.doc
@@ -11,35 +17,60 @@ doc = revit.doc
 # Get the active view
 active_view = doc.ActiveView
 
-# Define a tolerance for considering a wall as vertical or horizontal
-tolerance = 1e-3
-
-# Start a new transaction
-with Transaction(doc, 'Isolate Non-Vertical/Non-Horizontal Walls') as t:
-    t.Start()
-
-    # List to store the Ids of non-vertical/non-horizontal walls
-    non_vertical_horizontal_wall_ids = List[ElementId]()
-
-    # Collect all walls in the active view
-    all_walls = FilteredElementCollector(doc, active_view.Id).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType().ToElements()
-
-    # Iterate over all walls in the active view
-    for wall in all_walls:
-        # Get the wall's location curve
-        location_curve = wall.Location
-        if isinstance(location_curve, LocationCurve):
-            # Get the start and end points of the location curve
-            start_point = location_curve.Curve.GetEndPoint(0)
-            end_point = location_curve.Curve.GetEndPoint(1)
-            
-            # Check if the wall is not vertical or horizontal within the tolerance
-            if not (abs(start_point.X - end_point.X) < tolerance or abs(start_point.Y - end_point.Y) < tolerance):
-                # Add the Id of the non-vertical/non-horizontal wall to the list
-                non_vertical_horizontal_wall_ids.Add(wall.Id)
-
-    # Isolate the non-vertical/non-horizontal walls in the active view
-    active_view.IsolateElementsTemporary(non_vertical_horizontal_wall_ids)
-
-    # Commit the transaction
-    t.Commit()
+# Time the run and log it for the Performance Report
+profile = ToolProfile('Isolate Off Axis', doc)
+
+try:
+    # Reference axis, angle tolerance in degrees and whether curved walls are isolated too. Shift+Click to change.
+    config = script.get_config()
+    reference = config.get_option('reference', PROJECT_NORTH)
+    tolerance = float(config.get_option('tolerance', DEFAULT_TOLERANCE))
+    include_curved = config.get_option('include_curved', True)
+
+    if active_view.IsInTemporaryViewMode(TemporaryViewMode.TemporaryHideIsolate) and is_own_isolation(doc, active_view):
+        # A second click turns this tool's isolation off again; an isolation made
+        # by hand or by another tool is replaced instead
+        # The cached walls survive the reset, so the next click reads none
+        revision = get_revision(doc)
+        with profile.transaction('Reset Temporary Hide/Isolate') as t:
+            t.Start()
+            active_view.DisableTemporaryViewMode(TemporaryViewMode.TemporaryHideIsolate)
+            t.Commit()
+        forget_isolation(doc, active_view, revision)
+    else:
+        # Pick the grid to measure against when the reference is a grid
+        grid = None
+        if reference == GRID:
+            grid = revit.pick_element('Pick a grid to use as the reference axis')
+            if not isinstance(grid, Grid):
+                print("No grid picked. Do nothing.")
+                script.exit()
+
+        # Walls are read once per view and cached until one of them changes
+        buckets = get_wall_buckets(doc, active_view, get_reference_angle(doc, reference, grid), tolerance)
+
+        # List to store the Ids of non-vertical/non-horizontal walls
+        wall_ids = List[ElementId](buckets[OFF_AXIS])
+        if include_curved:
+            for wall_id in buckets[CURVED]:
+                wall_ids.Add(wall_id)
+
+        if not wall_ids.Count:
+            print("No off-axis walls in the active view. Do nothing.")
+        else:
+            # Start a new transaction
+            revision = get_revision(doc)
+            with profile.transaction('Isolate Non-Vertical/Non-Horizontal Walls') as t:
+                t.Start()
+
+                # Isolate the non-vertical/non-horizontal walls in the active view
+                active_view.IsolateElementsTemporary(wall_ids)
+
+                # Commit the transaction
+                t.Commit()
+            remember_isolation(doc, active_view, wall_ids, revision)
+
+        # Runs that find nothing to isolate are logged too
+        profile.read(len(buckets[OFF_AXIS]) + len(buckets[CURVED]) + len(buckets[ON_AXIS]))
+finally:
+    profile.finish()
@@ -0,0 +1,51 @@
+from Autodesk.Revit.DB import BuiltInParameter, FilteredElementCollector, WallType
+from pyrevit import revit, forms, script
+from qa_rules import DEFAULT_CATEGORIES, RULES
+from wall_analysis import DEFAULT_TOLERANCE
+from wall_axis_utils import GRID, PROJECT_NORTH, TRUE_NORTH
+
+# Shift+Click: choose what QA Check looks at
+config = script.get_config()
+
+rules_option = 'Choose Rules'
+categories_option = 'Choose Categories'
+reference_dict = {
+    'Measure Against Project North': PROJECT_NORTH,
+    'Measure Against True North': TRUE_NORTH,
+    'Measure Against a Picked Grid': GRID
+}
+tolerance_option = 'Set Angle Tolerance'
+wall_types_option = 'Choose Allowed Wall Types'
+choice = forms.CommandSwitchWindow.show([rules_option, categories_option] + sorted(reference_dict.keys()) +
+                                        [tolerance_option, wall_types_option], message='QA Check settings:')
+
+if choice == rules_option:
+    rule_dict = dict((rule.label, rule.name) for rule in RULES)
+    selected = forms.SelectFromList.show(sorted(rule_dict.keys()), button_name='Select Rules', multiselect=True, title='Select QA Rules')
+    if selected:
+        config.rules = [rule_dict[label] for label in selected]
+        script.save_config()
+elif choice == categories_option:
+    selected = forms.SelectFromList.show(DEFAULT_CATEGORIES, button_name='Select Categories', multiselect=True, title='Select QA Categories')
+    if selected:
+        config.categories = selected
+        script.save_config()
+elif choice in reference_dict:
+    config.reference = reference_dict[choice]
+    script.save_config()
+elif choice == tolerance_option:
+    value = forms.ask_for_string(default=str(config.get_option('tolerance', DEFAULT_TOLERANCE)), prompt='Angle tolerance in degrees:', title='QA Check')
+    if value:
+        try:
+            config.tolerance = abs(float(value))
+            script.save_config()
+        except ValueError:
+            forms.alert('Please enter a number of degrees.')
+elif choice == wall_types_option:
+    # Type names as walls report them in their Name
+    type_names = sorted(set(wall_type.get_Parameter(BuiltInParameter.SYMBOL_NAME_PARAM).AsString()
+                            for wall_type in FilteredElementCollector(revit.doc).OfClass(WallType)))
+    selected = forms.SelectFromList.show(type_names, button_name='Select Wall Types', multiselect=True, title='Select Allowed Wall Types')
+    if selected is not None:
+        config.wall_types = selected
+        script.save_config()
@@ -0,0 +1,67 @@
+from Autodesk.Revit.DB import Grid
+from pyrevit import revit, DB, script
+from qa_rules import DEFAULT_CATEGORIES, collect_qa_elements, get_rules, print_findings_table, run_rules
+from tool_profiler import ToolProfile
+from view_filter_utils import apply_selection_filter, get_filter_name
+from wall_analysis import DEFAULT_TOLERANCE
+from wall_axis_utils import GRID, PROJECT_NORTH, get_reference_angle
+
+doc = revit.doc
+uidoc = revit.uidoc
+current_view = uidoc.ActiveView
+output = script.get_output()
+
+# Time the run and log it for the Performance Report
+profile = ToolProfile('QA Check', doc)
+
+try:
+    # Rules, categories, reference axis, angle tolerance in degrees and allowed
+    # wall type names. Shift+Click to change.
+    config = script.get_config()
+    rules = get_rules(config.get_option('rules', None))
+    reference = config.get_option('reference', PROJECT_NORTH)
+
+    # Pick the grid to measure against when the reference is a grid
+    grid = None
+    if reference == GRID and any(rule.name == 'off_axis' for rule in rules):
+        grid = revit.pick_element('Pick a grid to use as the reference axis')
+        if not isinstance(grid, Grid):
+            print("No grid picked. Do nothing.")
+            script.exit()
+
+    settings = {
+        'reference_angle': get_reference_angle(doc, reference, grid),
+        'tolerance': abs(float(config.get_option('tolerance', DEFAULT_TOLERANCE))),
+        'wall_types': set(config.get_option('wall_types', []))
+    }
+
+    override = DB.OverrideGraphicSettings()
+    override.SetProjectionLineColor(DB.Color(255, 0, 0))
+    override.SetCutLineColor(DB.Color(255, 0, 0))
+
+    # One collector pass; every rule is evaluated on each element as it comes by
+    elements = collect_qa_elements(doc, current_view, config.get_option('categories', DEFAULT_CATEGORIES))
+    element_count = elements.GetElementCount()
+    findings = run_rules(elements, rules, settings, element_count, output.update_progress)
+
+    flagged_ids = []
+    seen = set()
+    for element, rule, value in findings:
+        if element.Id.IntegerValue not in seen:
+            seen.add(element.Id.IntegerValue)
+            flagged_ids.append(element.Id)
+
+    with profile.transaction("Highlight QA Findings") as t:
+        t.Start()
+        apply_selection_filter(doc, current_view, get_filter_name('QA Check', current_view), flagged_ids, override)
+        t.Commit()
+
+    output.print_md('**{0}** findings on **{1}** of {2} elements, {3} rules checked.'.format(
+        len(findings), len(flagged_ids), element_count, len(rules)))
+    print_findings_table(output, findings)
+    output.reset_progress()
+    uidoc.RefreshActiveView()
+
+    profile.read(element_count)
+finally:
+    profile.finish()
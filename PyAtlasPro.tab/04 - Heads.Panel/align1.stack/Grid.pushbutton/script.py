@@ -2,24 +2,22 @@ import clr
 import pyrevit
 
 clr.AddReference('RevitAPI')
-from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, Transaction, View, ViewType, Grid, DatumEnds
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, ElementId, View, ViewType, Grid, DatumEnds
 
-from pyrevit import forms
+from pyrevit import forms, script
+from datum_utils import DatumReport, plan_bubble_changes, apply_bubble_changes, print_datum_report
+from sheet_index import get_sheet_views
+from tool_profiler import ToolProfile
 
 doc = pyrevit.revit.doc
 
 sel_sheets = forms.select_sheets(title='Select Sheets')
 
 if sel_sheets:
-    views = []
-    for sheet in sel_sheets:
-        for view_id in sheet.GetAllPlacedViews():
-            views.append(doc.GetElement(view_id))
-            
     valid_view_types = set([ViewType.Section, ViewType.Elevation, ViewType.ThreeD, ViewType.FloorPlan])
-    valid_views = [v for v in views if v.ViewType in valid_view_types and not v.IsTemplate and v.CanBePrinted]
 
-    view_dict = {v.Name: v for v in valid_views}
+    # Placed views come from a cached sheet index keyed by id; names are prefixed with the sheet number
+    view_dict = get_sheet_views(doc, sel_sheets, valid_view_types)
 
     selected_view_names = forms.SelectFromList.show(sorted(view_dict.keys()), button_name='Select Views', multiselect=True, title='Select Views from Sheets')
 
@@ -31,42 +29,38 @@ if sel_sheets:
         selected_grid_names = forms.SelectFromList.show(sorted(grid_dict.keys()), button_name='Select Grids', multiselect=True, title='Select Grids')
 
         if selected_grid_names:
+            # Requested bubble state and the ends it applies to
             action_dict = {
-                'Turn On Selected Grid Heads': 'Turn On',
-                'Turn Off Selected Grid Heads': 'Turn Off',
-                'Turn On A-Side Grid Heads': 'Turn On A',
-                'Turn Off A-Side Grid Heads': 'Turn Off A',
-                'Turn On B-Side Grid Heads': 'Turn On B',
-                'Turn Off B-Side Grid Heads': 'Turn Off B'
+                'Turn On Selected Grid Heads': (True, [DatumEnds.End0, DatumEnds.End1]),
+                'Turn Off Selected Grid Heads': (False, [DatumEnds.End0, DatumEnds.End1]),
+                'Turn On A-Side Grid Heads': (True, [DatumEnds.End0]),
+                'Turn Off A-Side Grid Heads': (False, [DatumEnds.End0]),
+                'Turn On B-Side Grid Heads': (True, [DatumEnds.End1]),
+                'Turn Off B-Side Grid Heads': (False, [DatumEnds.End1])
             }
             action = forms.CommandSwitchWindow.show(action_dict.keys(), message='Choose action:')
             
             if action:
-                with Transaction(doc, '{} Grid Heads'.format(action_dict[action])) as t:
-                    t.Start()
-                    
-                    for view_name in selected_view_names:
-                        view = view_dict[view_name]
-                        
-                        grids_to_adjust = [grid_dict[grid_name] for grid_name in selected_grid_names]
-                        
-                        for grid in grids_to_adjust:
-                            if grid.CanBeVisibleInView(view):
-                                if 'On' in action:
-                                    if 'A' in action:
-                                        grid.ShowBubbleInView(DatumEnds.End0, view)
-                                    elif 'B' in action:
-                                        grid.ShowBubbleInView(DatumEnds.End1, view)
-                                    else:
-                                        grid.ShowBubbleInView(DatumEnds.End0, view)
-                                        grid.ShowBubbleInView(DatumEnds.End1, view)
-                                else:
-                                    if 'A' in action:
-                                        grid.HideBubbleInView(DatumEnds.End0, view)
-                                    elif 'B' in action:
-                                        grid.HideBubbleInView(DatumEnds.End1, view)
-                                    else:
-                                        grid.HideBubbleInView(DatumEnds.End0, view)
-                                        grid.HideBubbleInView(DatumEnds.End1, view)
-                    
-                    t.Commit()
+                visible, ends = action_dict[action]
+                views_to_adjust = [doc.GetElement(ElementId(view_dict[view_name])) for view_name in selected_view_names]
+                grids_to_adjust = [grid_dict[grid_name] for grid_name in selected_grid_names]
+
+                # Only the bubbles that are not already in the requested state are touched
+                profile = ToolProfile('Grid Heads', doc)
+                try:
+                    report = DatumReport()
+                    pending = plan_bubble_changes(grids_to_adjust, views_to_adjust, ends, visible, report)
+
+                    if pending:
+                        with profile.transaction(action) as t:
+                            t.Start()
+                            apply_bubble_changes(pending, visible, report)
+                            t.Commit()
+
+                    print_datum_report(script.get_output(), report, 'Grid')
+
+                    # ShowBubbleInView or HideBubbleInView calls, whichever the action makes
+                    profile.read(len(grids_to_adjust) * len(views_to_adjust))
+                    profile.count('ShowBubbleInView' if visible else 'HideBubbleInView', report.attempted)
+                finally:
+                    profile.finish()
@@ -2,24 +2,22 @@ import clr
 import pyrevit
 
 clr.AddReference('RevitAPI')
-from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, Transaction, View, ViewType, Level, DatumEnds
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, ElementId, View, ViewType, Level, DatumEnds
 
-from pyrevit import forms
+from pyrevit import forms, script
+from datum_utils import DatumReport, plan_bubble_changes, apply_bubble_changes, print_datum_report
+from sheet_index import get_sheet_views
+from tool_profiler import ToolProfile
 
 doc = pyrevit.revit.doc
 
 sel_sheets = forms.select_sheets(title='Select Sheets')
 
 if sel_sheets:
-    views = []
-    for sheet in sel_sheets:
-        for view_id in sheet.GetAllPlacedViews():
-            views.append(doc.GetElement(view_id))
-            
     valid_view_types = set([ViewType.Section, ViewType.Elevation, ViewType.ThreeD, ViewType.FloorPlan])
-    valid_views = [v for v in views if v.ViewType in valid_view_types and not v.IsTemplate and v.CanBePrinted]
 
-    view_dict = {v.Name: v for v in valid_views}
+    # Placed views come from a cached sheet index keyed by id; names are prefixed with the sheet number
+    view_dict = get_sheet_views(doc, sel_sheets, valid_view_types)
 
     selected_view_names = forms.SelectFromList.show(sorted(view_dict.keys()), button_name='Select Views', multiselect=True, title='Select Views from Sheets')
 
@@ -31,42 +29,38 @@ if sel_sheets:
         selected_level_names = forms.SelectFromList.show(sorted(level_dict.keys()), button_name='Select Levels', multiselect=True, title='Select Levels')
 
         if selected_level_names:
+            # Requested bubble state and the ends it applies to
             action_dict = {
-                'Turn On All Level Heads': 'Turn On All',
-                'Turn Off All Level Heads': 'Turn Off All',
-                'Turn On Left Level Heads': 'Turn On Left',
-                'Turn Off Left Level Heads': 'Turn Off Left',
-                'Turn On Right Level Heads': 'Turn On Right',
-                'Turn Off Right Level Heads': 'Turn Off Right'
+                'Turn On All Level Heads': (True, [DatumEnds.End0, DatumEnds.End1]),
+                'Turn Off All Level Heads': (False, [DatumEnds.End0, DatumEnds.End1]),
+                'Turn On Left Level Heads': (True, [DatumEnds.End0]),
+                'Turn Off Left Level Heads': (False, [DatumEnds.End0]),
+                'Turn On Right Level Heads': (True, [DatumEnds.End1]),
+                'Turn Off Right Level Heads': (False, [DatumEnds.End1])
             }
             action = forms.CommandSwitchWindow.show(action_dict.keys(), message='Choose action:')
             
             if action:
-                with Transaction(doc, '{} Level Heads'.format(action_dict[action])) as t:
-                    t.Start()
-                    
-                    for view_name in selected_view_names:
-                        view = view_dict[view_name]
-                        
-                        levels_to_adjust = [level_dict[level_name] for level_name in selected_level_names]
-                        
-                        for level in levels_to_adjust:
-                            try:
-                                if 'All' in action or 'Left' in action:
-                                    if 'On' in action:
-                                        level.ShowBubbleInView(DatumEnds.End0, view)
-                                    else:
-                                        level.HideBubbleInView(DatumEnds.End0, view)
-                            except:
-                                pass
-                            
-                            try:
-                                if 'All' in action or 'Right' in action:
-                                    if 'On' in action:
-                                        level.ShowBubbleInView(DatumEnds.End1, view)
-                                    else:
-                                        level.HideBubbleInView(DatumEnds.End1, view)
-                            except:
-                                pass
-                    
-                    t.Commit()
+                visible, ends = action_dict[action]
+                views_to_adjust = [doc.GetElement(ElementId(view_dict[view_name])) for view_name in selected_view_names]
+                levels_to_adjust = [level_dict[level_name] for level_name in selected_level_names]
+
+                # Only the bubbles that are not already in the requested state are touched
+                profile = ToolProfile('Level Heads', doc)
+                try:
+                    report = DatumReport()
+                    pending = plan_bubble_changes(levels_to_adjust, views_to_adjust, ends, visible, report)
+
+                    if pending:
+                        with profile.transaction(action) as t:
+                            t.Start()
+                            apply_bubble_changes(pending, visible, report)
+                            t.Commit()
+
+                    print_datum_report(script.get_output(), report, 'Level')
+
+                    # ShowBubbleInView or HideBubbleInView calls, whichever the action makes
+                    profile.read(len(levels_to_adjust) * len(views_to_adjust))
+                    profile.count('ShowBubbleInView' if visible else 'HideBubbleInView', report.attempted)
+                finally:
+                    profile.finish()
@@ -0,0 +1,57 @@
+import pyrevit
+
+from pyrevit import forms, script
+from tool_profiler import ToolProfile
+from viewport_alignment import (MATCH_NAME_PATTERN, MATCH_VIEW_TYPE, apply_viewport_alignment, parse_name_patterns,
+                                plan_viewport_alignment, print_viewport_report, record_moved_outlines)
+
+doc = pyrevit.revit.doc
+
+# The last name patterns are offered again next time
+config = script.get_config()
+
+reference_sheet = forms.select_sheets(title='Select Reference Sheet', multiple=False)
+
+if reference_sheet:
+    target_sheets = forms.select_sheets(title='Select Sheets to Align')
+
+    if target_sheets:
+        mode_dict = {
+            'Match Viewports by View Type': MATCH_VIEW_TYPE,
+            'Match Viewports by View Name Pattern': MATCH_NAME_PATTERN
+        }
+        choice = forms.CommandSwitchWindow.show(sorted(mode_dict.keys()), message='Match viewports:')
+
+        patterns = []
+        if choice and mode_dict[choice] == MATCH_NAME_PATTERN:
+            text = forms.ask_for_string(default=config.get_option('name_patterns', '*Plan*'),
+                                        prompt='View name patterns separated by semicolons, * and ? as wildcards:',
+                                        title='Align Viewports')
+            patterns = parse_name_patterns(text or '')
+            if patterns:
+                config.name_patterns = text
+                script.save_config()
+            else:
+                choice = None
+
+        if choice:
+            # Box centers come from outlines cached per viewport, so repeat runs only read what changed
+            profile = ToolProfile('Align Viewports', doc)
+            try:
+                plan = plan_viewport_alignment(doc, reference_sheet, target_sheets, mode_dict[choice], patterns)
+
+                if plan.viewport_ids:
+                    with profile.transaction('Align Viewports') as t:
+                        t.Start()
+                        apply_viewport_alignment(doc, plan)
+                        t.Commit()
+                    record_moved_outlines(doc, plan)
+
+                print_viewport_report(script.get_output(), plan)
+
+                # GetBoxOutline, MoveElement and MoveElements calls
+                profile.read(plan.matched)
+                profile.count('GetBoxOutline', plan.outline_reads)
+                profile.count('MoveElement', plan.move_calls)
+            finally:
+                profile.finish()
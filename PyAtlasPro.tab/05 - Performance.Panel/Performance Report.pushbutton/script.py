@@ -0,0 +1,26 @@
+from pyrevit import script
+from tool_profiler import KEY_CALLS, get_log_path, read_log, summarize_log
+
+output = script.get_output()
+
+# Every PyAtlasPro tool appends one record per run to the shared log
+records = read_log()
+
+if not records:
+    print("No PyAtlasPro tool runs have been logged yet. Do nothing.")
+else:
+    rows = summarize_log(records)
+    table_data = [[tool, size_bucket, element_bucket, str(runs), '{0:.3f}'.format(p50), '{0:.3f}'.format(p95)]
+                  for tool, size_bucket, element_bucket, runs, p50, p95 in rows]
+    output.print_md('**{0}** runs logged in `{1}`'.format(len(records), get_log_path()))
+    output.print_table(table_data=table_data, title="Run Time per Tool",
+                       columns=['Tool', 'Document Size', 'Elements', 'Runs', 'p50 (s)', 'p95 (s)'])
+
+    # Key Revit API calls summed per tool
+    totals = {}
+    for record in records:
+        calls = totals.setdefault(record.get('tool', ''), dict((name, 0) for name in KEY_CALLS))
+        for name in KEY_CALLS:
+            calls[name] += record.get('calls', {}).get(name, 0)
+    call_data = [[tool] + [str(totals[tool][name]) for name in KEY_CALLS] for tool in sorted(totals)]
+    output.print_table(table_data=call_data, title="Revit API Calls per Tool", columns=['Tool'] + list(KEY_CALLS))
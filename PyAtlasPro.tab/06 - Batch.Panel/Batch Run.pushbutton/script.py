@@ -0,0 +1,43 @@
+from pyrevit import HOST_APP, forms, script
+from batch_operations import OPERATIONS, RevitDocumentOpener, get_operations
+from batch_queue import DONE, FAILED, load_checkpoint, run_batch, BatchQueue
+from session_cache import clear_document_caches
+
+output = script.get_output()
+
+output_folder = forms.pick_folder(title='Select Output Folder')
+if not output_folder:
+    script.exit()
+
+# An unfinished batch in the same folder can pick up where it stopped
+restart = False
+checkpoint = load_checkpoint(output_folder)
+unfinished = [path for path in checkpoint['order'] if checkpoint['models'][path]['status'] != DONE] if checkpoint else []
+if unfinished and forms.alert('{0} of {1} models of the last batch in this folder are unfinished. Resume it?'.format(
+        len(unfinished), len(checkpoint['order'])), yes=True, no=True):
+    model_paths = checkpoint['order']
+    operation_names = checkpoint['operations']
+else:
+    restart = True
+    model_paths = forms.pick_file(file_ext='rvt', multi_file=True, title='Select Models')
+    if not model_paths:
+        script.exit()
+    label_dict = dict((operation.label, operation.name) for operation in OPERATIONS)
+    selected_labels = forms.SelectFromList.show(sorted(label_dict.keys()), button_name='Select Operations', multiselect=True, title='Select Batch Operations')
+    if not selected_labels:
+        script.exit()
+    operation_names = [label_dict[label] for label in selected_labels]
+
+operations = get_operations(operation_names)
+queue = BatchQueue(model_paths, [operation.name for operation in operations], output_folder, restart=restart)
+
+# One model open at a time; its session caches are dropped once it is closed
+run_batch(queue, RevitDocumentOpener(HOST_APP.app), operations, output.update_progress, clear_document_caches)
+output.reset_progress()
+
+table_data = [[path, queue.get_model(path)['status'], str(queue.get_model(path)['attempts']),
+               queue.get_model(path).get('results') or queue.get_model(path).get('error') or '']
+              for path in queue.state['order']]
+counts = queue.get_counts()
+output.print_md('**{0}** models done, **{1}** failed. Checkpoint: `{2}`'.format(counts[DONE], counts[FAILED], queue.checkpoint_path))
+output.print_table(table_data=table_data, title="Batch Run", columns=['Model', 'Status', 'Attempts', 'Results / Error'])
@@ -0,0 +1,91 @@
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, BuiltInParameter, DatumEnds, ElementId, \
+    ElementParameterFilter, FilterIntegerRule, FilterNumericEquals, ParameterValueProvider, Transaction, ViewSheet, ViewType
+
+from batch_queue import BatchOperation
+from datum_utils import DatumReport, plan_bubble_changes, apply_bubble_changes
+from sheet_index import get_sheet_views
+from wall_check_utils import CSV, DEFAULT_COLUMNS, export_wall_rows, find_non_whole_walls
+
+# Batch versions of the Find and Heads tools. A background document has no
+# active view, so they work on the whole model instead of one view.
+
+# Views the Heads tools adjust, as in the Level and Grid buttons
+HEAD_VIEW_TYPES = set([ViewType.Section, ViewType.Elevation, ViewType.ThreeD, ViewType.FloorPlan])
+
+def _find_walls(doc, output_prefix):
+    walls = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType()
+    non_whole_walls = find_non_whole_walls(walls)
+    loaded = dict((wall.Id.IntegerValue, wall) for wall, length_mm in non_whole_walls)
+    flagged = [(wall.Id.IntegerValue, length_mm) for wall, length_mm in non_whole_walls]
+    export_path = output_prefix + ' - Find Walls.csv'
+    export_wall_rows(doc, flagged, DEFAULT_COLUMNS, export_path, CSV, loaded=loaded)
+    return {'non_whole_walls': len(flagged), 'export': export_path}
+
+def _bounding_walls(doc, output_prefix):
+    # Temporary isolation does not outlive the document, so the ids are reported instead
+    room_bounding_provider = ParameterValueProvider(ElementId(BuiltInParameter.WALL_ATTR_ROOM_BOUNDING))
+    room_bounding_filter = ElementParameterFilter(FilterIntegerRule(room_bounding_provider, FilterNumericEquals(), 1))
+    wall_ids = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType() \
+        .WherePasses(room_bounding_filter).ToElementIds()
+    return {'room_bounding_walls': sorted(wall_id.IntegerValue for wall_id in wall_ids)}
+
+def _show_heads(category, label):
+    # Both heads on in every printable view placed on a sheet
+    def run(doc, output_prefix):
+        sheets = FilteredElementCollector(doc).OfClass(ViewSheet).ToElements()
+        view_ids = get_sheet_views(doc, sheets, HEAD_VIEW_TYPES).values()
+        views = [doc.GetElement(ElementId(view_id)) for view_id in sorted(set(view_ids))]
+        datums = FilteredElementCollector(doc).OfCategory(category).WhereElementIsNotElementType().ToElements()
+        report = DatumReport()
+        pending = plan_bubble_changes(datums, views, [DatumEnds.End0, DatumEnds.End1], True, report)
+        if pending:
+            with Transaction(doc, 'Turn On All {0} Heads'.format(label)) as t:
+                t.Start()
+                apply_bubble_changes(pending, True, report)
+                t.Commit()
+        return {'changed': len(report.changed), 'skipped': len(report.skipped),
+                'failed': [[datum.Name, view.Name, '' if end is None else str(end), reason] for datum, view, end, reason in report.failed]}
+    return run
+
+OPERATIONS = [
+    BatchOperation('find_walls', 'Find Walls (CSV export)', _find_walls),
+    BatchOperation('bounding_walls', 'Bounding Walls (id list)', _bounding_walls),
+    BatchOperation('level_heads', 'Turn On All Level Heads', _show_heads(BuiltInCategory.OST_Levels, 'Level'), True),
+    BatchOperation('grid_heads', 'Turn On All Grid Heads', _show_heads(BuiltInCategory.OST_Grids, 'Grid'), True)
+]
+
+def get_operations(names=None):
+    return [operation for operation in OPERATIONS if names is None or operation.name in names]
+
+class RevitDocumentOpener(object):
+    # Opens models in the background without a window. Workshared models are
+    # detached with all worksets open so the central file is never touched
+    # and no element is missed.
+    def __init__(self, app):
+        self.app = app
+
+    def open(self, path):
+        from Autodesk.Revit.DB import BasicFileInfo, DetachFromCentralOption, ModelPathUtils, OpenOptions, \
+            WorksetConfiguration, WorksetConfigurationOption
+
+        options = OpenOptions()
+        if BasicFileInfo.Extract(path).IsWorkshared:
+            options.DetachFromCentralOption = DetachFromCentralOption.DetachAndPreserveWorksets
+            options.SetOpenWorksetsConfiguration(WorksetConfiguration(WorksetConfigurationOption.OpenAllWorksets))
+        return self.app.OpenDocumentFile(ModelPathUtils.ConvertUserVisiblePathToModelPath(path), options)
+
+    def close(self, doc, save_path=None):
+        # Changed models are saved as copies in the output folder, never over the original
+        if save_path:
+            from Autodesk.Revit.DB import SaveAsOptions, WorksharingSaveAsOptions
+
+            options = SaveAsOptions()
+            options.OverwriteExistingFile = True
+            if doc.IsWorkshared:
+                # A detached workshared model can only be saved as a new central model
+                worksharing_options = WorksharingSaveAsOptions()
+                worksharing_options.SaveAsCentral = True
+                options.SetWorksharingOptions(worksharing_options)
+            doc.SaveAs(save_path, options)
+        doc.Close(False)
+        return save_path
@@ -0,0 +1,152 @@
+# Queue of model paths worked through one document at a time. Progress is
+# saved to a checkpoint file in the output folder after every step, so a
+# batch cut short by a crash resumes with the first unfinished model.
+# Nothing here touches the Revit API: documents come from an opener with
+#
+#   open(path) -> document
+#   close(document, save_path=None) -> saved path or None
+#
+# and operations are BatchOperation objects, so the queue runs the same
+# against Revit and against stand-in documents.
+import json
+import os
+import re
+import time
+
+CHECKPOINT_FILE = 'batch_checkpoint.json'
+
+# A model that took Revit down this many times is not opened again
+MAX_ATTEMPTS = 2
+
+# Model states in the checkpoint
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+class BatchOperation(object):
+    # `run(doc, output_prefix)` returns a JSON serializable result. Files the
+    # operation writes start with `output_prefix`. Operations that `modify`
+    # the model run inside their own transaction and get the model saved.
+    def __init__(self, name, label, run, modifies=False):
+        self.name = name
+        self.label = label
+        self.run = run
+        self.modifies = modifies
+
+def get_model_name(path):
+    # File name without extension, safe to build output file names from
+    name = os.path.splitext(os.path.basename(path))[0]
+    return re.sub(r'[^\w\- ]+', '_', name) or 'model'
+
+def _write_json(path, data):
+    # Written to a temporary file first so a crash never leaves half a checkpoint
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temp_path, path)
+
+def load_checkpoint(output_folder):
+    # State of the batch last run into `output_folder`, or None
+    path = os.path.join(output_folder, CHECKPOINT_FILE)
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+class BatchQueue(object):
+    # Models already done in the checkpoint of `output_folder` are skipped
+    # unless `restart` is set
+    def __init__(self, paths, operation_names, output_folder, restart=False):
+        self.output_folder = output_folder
+        self.checkpoint_path = os.path.join(output_folder, CHECKPOINT_FILE)
+        self.operation_names = list(operation_names)
+        self.state = None if restart else load_checkpoint(output_folder)
+        # A checkpoint of another set of operations starts over
+        if self.state is None or self.state['operations'] != self.operation_names:
+            self.state = {'operations': self.operation_names, 'models': {}, 'order': []}
+        for path in paths:
+            if path not in self.state['models']:
+                self.state['models'][path] = {'status': PENDING, 'attempts': 0}
+                self.state['order'].append(path)
+        # Models still 'running' were open when the last batch died
+        for model in self.state['models'].values():
+            if model['status'] == RUNNING and model['attempts'] >= MAX_ATTEMPTS:
+                model['status'] = FAILED
+                model['error'] = 'Processing stopped {0} times on this model'.format(model['attempts'])
+        self.save()
+
+    def save(self):
+        _write_json(self.checkpoint_path, self.state)
+
+    def get_model(self, path):
+        return self.state['models'][path]
+
+    def get_pending(self):
+        return [path for path in self.state['order']
+                if self.state['models'][path]['status'] != DONE
+                and self.state['models'][path]['attempts'] < MAX_ATTEMPTS]
+
+    def start(self, path):
+        # Saved before the model is opened, so a crash counts as an attempt
+        model = self.get_model(path)
+        model['status'] = RUNNING
+        model['attempts'] += 1
+        model['started'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        self.save()
+
+    def finish(self, path, status, **fields):
+        model = self.get_model(path)
+        model['status'] = status
+        model.update(fields)
+        self.save()
+
+    def get_counts(self):
+        counts = dict((status, 0) for status in (PENDING, RUNNING, DONE, FAILED))
+        for model in self.state['models'].values():
+            counts[model['status']] += 1
+        return counts
+
+def run_batch(queue, opener, operations, progress=None, on_closed=None):
+    # Opens, processes and closes the pending models one after the other so
+    # only one is ever open. `on_closed(doc)` runs after every close, e.g. to
+    # drop session caches of the document. Returns the paths processed.
+    pending = queue.get_pending()
+    for i, path in enumerate(pending):
+        if progress:
+            progress(i, len(pending))
+        queue.start(path)
+        output_prefix = os.path.join(queue.output_folder, get_model_name(path))
+        doc = None
+        try:
+            doc = opener.open(path)
+            results = {}
+            for operation in operations:
+                results[operation.name] = operation.run(doc, output_prefix)
+            save_path = None
+            if any(operation.modifies for operation in operations):
+                save_path = output_prefix + os.path.splitext(path)[1]
+            closing, doc = doc, None
+            saved_path = opener.close(closing, save_path)
+            if on_closed:
+                on_closed(closing)
+            result_path = output_prefix + '.json'
+            _write_json(result_path, {'model': path, 'operations': queue.operation_names, 'results': results})
+            queue.finish(path, DONE, results=result_path, saved=saved_path, error=None)
+        except Exception as e:
+            if doc is not None:
+                try:
+                    opener.close(doc, None)
+                    if on_closed:
+                        on_closed(doc)
+                except Exception:
+                    pass
+            queue.finish(path, FAILED, error=str(e))
+    if progress:
+        progress(len(pending), len(pending))
+    return pending
@@ -0,0 +1,71 @@
+from session_cache import clear_document_caches, get_session_cache, get_document_key
+
+# Changed ids kept per document, summed over the journal; older history is
+# dropped and callers rebuild instead
+MAX_JOURNAL_IDS = 200000
+
+def _get_journal(doc):
+    journals = get_session_cache('change_journals')
+    key = get_document_key(doc)
+    if key not in journals:
+        journals[key] = {'revision': 0, 'oldest': 0, 'size': 0, 'changes': []}
+    return journals[key]
+
+def _id_values(element_ids):
+    return tuple(element_id.IntegerValue for element_id in element_ids)
+
+def _on_document_changed(sender, args):
+    # Only the revision and the added, modified and deleted ids are kept, as
+    # tuples: a change can touch a whole model and sets cost several times more
+    journal = _get_journal(args.GetDocument())
+    journal['revision'] += 1
+    change = (journal['revision'],
+              _id_values(args.GetAddedElementIds()),
+              _id_values(args.GetModifiedElementIds()),
+              _id_values(args.GetDeletedElementIds()))
+    journal['changes'].append(change)
+    journal['size'] += len(change[1]) + len(change[2]) + len(change[3])
+    dropped = 0
+    while journal['size'] > MAX_JOURNAL_IDS:
+        revision, added, modified, deleted = journal['changes'][dropped]
+        journal['size'] -= len(added) + len(modified) + len(deleted)
+        journal['oldest'] = revision
+        dropped += 1
+    if dropped:
+        del journal['changes'][:dropped]
+
+def _on_document_closing(sender, args):
+    # The journal goes with the document, and so does everything cached from
+    # it: a reopened model starts a new history the old revisions mean nothing in
+    clear_document_caches(args.Document)
+
+def start_tracking(doc):
+    # Subscribe to DocumentChanged and DocumentClosing once per Revit session.
+    # Documents changed before this call have no history, which
+    # get_changes_since reports as None.
+    state = get_session_cache('change_tracking')
+    if not state.get('subscribed'):
+        doc.Application.DocumentChanged += _on_document_changed
+        doc.Application.DocumentClosing += _on_document_closing
+        state['subscribed'] = True
+    journal = _get_journal(doc)
+    if 'tracked_from' not in journal:
+        journal['tracked_from'] = journal['revision']
+
+def get_revision(doc):
+    return _get_journal(doc)['revision']
+
+def get_changes_since(doc, revision):
+    # Returns (added, modified, deleted) sets of integer ids changed after
+    # `revision`, or None when that part of the history is not known
+    journal = _get_journal(doc)
+    if 'tracked_from' not in journal or revision < max(journal['oldest'], journal['tracked_from']):
+        return None
+    added, modified, deleted = set(), set(), set()
+    for change_revision, change_added, change_modified, change_deleted in reversed(journal['changes']):
+        if change_revision <= revision:
+            break
+        added.update(change_added)
+        modified.update(change_modified)
+        deleted.update(change_deleted)
+    return added, modified, deleted
@@ -0,0 +1,185 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from session_cache import get_document_cache
+
+# Adaptive sampling stops splitting a span once the two half chords add up to
+# the full chord within SAMPLE_TOLERANCE and are equally long within
+# SPEED_TOLERANCE (so the parameter can be interpolated linearly inside the
+# span), or at MAX_DEPTH halvings.
+SAMPLE_TOLERANCE = 1e-5
+SPEED_TOLERANCE = 1e-3
+MIN_DEPTH = 3
+MAX_DEPTH = 12
+
+# End points closer than this (in feet) are treated as connected
+CONNECT_TOLERANCE = 1e-3
+
+class LengthTable(object):
+    # Cumulative arc length of one curve at increasing normalized parameters.
+    # `signature` is used to detect that the cached curve has since been edited.
+    __slots__ = ('params', 'lengths', 'signature')
+
+    def __init__(self, params, lengths, signature):
+        self.params = params
+        self.lengths = lengths
+        self.signature = signature
+
+    @property
+    def total(self):
+        return self.lengths[-1]
+
+    def param_at(self, distance):
+        # Binary search for the sample span, then interpolate inside it
+        lengths = self.lengths
+        i = bisect_left(lengths, distance)
+        if i <= 0:
+            return self.params[0]
+        if i >= len(lengths):
+            return self.params[-1]
+        span = lengths[i] - lengths[i - 1]
+        ratio = (distance - lengths[i - 1]) / span if span else 0.0
+        return self.params[i - 1] + ratio * (self.params[i] - self.params[i - 1])
+
+def _evaluate(curve, t):
+    # Normalized evaluation; unbound (closed) curves are walked over one period
+    if curve.IsBound:
+        return curve.Evaluate(t, True)
+    return curve.Evaluate(t * curve.Period, False)
+
+def _distance(a, b):
+    return ((a.X - b.X) ** 2 + (a.Y - b.Y) ** 2 + (a.Z - b.Z) ** 2) ** 0.5
+
+def _sample(evaluate, t0, p0, t1, p1, depth, params, lengths):
+    tm = (t0 + t1) / 2.0
+    pm = evaluate(tm)
+    left = _distance(p0, pm)
+    right = _distance(pm, p1)
+    chord = _distance(p0, p1)
+    scale = max(left + right, 1e-9)
+    settled = (abs(left + right - chord) <= SAMPLE_TOLERANCE * scale and
+               abs(left - right) <= SPEED_TOLERANCE * scale)
+    if depth >= MAX_DEPTH or (depth >= MIN_DEPTH and settled):
+        lengths.append(lengths[-1] + left)
+        params.append(tm)
+        lengths.append(lengths[-1] + right)
+        params.append(t1)
+        return
+    _sample(evaluate, t0, p0, tm, pm, depth + 1, params, lengths)
+    _sample(evaluate, tm, pm, t1, p1, depth + 1, params, lengths)
+
+def get_curve_signature(curve):
+    # Start and middle point; cheap to read and changes whenever the curve is edited
+    start = _evaluate(curve, 0.0)
+    middle = _evaluate(curve, 0.5)
+    return tuple(round(v, 9) for v in (start.X, start.Y, start.Z, middle.X, middle.Y, middle.Z))
+
+def build_path_length_table(evaluate, signature=None):
+    # Length table of any path given as a function of the normalized
+    # parameter returning points with X, Y and Z
+    params = array('d', [0.0])
+    lengths = array('d', [0.0])
+    _sample(evaluate, 0.0, evaluate(0.0), 1.0, evaluate(1.0), 0, params, lengths)
+    return LengthTable(params, lengths, signature)
+
+def build_length_table(curve, signature=None):
+    return build_path_length_table(lambda t: _evaluate(curve, t), signature or get_curve_signature(curve))
+
+def get_length_table(doc, curve_element):
+    # Length tables are cached per curve element for the Revit session and
+    # rebuilt only when the curve has changed shape or position
+    cache = get_document_cache('curve_length_tables', doc)
+    curve = curve_element.GeometryCurve
+    signature = get_curve_signature(curve)
+    key = curve_element.Id.IntegerValue
+    table = cache.get(key)
+    if table is None or table.signature != signature:
+        table = build_length_table(curve, signature)
+        cache[key] = table
+    return curve, table
+
+def _end_points(curve):
+    if not curve.IsBound:
+        return None, None
+    return curve.GetEndPoint(0), curve.GetEndPoint(1)
+
+def order_curve_chain(curve_elements):
+    # Order the selected curves end to start, reversing curves as needed.
+    # Curves that do not connect are appended in selection order.
+    # Returns a list of (curve element, reversed) pairs.
+    ends = dict((c.Id.IntegerValue, _end_points(c.GeometryCurve)) for c in curve_elements)
+    remaining = list(curve_elements)
+    chain = [(remaining.pop(0), False)]
+
+    def tail():
+        element, reverse = chain[-1]
+        start, end = ends[element.Id.IntegerValue]
+        return start if reverse else end
+
+    def head():
+        element, reverse = chain[0]
+        start, end = ends[element.Id.IntegerValue]
+        return end if reverse else start
+
+    while remaining:
+        for element in remaining:
+            start, end = ends[element.Id.IntegerValue]
+            if start is None or tail() is None:
+                continue
+            if _distance(tail(), start) < CONNECT_TOLERANCE:
+                chain.append((element, False))
+            elif _distance(tail(), end) < CONNECT_TOLERANCE:
+                chain.append((element, True))
+            elif _distance(head(), end) < CONNECT_TOLERANCE:
+                chain.insert(0, (element, False))
+            elif _distance(head(), start) < CONNECT_TOLERANCE:
+                chain.insert(0, (element, True))
+            else:
+                continue
+            remaining.remove(element)
+            break
+        else:
+            chain.append((remaining.pop(0), False))
+    return chain
+
+class CurvePath(object):
+    # One or more curves walked end to end, measured by true arc length
+    def __init__(self, doc, curve_elements):
+        self.segments = []
+        self.offsets = array('d')
+        offset = 0.0
+        for element, reverse in order_curve_chain(list(curve_elements)):
+            curve, table = get_length_table(doc, element)
+            self.segments.append((curve, table, reverse))
+            self.offsets.append(offset)
+            offset += table.total
+        self.length = offset
+        self.is_closed = self._is_closed()
+
+    def _is_closed(self):
+        first_curve, first_table, first_reverse = self.segments[0]
+        if len(self.segments) == 1 and not first_curve.IsBound:
+            return True
+        last_curve, last_table, last_reverse = self.segments[-1]
+        start = _evaluate(first_curve, 1.0 if first_reverse else 0.0)
+        end = _evaluate(last_curve, 0.0 if last_reverse else 1.0)
+        return _distance(start, end) < CONNECT_TOLERANCE
+
+    def point_at(self, distance):
+        i = min(max(bisect_right(self.offsets, distance) - 1, 0), len(self.segments) - 1)
+        curve, table, reverse = self.segments[i]
+        local = distance - self.offsets[i]
+        if reverse:
+            local = table.total - local
+        return _evaluate(curve, table.param_at(local))
+
+    def get_points(self, count):
+        # `count` points at equal arc-length spacing. Open paths put the first
+        # and last point on the path ends; closed paths space them all the way round.
+        if count < 1:
+            return []
+        if count == 1:
+            return [self.point_at(0.0)]
+        gaps = count if self.is_closed else count - 1
+        spacing = self.length / gaps
+        return [self.point_at(min(i * spacing, self.length)) for i in range(count)]
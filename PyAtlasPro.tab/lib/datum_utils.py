@@ -0,0 +1,58 @@
+class DatumReport(object):
+    # Outcome of a bubble change: (datum, view, end) triples that were changed,
+    # skipped because nothing needed changing, or failed with a reason. A
+    # failure while planning has no end when the datum itself could not be read.
+    # `attempted` counts the Show/HideBubbleInView calls actually made.
+    def __init__(self):
+        self.changed = []
+        self.skipped = []
+        self.failed = []
+        self.attempted = 0
+
+def plan_bubble_changes(datums, views, ends, visible, report):
+    # Read the current state of every (datum, view, end) first and keep only
+    # the pairs whose bubble is not already in the requested state
+    pending = []
+    for view in views:
+        for datum in datums:
+            try:
+                can_be_visible = datum.CanBeVisibleInView(view)
+            except Exception as e:
+                report.failed.append((datum, view, None, str(e)))
+                continue
+            if not can_be_visible:
+                report.skipped.append((datum, view, None))
+                continue
+            for end in ends:
+                try:
+                    is_visible = datum.IsBubbleVisibleInView(end, view)
+                except Exception as e:
+                    report.failed.append((datum, view, end, str(e)))
+                    continue
+                if is_visible == visible:
+                    report.skipped.append((datum, view, end))
+                else:
+                    pending.append((datum, view, end))
+    return pending
+
+def apply_bubble_changes(pending, visible, report):
+    # Must be called inside an open transaction
+    for datum, view, end in pending:
+        report.attempted += 1
+        try:
+            if visible:
+                datum.ShowBubbleInView(end, view)
+            else:
+                datum.HideBubbleInView(end, view)
+            report.changed.append((datum, view, end))
+        except Exception as e:
+            report.failed.append((datum, view, end, str(e)))
+
+def print_datum_report(output, report, datum_label):
+    output.print_md('**{0}** bubbles changed, **{1}** already as requested or not visible, **{2}** failed.'.format(
+        len(report.changed), len(report.skipped), len(report.failed)))
+    if report.failed:
+        table_data = [[datum.Name, view.Name, '' if end is None else str(end), reason]
+                      for datum, view, end, reason in report.failed]
+        output.print_table(table_data=table_data, title="Failed {0} Heads".format(datum_label),
+                           columns=[datum_label, 'View', 'End', 'Reason'])
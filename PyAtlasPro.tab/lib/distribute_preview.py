@@ -0,0 +1,135 @@
+# Preview for the Distribute tools that ask for distances. The targets
+# computed from the single extraction pass are drawn as small crosses, each
+# joined to its element by a line, all in one DirectShape. The shape is
+# created inside a TransactionGroup that is rolled back as soon as the user
+# answers, so nothing is kept and the selected elements never move (or make
+# Revit regenerate their joins) until the one real transaction on Apply.
+from pyrevit import forms
+
+# Half the width of the cross drawn at each target, in feet
+MARKER_SIZE = 0.5
+
+# Larger selections preview an even sample of their targets
+MAX_PREVIEW_MARKERS = 2000
+
+# Revit rejects lines shorter than its short curve tolerance (1/256 ft)
+MIN_LINE_LENGTH = 1.0 / 256
+
+# Revit cannot draw geometry this far from the origin (feet); such targets are not previewed
+MAX_PREVIEW_COORDINATE = 1e6
+
+# Feet per millimeter
+MM_TO_FEET = 0.00328084
+
+# Answers of the preview window; closing it cancels
+APPLY = 'Apply'
+CHANGE = 'Change Distances'
+
+def _target_point(anchor, target):
+    # Target coordinates set to None keep the anchor's current value
+    point = (anchor.x, anchor.y, anchor.z)
+    return tuple(point[i] if target[i] is None else target[i] for i in range(3))
+
+def _is_drawable(point):
+    # Also false for infinite and NaN coordinates
+    return all(abs(value) < MAX_PREVIEW_COORDINATE for value in point)
+
+def _is_long_enough(start, end):
+    return sum((a - b) ** 2 for a, b in zip(start, end)) >= MIN_LINE_LENGTH ** 2
+
+def get_preview_segments(anchors, targets, limit=MAX_PREVIEW_MARKERS):
+    # ((x, y, z), (x, y, z)) line segments: a cross at every previewed target
+    # and a line from the element to it. Plain tuples, no API calls.
+    count = len(targets)
+    step = max(1, -(-count // limit)) if limit else 1
+    segments = []
+    for i in range(0, count, step):
+        anchor = anchors[i]
+        x, y, z = point = _target_point(anchor, targets[i])
+        if not _is_drawable(point):
+            continue
+        segments.append(((x - MARKER_SIZE, y, z), (x + MARKER_SIZE, y, z)))
+        segments.append(((x, y - MARKER_SIZE, z), (x, y + MARKER_SIZE, z)))
+        start = (anchor.x, anchor.y, anchor.z)
+        if _is_long_enough(start, point):
+            segments.append((start, point))
+    return segments
+
+class DistributePreview(object):
+    # Draws preview geometry that disappears again on clear()
+    def __init__(self, doc, uidoc, name):
+        self.doc = doc
+        self.uidoc = uidoc
+        self.name = name
+        self.group = None
+
+    def show(self, anchors, targets):
+        from Autodesk.Revit.DB import (BuiltInCategory, DirectShape, ElementId, GeometryObject,
+                                       Line, Transaction, TransactionGroup, XYZ)
+        from System.Collections.Generic import List
+
+        self.clear()
+        self.group = TransactionGroup(self.doc, self.name)
+        self.group.Start()
+        lines = List[GeometryObject]()
+        for start, end in get_preview_segments(anchors, targets):
+            lines.Add(Line.CreateBound(XYZ(*start), XYZ(*end)))
+        # A plain transaction: previews are not profiled and leave no warnings behind
+        t = Transaction(self.doc, self.name)
+        t.Start()
+        shape = DirectShape.CreateElement(self.doc, ElementId(BuiltInCategory.OST_GenericModel))
+        shape.SetShape(lines)
+        t.Commit()
+        self.uidoc.RefreshActiveView()
+
+    def clear(self):
+        if self.group is not None:
+            self.group.RollBack()
+            self.group = None
+            self.uidoc.RefreshActiveView()
+
+def parse_distances(values):
+    # Millimeter answers in feet; blank answers stay None
+    try:
+        return [float(value) * MM_TO_FEET if value else None for value in values]
+    except ValueError:
+        raise ValueError('Please enter numerical values for the distances in millimeters.')
+
+def ask_distances(title, prompts, values):
+    # One text box per prompt, filled with the last answers. None on cancel.
+    answers = []
+    for prompt, value in zip(prompts, values):
+        answer = forms.ask_for_string(default=value, prompt=prompt, title=title)
+        if answer is None:
+            return None
+        answers.append(answer.strip())
+    return answers
+
+def choose_targets(doc, uidoc, title, prompts, anchors, get_targets, preview=True, values=None):
+    # Asks for the distances and, with `preview`, draws the targets they give
+    # until the user applies them or cancels; changing the distances only
+    # recomputes the targets. `get_targets(answers)` raises ValueError with a
+    # message for the user on unusable answers. Returns the targets, or None.
+    values = list(values or [''] * len(prompts))
+    drawn = DistributePreview(doc, uidoc, '{0} Preview'.format(title))
+    while True:
+        values = ask_distances(title, prompts, values)
+        if values is None:
+            return None
+        try:
+            targets = get_targets(values)
+        except ValueError as e:
+            forms.alert(str(e), title=title)
+            continue
+        if not preview:
+            return targets
+
+        drawn.show(anchors, targets)
+        try:
+            choice = forms.CommandSwitchWindow.show([APPLY, CHANGE], message='{0}: apply the previewed positions?'.format(title))
+        finally:
+            drawn.clear()
+        if choice == APPLY:
+            return targets
+        if choice != CHANGE:
+            return None
@@ -1,8 +1,13 @@
-from Autodesk.Revit.DB import *
-from pyrevit import revit, DB
+from array import array
 
-doc = revit.doc
-uidoc = revit.uidoc
+from Autodesk.Revit.DB import ElementId, ElementTransformUtils, Transaction, ViewSection, ViewType, XYZ
+
+from extent_index import get_new_overlaps
+from failure_handling import apply_failure_handling
+
+# No document or UI globals at import time: the module stays loaded between
+# button presses when pyRevit reuses the engine (rocket mode), so the active
+# document is always passed in by the calling script.
 
 def get_view_orientation_axis(view, direction):
     if direction in ['center-h', 'left', 'right']:
@@ -20,10 +25,10 @@ def get_view_orientation_axis(view, direction):
         else:
             return 'X'
 
-def get_element_bbox_point(element, axis, direction):
+def get_element_bbox_point(element, axis, direction, view=None):
     bbox = element.get_BoundingBox(None)  
-    if not bbox:  
-        bbox = element.get_BoundingBox(doc.ActiveView)
+    if not bbox and view is not None:
+        bbox = element.get_BoundingBox(view)
     if not bbox:
         #print("No bounding box found for element ID: " + str(element.Id.IntegerValue))
         return None
@@ -38,54 +43,217 @@ def get_element_bbox_point(element, axis, direction):
     
     return point
 
-def align_elements(doc, elements, direction):
+# Values stored per element in an extent snapshot: min X/Y/Z, max X/Y/Z, center X/Y/Z
+EXTENT_STRIDE = 9
+AXIS_OFFSETS = {'X': 0, 'Y': 1, 'Z': 2}
+
+class ExtentSnapshot(object):
+    # Bounding box extents of a selection, read once per element and stored
+    # in a flat array so repeated lookups never go back to the Revit API.
+    def __init__(self, elements, extents, api_reads):
+        self.elements = elements
+        self.extents = extents
+        self.api_reads = api_reads
+        self.reads_avoided = 0
+        self.move_calls = 0
+        self.collisions = []
+
+    def __len__(self):
+        return len(self.elements)
+
+    def get_point(self, index, axis, direction):
+        base = index * EXTENT_STRIDE + AXIS_OFFSETS[axis]
+        if direction == 'center-h' or direction == 'center-v':
+            return self.extents[base + 6]
+        elif direction in ['left', 'bottom']:
+            return self.extents[base]
+        else:  # 'right', 'top'
+            return self.extents[base + 3]
+
+    def get_points(self, axis, direction):
+        return [self.get_point(i, axis, direction) for i in range(len(self.elements))]
+
+    def get_boxes(self, axis, cross_axis):
+        # (min, cross min, max, cross max) per element for extent_index
+        u = AXIS_OFFSETS[axis]
+        v = AXIS_OFFSETS[cross_axis]
+        extents = self.extents
+        return [(extents[base + u], extents[base + v], extents[base + u + 3], extents[base + v + 3])
+                for base in range(0, len(extents), EXTENT_STRIDE)]
+
+def get_cross_axis(view, direction):
+    # The other in-view axis: vertical for horizontal moves and the other way round
+    return get_view_orientation_axis(view, 'top' if direction in ['center-h', 'left', 'right'] else 'left')
+
+def get_extent_snapshot(doc, elements):
     view = doc.ActiveView
-    
-     
+    snapshot_elements = []
+    extents = array('d')
+    api_reads = 0
+    for el in elements:
+        bbox = el.get_BoundingBox(None)
+        api_reads += 1
+        if not bbox:
+            bbox = el.get_BoundingBox(view)
+            api_reads += 1
+        if not bbox:
+            continue
+        bb_min = bbox.Min
+        bb_max = bbox.Max
+        extents.extend((bb_min.X, bb_min.Y, bb_min.Z,
+                        bb_max.X, bb_max.Y, bb_max.Z,
+                        (bb_min.X + bb_max.X) / 2.0,
+                        (bb_min.Y + bb_max.Y) / 2.0,
+                        (bb_min.Z + bb_max.Z) / 2.0))
+        snapshot_elements.append(el)
+    return ExtentSnapshot(snapshot_elements, extents, api_reads)
+
+# The collision report lists at most this many overlapping pairs
+MAX_REPORTED_COLLISIONS = 200
+
+# Deltas closer than this (in feet) share a single MoveElements call
+MOVE_TOLERANCE = 1e-6
+
+def split_runs(items, tolerance=MOVE_TOLERANCE):
+    # `items` are (value, payload) pairs sorted by value. A run collects the
+    # values less than `tolerance` above its first one, so how values are
+    # grouped never depends on where fixed rounding boundaries fall.
+    # Returns (first value, payloads) per run.
+    runs = []
+    for value, payload in items:
+        if runs and value - runs[-1][0] < tolerance:
+            runs[-1][1].append(payload)
+        else:
+            runs.append((value, [payload]))
+    return runs
+
+def group_by_delta(element_ids, deltas, tolerance=MOVE_TOLERANCE):
+    # Group element ids whose deltas lie within the tolerance of each other,
+    # each group moved by its smallest delta. Elements already on the target
+    # (zero delta) are left out entirely.
+    items = sorted([(delta, element_id) for element_id, delta in zip(element_ids, deltas) if abs(delta) >= tolerance],
+                   key=lambda item: item[0])
+    return split_runs(items, tolerance)
+
+def move_elements_batched(doc, element_ids, deltas, axis, tolerance=MOVE_TOLERANCE):
+    # One MoveElements call per distinct delta instead of one MoveElement per element
+    move_calls = 0
+    for delta, ids in group_by_delta(element_ids, deltas, tolerance):
+        move_vector = XYZ(delta if axis == 'X' else 0, delta if axis == 'Y' else 0, delta if axis == 'Z' else 0)
+        if len(ids) == 1:
+            ElementTransformUtils.MoveElement(doc, ids[0], move_vector)
+        else:
+            from System.Collections.Generic import List
+            ElementTransformUtils.MoveElements(doc, List[ElementId](ids), move_vector)
+        move_calls += 1
+    return move_calls
+
+def group_by_offset(element_ids, offsets, tolerance=MOVE_TOLERANCE):
+    # group_by_delta for (dx, dy, dz) offsets: runs along X are split into runs
+    # along Y, then Z, so every group agrees within the tolerance on each
+    # axis. Returns (offset, element ids) per group, moved by the offset of
+    # its first element; elements that stay put are left out.
+    groups = [[(tuple(offset), element_id) for element_id, offset in zip(element_ids, offsets)
+               if any(abs(value) >= tolerance for value in offset)]]
+    for axis in range(3):
+        split = []
+        for group in groups:
+            items = sorted([(item[0][axis], item) for item in group], key=lambda pair: pair[0])
+            split.extend(items for value, items in split_runs(items, tolerance))
+        groups = split
+    return [(group[0][0], [element_id for offset, element_id in group]) for group in groups if group]
+
+def move_elements_by_offsets(doc, element_ids, offsets, tolerance=MOVE_TOLERANCE):
+    # One MoveElements call per distinct offset. Must be called inside an open transaction.
+    move_calls = 0
+    for offset, ids in group_by_offset(element_ids, offsets, tolerance):
+        move_vector = XYZ(*offset)
+        if len(ids) == 1:
+            ElementTransformUtils.MoveElement(doc, ids[0], move_vector)
+        else:
+            from System.Collections.Generic import List
+            ElementTransformUtils.MoveElements(doc, List[ElementId](ids), move_vector)
+        move_calls += 1
+    return move_calls
+
+def get_view_direction(view, direction):
+    # Left and right are mirrored in sections and elevations
     is_vertical_view = isinstance(view, ViewSection) or view.ViewType == ViewType.Elevation
-    
-    
     if is_vertical_view and direction in ['left', 'right']:
-        direction = 'right' if direction == 'left' else 'left'
-    
-    
+        return 'right' if direction == 'left' else 'left'
+    return direction
+
+def get_alignment_target(points, direction):
+    if direction in ['center-h', 'center-v']:
+        return sum(points) / len(points)
+    return min(points) if direction in ['left', 'bottom'] else max(points)
+
+def align_elements(doc, elements, direction, profile=None, warnings=None):
+    view = doc.ActiveView
+    direction = get_view_direction(view, direction)
     axis = get_view_orientation_axis(view, direction)
     
-    alignment_points = []
-    for el in elements:
-        point = get_element_bbox_point(el, axis, direction)
-        if point is not None:
-            alignment_points.append(point)
+    # Read every bounding box once; both the target search and the move loop use this
+    snapshot = get_extent_snapshot(doc, elements)
+    alignment_points = snapshot.get_points(axis, direction)
+
+    if profile:
+        profile.read(len(elements))
+        profile.count('get_BoundingBox', snapshot.api_reads)
 
     if not alignment_points:
         #print("No valid points for alignment found.")
-        return
+        return snapshot
 
-    if direction in ['center-h', 'center-v']:
-        target_point = sum(alignment_points) / len(alignment_points)
-    else:
-        target_point = min(alignment_points) if direction in ['left', 'bottom'] else max(alignment_points)
+    target_point = get_alignment_target(alignment_points, direction)
     
     #print("Target point for alignment on axis {0} is {1}".format(axis, target_point))
 
-    with Transaction(doc, "Align Elements") as t:
+    # A ToolProfile times the transaction for the Performance Report; a
+    # `warnings` collector keeps overlap warnings from stalling the commit
+    if profile:
+        transaction = profile.transaction("Align Elements", warnings)
+    else:
+        transaction = Transaction(doc, "Align Elements")
+        if warnings is not None:
+            apply_failure_handling(transaction, warnings)
+    with transaction as t:
         t.Start()
-        for el in elements:
-            element_point = get_element_bbox_point(el, axis, direction)
-            if element_point is not None:
-                delta = target_point - element_point
-                move_vector = XYZ(delta if axis == 'X' else 0, delta if axis == 'Y' else 0, delta if axis == 'Z' else 0)
-                ElementTransformUtils.MoveElement(doc, el.Id, move_vector)
-                #print("Moved element ID: {0} with delta: {1}".format(el.Id.IntegerValue, delta))
+        element_ids = [el.Id for el in snapshot.elements]
+        deltas = [target_point - element_point for element_point in alignment_points]
+        snapshot.move_calls = move_elements_batched(doc, element_ids, deltas, axis)
         t.Commit()
 
-    #print("Alignment completed successfully.")
+    if profile:
+        # MoveElement and MoveElements calls
+        profile.count('MoveElement', snapshot.move_calls)
+
+    # Overlaps the alignment created, found from the extents already read
+    boxes = snapshot.get_boxes(axis, get_cross_axis(view, direction))
+    snapshot.collisions = [(snapshot.elements[i], snapshot.elements[j])
+                           for i, j in get_new_overlaps(boxes, deltas, MAX_REPORTED_COLLISIONS)]
+
+    # The move loop used to re-read every bounding box a second time
+    snapshot.reads_avoided = snapshot.api_reads
+    if profile:
+        profile.count('get_BoundingBox avoided', snapshot.reads_avoided)
+    return snapshot
+
+def print_collision_report(output, snapshot):
+    if not snapshot.collisions:
+        return
+    table_data = [[output.linkify(a.Id), output.linkify(b.Id)] for a, b in snapshot.collisions]
+    if len(snapshot.collisions) >= MAX_REPORTED_COLLISIONS:
+        title = "Overlaps Created by Align (first {0})".format(len(snapshot.collisions))
+    else:
+        title = "Overlaps Created by Align ({0})".format(len(snapshot.collisions))
+    output.print_table(table_data=table_data, title=title, columns=['Element', 'Overlaps'])
 
 def main():
+    from pyrevit import revit
+    doc = revit.doc
     direction = "left"  # Example direction; can be "left", "right", "top", "bottom", "center-h", "center-v"
     selected_ids = revit.uidoc.Selection.GetElementIds()
-    elements_str = ", ".join([str(id.IntegerValue) for id in selected_ids])
-    #print("Selected element IDs: " + elements_str)
     elements = [doc.GetElement(id) for id in selected_ids]
     align_elements(doc, elements, direction)
 
@@ -0,0 +1,165 @@
+from Autodesk.Revit.DB import XYZ, ElementTransformUtils, LocationPoint, LocationCurve, TextNote
+
+from extent_index import get_equal_gap_shifts, resolve_overlaps, shift_boxes
+from parallel_math import map_chunks
+
+AXIS_INDEX = {'X': 0, 'Y': 1, 'Z': 2}
+
+# Spacing modes of Distribute Horizontal and Vertical
+EVEN_ANCHORS = 'anchors'
+EVEN_ANCHORS_NO_OVERLAP = 'anchors_no_overlap'
+EQUAL_GAPS = 'gaps'
+
+# Anchor kinds
+POINT = 'point'
+CURVE = 'curve'
+TEXT = 'text'
+
+class ElementAnchor(object):
+    # Where an element sits, read from the Revit API exactly once.
+    # Point elements anchor on their location point, curve elements on their
+    # start point and text notes on the center of their box in the view.
+    # `rotation` is the plan rotation of point elements, when asked for.
+    __slots__ = ('element', 'id', 'kind', 'x', 'y', 'z', 'start', 'end', 'center', 'rotation')
+
+    def __init__(self, element, kind, point, start=None, end=None, center=None, rotation=None):
+        self.element = element
+        self.id = element.Id
+        self.kind = kind
+        self.x, self.y, self.z = point
+        self.start = start
+        self.end = end
+        self.center = center
+        self.rotation = rotation
+
+    def get(self, axis):
+        return (self.x, self.y, self.z)[AXIS_INDEX[axis]]
+
+def _xyz_tuple(point):
+    return (point.X, point.Y, point.Z)
+
+def _bbox_center(element, view):
+    bbox = element.get_BoundingBox(view)
+    if not bbox:
+        return None
+    return ((bbox.Min.X + bbox.Max.X) / 2.0,
+            (bbox.Min.Y + bbox.Max.Y) / 2.0,
+            (bbox.Min.Z + bbox.Max.Z) / 2.0)
+
+def get_anchor(element, view, include_center=False, include_rotation=False):
+    # Returns None for elements without a point, curve or text location
+    if isinstance(element, TextNote):
+        center = _bbox_center(element, view)
+        if center is None:
+            return None
+        return ElementAnchor(element, TEXT, center, center=center)
+
+    location = element.Location
+    center = _bbox_center(element, view) if include_center else None
+    if isinstance(location, LocationPoint):
+        rotation = location.Rotation if include_rotation else None
+        return ElementAnchor(element, POINT, _xyz_tuple(location.Point), center=center, rotation=rotation)
+    elif isinstance(location, LocationCurve):
+        curve = location.Curve
+        start = _xyz_tuple(curve.GetEndPoint(0))
+        end = _xyz_tuple(curve.GetEndPoint(1))
+        return ElementAnchor(element, CURVE, start, start, end, center)
+    return None
+
+def extract_anchors(elements, view, include_center=False, include_rotation=False):
+    # Single read pass over the selection; elements without an anchor are dropped
+    anchors = []
+    for element in elements:
+        anchor = get_anchor(element, view, include_center, include_rotation)
+        if anchor is not None:
+            anchors.append(anchor)
+    return anchors
+
+def get_axis_values(anchors, axis):
+    index = AXIS_INDEX[axis]
+    return [(anchor.x, anchor.y, anchor.z)[index] for anchor in anchors]
+
+def get_axis_range(anchors, axis):
+    values = get_axis_values(anchors, axis)
+    return min(values), max(values)
+
+def sort_anchors(anchors, axis):
+    index = AXIS_INDEX[axis]
+    return sorted(anchors, key=lambda anchor: (anchor.x, anchor.y, anchor.z)[index])
+
+def get_linear_targets(start, end, count):
+    # `count` evenly spaced values from start to end inclusive
+    if count < 2:
+        return [start] * count
+    step = (end - start) / float(count - 1)
+    return [start + i * step for i in range(count)]
+
+def _axis_target(axis, value):
+    target = [None, None, None]
+    target[AXIS_INDEX[axis]] = value
+    return tuple(target)
+
+def get_spacing_targets(doc, anchors, axis, cross_axis, mode=EVEN_ANCHORS):
+    # Targets along `axis` for anchors sorted on it. EVEN_ANCHORS spaces the
+    # anchor points evenly; the other modes read every bounding box once and
+    # either leave equal gaps between the boxes or push apart the boxes that
+    # even anchor spacing makes overlap. Elements without a bounding box are
+    # dropped in those modes. Returns (anchors, targets).
+    if mode != EVEN_ANCHORS:
+        from element_alignment_utils import get_extent_snapshot
+        snapshot = get_extent_snapshot(doc, [anchor.element for anchor in anchors])
+        by_id = dict((anchor.id.IntegerValue, anchor) for anchor in anchors)
+        anchors = [by_id[element.Id.IntegerValue] for element in snapshot.elements]
+        boxes = snapshot.get_boxes(axis, cross_axis)
+    if not anchors:
+        return anchors, []
+
+    low, high = get_axis_range(anchors, axis)
+    values = get_linear_targets(low, high, len(anchors))
+    if mode == EVEN_ANCHORS:
+        return anchors, [_axis_target(axis, value) for value in values]
+
+    shifts = get_spacing_shifts([anchor.get(axis) for anchor in anchors], boxes, mode)
+    return anchors, [_axis_target(axis, anchor.get(axis) + shift) for anchor, shift in zip(anchors, shifts)]
+
+def get_spacing_shifts(values, boxes, mode=EVEN_ANCHORS):
+    # Shifts along the axis for anchor `values` sorted on it, with `boxes`
+    # their (min, cross min, max, cross max) extents; plain floats only, so
+    # the layout composer can space elements it has not moved yet
+    targets = get_linear_targets(min(values), max(values), len(values)) if values else []
+    shifts = [target - value for value, target in zip(values, targets)]
+    if mode == EQUAL_GAPS:
+        return get_equal_gap_shifts(boxes)
+    if mode == EVEN_ANCHORS_NO_OVERLAP:
+        extra = resolve_overlaps(shift_boxes(boxes, shifts))
+        return [shift + more for shift, more in zip(shifts, extra)]
+    return shifts
+
+def _get_chunk_deltas(pairs):
+    # (index, dx, dy, dz) for every (index, anchor point, target) pair that has to move
+    deltas = []
+    for index, point, target in pairs:
+        if target is None:
+            continue
+        dx = 0.0 if target[0] is None else target[0] - point[0]
+        dy = 0.0 if target[1] is None else target[1] - point[1]
+        dz = 0.0 if target[2] is None else target[2] - point[2]
+        if abs(dx) < 1e-9 and abs(dy) < 1e-9 and abs(dz) < 1e-9:
+            continue
+        deltas.append((index, dx, dy, dz))
+    return deltas
+
+def get_move_deltas(anchors, targets, parallel=None):
+    # Each target is an (x, y, z) tuple where None keeps the anchor's current
+    # coordinate. Only plain tuples reach the worker threads; anchors already
+    # on their target are left out. Returns (anchor index, dx, dy, dz).
+    pairs = [(i, (anchor.x, anchor.y, anchor.z), target) for i, (anchor, target) in enumerate(zip(anchors, targets))]
+    return map_chunks(_get_chunk_deltas, pairs, parallel=parallel)
+
+def move_anchors(doc, anchors, targets):
+    # Single write pass over the deltas computed off the API thread.
+    # Must be called inside an open transaction. Returns the number of elements moved.
+    deltas = get_move_deltas(anchors, targets)
+    for index, dx, dy, dz in deltas:
+        ElementTransformUtils.MoveElement(doc, anchors[index].id, XYZ(dx, dy, dz))
+    return len(deltas)
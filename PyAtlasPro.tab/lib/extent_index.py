@@ -0,0 +1,146 @@
+# Sweep-and-prune over the bounding boxes of a selection. Boxes are
+# (min u, min v, max u, max v) tuples in view plane coordinates, where u is
+# the axis elements are moved along and v the axis across it. Boxes are
+# sorted once on one axis and swept with a heap of the boxes still open, so
+# only boxes that already overlap on that axis are ever compared:
+# O(n log n + k) for k overlapping pairs instead of comparing every pair.
+from bisect import bisect_left, bisect_right
+from heapq import heappop, heappush
+
+# Boxes closer than this (in feet) do not count as touching
+OVERLAP_TOLERANCE = 1e-6
+
+def _overlap_on_v(a, b, tolerance):
+    return a[1] < b[3] - tolerance and b[1] < a[3] - tolerance
+
+def _swap_axes(box):
+    return (box[1], box[0], box[3], box[2])
+
+def _crowding(boxes, low, high):
+    # Summed extent over the span on one axis: how many boxes a sweep along it keeps open
+    span = max(box[high] for box in boxes) - min(box[low] for box in boxes)
+    return sum(box[high] - box[low] for box in boxes) / span if span > 0 else float('inf')
+
+class ExtentIndex(object):
+    # Sweeps along whichever axis the boxes are less crowded on. Right after
+    # an Align every box shares the same edge on u, and sweeping along u
+    # would compare every pair.
+    def __init__(self, boxes, tolerance=OVERLAP_TOLERANCE):
+        self.swapped = bool(boxes) and _crowding(boxes, 1, 3) < _crowding(boxes, 0, 2)
+        self.boxes = [_swap_axes(box) for box in boxes] if self.swapped else boxes
+        self.tolerance = tolerance
+        self.order = sorted(range(len(boxes)), key=lambda i: self.boxes[i][0])
+        self.mins = [self.boxes[i][0] for i in self.order]
+        # Largest max u of the boxes up to each position in sweep order; it
+        # never decreases, so the first box that can reach a query is bisected
+        self.reach = []
+        reach = float('-inf')
+        for i in self.order:
+            reach = max(reach, self.boxes[i][2])
+            self.reach.append(reach)
+
+    def iter_overlaps(self):
+        # Index pairs (i < j) of boxes overlapping on both axes, in sweep order
+        boxes = self.boxes
+        tolerance = self.tolerance
+        active = []
+        for i in self.order:
+            box = boxes[i]
+            while active and active[0][0] <= box[0] + tolerance:
+                heappop(active)
+            for max_u, j in active:
+                if _overlap_on_v(box, boxes[j], tolerance):
+                    yield (min(i, j), max(i, j))
+            heappush(active, (box[2], i))
+
+    def overlaps(self):
+        return sorted(self.iter_overlaps())
+
+    def query(self, box):
+        # Indices of the boxes overlapping `box`. Only boxes starting before it
+        # ends and after the first one that can reach its start are looked at.
+        if self.swapped:
+            box = _swap_axes(box)
+        tolerance = self.tolerance
+        start = bisect_right(self.reach, box[0] + tolerance)
+        end = bisect_left(self.mins, box[2] - tolerance)
+        return sorted(i for i in self.order[start:end]
+                      if self.boxes[i][2] > box[0] + tolerance and _overlap_on_v(box, self.boxes[i], tolerance))
+
+def shift_boxes(boxes, shifts):
+    return [(box[0] + shift, box[1], box[2] + shift, box[3]) for box, shift in zip(boxes, shifts)]
+
+def _overlap(a, b, tolerance):
+    return a[0] < b[2] - tolerance and b[0] < a[2] - tolerance and _overlap_on_v(a, b, tolerance)
+
+def get_new_overlaps(boxes, shifts, limit=None, tolerance=OVERLAP_TOLERANCE):
+    # Pairs that overlap after moving every box by its shift along u but did
+    # not before, sorted. The sweep stops once `limit` pairs are found.
+    pairs = []
+    for i, j in ExtentIndex(shift_boxes(boxes, shifts), tolerance).iter_overlaps():
+        if not _overlap(boxes[i], boxes[j], tolerance):
+            pairs.append((i, j))
+            if limit is not None and len(pairs) >= limit:
+                break
+    return sorted(pairs)
+
+def get_equal_gap_shifts(boxes):
+    # Shifts along u that leave the same gap between neighbouring boxes while
+    # the first and last stay put. Boxes wider than the span end up touching.
+    count = len(boxes)
+    if count < 3:
+        return [0.0] * count
+    order = sorted(range(count), key=lambda i: (boxes[i][0], boxes[i][2]))
+    start = boxes[order[0]][0]
+    end = max(box[2] for box in boxes)
+    widths = sum(box[2] - box[0] for box in boxes)
+    gap = max((end - start - widths) / float(count - 1), 0.0)
+    shifts = [0.0] * count
+    cursor = start
+    for i in order:
+        shifts[i] = cursor - boxes[i][0]
+        cursor += boxes[i][2] - boxes[i][0] + gap
+    return shifts
+
+def _raise_skyline(starts, heights, low, high, height):
+    # Lift the skyline to at least `height` over [low, high). Segment k covers
+    # [starts[k], starts[k + 1]); the segments this covers collapse into one
+    # wherever the new height is the higher, so each is only ever scanned once
+    i = bisect_right(starts, low) - 1
+    j = bisect_left(starts, high)
+    new_starts = []
+    new_heights = []
+    if starts[i] < low:
+        new_starts.append(starts[i])
+        new_heights.append(heights[i])
+    for k in range(i, j):
+        level = max(heights[k], height)
+        if not new_heights or new_heights[-1] != level:
+            new_starts.append(max(starts[k], low))
+            new_heights.append(level)
+    if (j == len(starts) or starts[j] > high) and new_heights[-1] != heights[j - 1]:
+        new_starts.append(high)
+        new_heights.append(heights[j - 1])
+    starts[i:j] = new_starts
+    heights[i:j] = new_heights
+
+def resolve_overlaps(boxes, gap=0.0, tolerance=OVERLAP_TOLERANCE):
+    # Extra shifts along u that push boxes apart until none overlap. Boxes are
+    # placed in order of u; each one only moves forward, to `gap` past the
+    # furthest placed box it would overlap on v. A skyline along v keeps the
+    # furthest max u placed over each stretch of v, so placing a box is two
+    # bisections plus the segments it then covers: stacked or dense tags stay
+    # O(n log n) instead of rescanning every box they were pushed past.
+    order = sorted(range(len(boxes)), key=lambda i: (boxes[i][0], boxes[i][1]))
+    shifts = [0.0] * len(boxes)
+    starts = [float('-inf')]
+    heights = [float('-inf')]
+    for i in order:
+        min_u, min_v, max_u, max_v = boxes[i]
+        first = bisect_right(starts, min_v + tolerance) - 1
+        last = bisect_left(starts, max_v - tolerance)
+        reach = max(heights[first:last]) if last > first else float('-inf')
+        if reach > min_u + tolerance:
+            shifts[i] = reach + gap - min_u
+        _raise_skyline(starts, heights, min_v, max(max_v, min_v + tolerance), max_u + shifts[i])
+    return shifts
@@ -0,0 +1,105 @@
+from Autodesk.Revit.DB import ElementId, FailureProcessingResult, FailureSeverity, IFailuresPreprocessor
+
+# What happens to the failures a commit raises:
+# 'suppress' deletes warnings and leaves errors to Revit,
+# 'resolve' also resolves errors with their default resolution where Revit offers one,
+# 'rollback' deletes warnings and rolls the whole transaction back on any error.
+SUPPRESS = 'suppress'
+RESOLVE = 'resolve'
+ROLLBACK = 'rollback'
+
+# The policy is one setting shared by every tool that handles Revit warnings, kept in
+# its own config section and chosen with Shift+Click on any of those tools
+POLICY_SECTION = 'PyAtlasPro'
+POLICY_OPTIONS = {
+    'Revit Warnings: Suppress and List Them': SUPPRESS,
+    'Revit Warnings: Also Resolve Errors': RESOLVE,
+    'Revit Warnings: Roll Back on Errors': ROLLBACK
+}
+
+# Outcome of each failure, as reported in the summary
+SUPPRESSED = 'suppressed'
+RESOLVED = 'resolved'
+LEFT_TO_REVIT = 'left to Revit'
+ROLLED_BACK = 'rolled back'
+
+class WarningCollector(IFailuresPreprocessor):
+    # Handles every failure of a commit in one pass instead of one dialog
+    # each, and keeps (description, severity, outcome, element ids) records
+    # for the summary printed after the transaction
+    def __init__(self, policy=SUPPRESS):
+        self.policy = policy
+        self.failures = []
+
+    def PreprocessFailures(self, failures_accessor):
+        messages = list(failures_accessor.GetFailureMessages())
+        errors = [m for m in messages if m.GetSeverity() != FailureSeverity.Warning]
+        rollback = bool(errors) and self.policy == ROLLBACK
+        resolved = False
+        for message in messages:
+            is_warning = message.GetSeverity() == FailureSeverity.Warning
+            if rollback:
+                outcome = ROLLED_BACK
+            elif is_warning:
+                failures_accessor.DeleteWarning(message)
+                outcome = SUPPRESSED
+            elif self.policy == RESOLVE and message.HasResolutions():
+                failures_accessor.ResolveFailure(message)
+                outcome = RESOLVED
+                resolved = True
+            else:
+                outcome = LEFT_TO_REVIT
+            self.failures.append((message.GetDescriptionText(), str(message.GetSeverity()), outcome,
+                                  [element_id.IntegerValue for element_id in message.GetFailingElementIds()]))
+        if rollback:
+            return FailureProcessingResult.ProceedWithRollBack
+        if resolved:
+            # Resolutions change the model, so Revit has to check it again
+            return FailureProcessingResult.ProceedWithCommit
+        return FailureProcessingResult.Continue
+
+def get_warning_policy():
+    from pyrevit import script
+    policy = script.get_config(POLICY_SECTION).get_option('warning_policy', SUPPRESS)
+    return policy if policy in POLICY_OPTIONS.values() else SUPPRESS
+
+def get_warning_collector():
+    # A collector following the shared policy
+    return WarningCollector(get_warning_policy())
+
+def save_warning_policy(policy):
+    from pyrevit import script
+    script.get_config(POLICY_SECTION).warning_policy = policy
+    script.save_config()
+
+def choose_warning_policy(message='Revit warnings:'):
+    # Shift+Click menu for tools whose only setting is the shared policy
+    from pyrevit import forms
+    choice = forms.CommandSwitchWindow.show(sorted(POLICY_OPTIONS.keys()), message=message)
+    if choice:
+        save_warning_policy(POLICY_OPTIONS[choice])
+
+def apply_failure_handling(transaction, collector):
+    # Must be called before the transaction is committed
+    options = transaction.GetFailureHandlingOptions()
+    options.SetFailuresPreprocessor(collector)
+    options.SetClearAfterRollback(True)
+    transaction.SetFailureHandlingOptions(options)
+
+def summarize_failures(failures):
+    # Failures grouped by description, severity and outcome, most frequent first.
+    # Returns rows of (description, severity, outcome, count, element ids).
+    groups = {}
+    for description, severity, outcome, element_ids in failures:
+        group = groups.setdefault((description, severity, outcome), [0, set()])
+        group[0] += 1
+        group[1].update(element_ids)
+    rows = [key + (count, sorted(element_ids)) for key, (count, element_ids) in groups.items()]
+    return sorted(rows, key=lambda row: (-row[3], row[0]))
+
+def print_failure_summary(output, collector, title="Revit Warnings"):
+    if not collector.failures:
+        return
+    table_data = [[description, severity, outcome, str(count), output.linkify([ElementId(i) for i in element_ids])]
+                  for description, severity, outcome, count, element_ids in summarize_failures(collector.failures)]
+    output.print_table(table_data=table_data, title=title, columns=['Warning', 'Severity', 'Outcome', 'Count', 'Elements'])
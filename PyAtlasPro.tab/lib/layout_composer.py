@@ -0,0 +1,224 @@
+# Chains Align and Distribute steps on one selection without touching the
+# model in between. Bounding boxes and anchors are read once into a position
+# model, every step moves the in-memory copies, and only the net offset of
+# each element is written, in one transaction, with elements that share an
+# offset moved by a single MoveElements call.
+#
+#   composer = LayoutComposer(doc, selection)
+#   composer.align('left').distribute('Y', 'X', EQUAL_GAPS).align('top')
+#   composer.apply(profile, warnings)
+import re
+
+from Autodesk.Revit.DB import Transaction
+
+from element_alignment_utils import (AXIS_OFFSETS, EXTENT_STRIDE, MOVE_TOLERANCE, get_alignment_target,
+                                     get_extent_snapshot, get_view_direction, get_view_orientation_axis,
+                                     group_by_delta, move_elements_by_offsets)
+from element_location_utils import (EQUAL_GAPS, EVEN_ANCHORS, EVEN_ANCHORS_NO_OVERLAP, get_anchor,
+                                    get_spacing_shifts)
+from failure_handling import apply_failure_handling
+
+# Step names as on the buttons, with the direction or (axis, cross axis) they
+# use. Align Horizontal lines centers up on a horizontal line, so it moves
+# elements vertically.
+ALIGN_STEPS = {
+    'align left': 'left',
+    'align right': 'right',
+    'align top': 'top',
+    'align bottom': 'bottom',
+    'align horizontal': 'center-v',
+    'align vertical': 'center-h'
+}
+DISTRIBUTE_STEPS = {
+    'distribute horizontal': ('X', 'Y'),
+    'distribute vertical': ('Y', 'X')
+}
+
+# Spacing of a Distribute step, written in brackets after it
+SPACING_MODES = {
+    'anchors': EVEN_ANCHORS,
+    'no overlap': EVEN_ANCHORS_NO_OVERLAP,
+    'gaps': EQUAL_GAPS
+}
+
+DEFAULT_PIPELINE = 'Align Left, Distribute Vertical, Align Top'
+
+# Distribute steps need this many elements with a location, as the buttons do
+MIN_DISTRIBUTE_ELEMENTS = 3
+
+class LayoutStep(object):
+    # One Align (direction) or Distribute (axis, cross_axis, mode) step
+    def __init__(self, name, direction=None, axis=None, cross_axis=None, mode=EVEN_ANCHORS):
+        self.name = name
+        self.direction = direction
+        self.axis = axis
+        self.cross_axis = cross_axis
+        self.mode = mode
+
+def parse_pipeline(text):
+    # "Align Left, Distribute Vertical (gaps), Align Top" -> LayoutSteps.
+    # Raises ValueError naming the first step it does not know.
+    steps = []
+    for part in [part.strip() for part in text.split(',') if part.strip()]:
+        match = re.match(r'^(.*?)\s*(?:\((.*)\))?$', part)
+        name = ' '.join(match.group(1).lower().split())
+        mode = ' '.join((match.group(2) or 'anchors').lower().split())
+        if name in ALIGN_STEPS and not match.group(2):
+            steps.append(LayoutStep(part, direction=ALIGN_STEPS[name]))
+        elif name in DISTRIBUTE_STEPS and mode in SPACING_MODES:
+            axis, cross_axis = DISTRIBUTE_STEPS[name]
+            steps.append(LayoutStep(part, axis=axis, cross_axis=cross_axis, mode=SPACING_MODES[mode]))
+        else:
+            raise ValueError('Unknown layout step: "{0}"'.format(part))
+    if not steps:
+        raise ValueError('No layout steps given.')
+    return steps
+
+class StepReport(object):
+    # What running the step on its own would have cost: element reads,
+    # move calls and one transaction
+    def __init__(self, name, moved=0, reads=0, move_calls=0, skipped=False):
+        self.name = name
+        self.moved = moved
+        self.reads = reads
+        self.move_calls = move_calls
+        self.skipped = skipped
+
+class LayoutComposer(object):
+    def __init__(self, doc, elements, view=None):
+        self.doc = doc
+        self.view = view or doc.ActiveView
+        snapshot = get_extent_snapshot(doc, elements)
+        self.elements = snapshot.elements
+        self.box_reads = snapshot.api_reads
+        # Moved in place by every step; the snapshot keeps the original extents
+        self.extents = list(snapshot.extents)
+        self.anchors = None
+        self.anchor_reads = 0
+        self.offsets = [[0.0, 0.0, 0.0] for _ in self.elements]
+        self.reports = []
+        self.move_calls = 0
+
+    def _shift(self, index, axis, delta):
+        offset = AXIS_OFFSETS[axis]
+        base = index * EXTENT_STRIDE + offset
+        self.extents[base] += delta
+        self.extents[base + 3] += delta
+        self.extents[base + 6] += delta
+        self.offsets[index][offset] += delta
+        if self.anchors is not None and self.anchors[index] is not None:
+            self.anchors[index][offset] += delta
+
+    def _read_anchors(self):
+        # Only pipelines with a Distribute step read anchors, once for all of them
+        if self.anchors is None:
+            self.anchors = []
+            for element in self.elements:
+                anchor = get_anchor(element, self.view)
+                self.anchors.append([anchor.x, anchor.y, anchor.z] if anchor is not None else None)
+            self.anchor_reads = len(self.elements)
+        return self.anchors
+
+    def get_boxes(self, axis, cross_axis):
+        u = AXIS_OFFSETS[axis]
+        v = AXIS_OFFSETS[cross_axis]
+        extents = self.extents
+        return [(extents[base + u], extents[base + v], extents[base + u + 3], extents[base + v + 3])
+                for base in range(0, len(extents), EXTENT_STRIDE)]
+
+    def align(self, direction, name=None):
+        # Same target as align_elements: the extreme or mean box edge in the active view
+        direction = get_view_direction(self.view, direction)
+        axis = get_view_orientation_axis(self.view, direction)
+        offset = AXIS_OFFSETS[axis]
+        report = StepReport(name or 'Align {0}'.format(direction), reads=self.box_reads)
+        if self.elements:
+            column = 6 if direction in ['center-h', 'center-v'] else 0 if direction in ['left', 'bottom'] else 3
+            points = [self.extents[base + offset + column] for base in range(0, len(self.extents), EXTENT_STRIDE)]
+            target = get_alignment_target(points, direction)
+            deltas = [target - point for point in points]
+            groups = group_by_delta(range(len(deltas)), deltas)
+            for delta, indices in groups:
+                for index in indices:
+                    self._shift(index, axis, delta)
+            report.moved = sum(len(indices) for delta, indices in groups)
+            report.move_calls = len(groups)
+        self.reports.append(report)
+        return self
+
+    def distribute(self, axis, cross_axis, mode=EVEN_ANCHORS, name=None):
+        # Same spacing as the Distribute buttons: anchor points between the
+        # outermost ones, or box gaps in the modes that need extents
+        anchors = self._read_anchors()
+        indices = sorted([i for i in range(len(anchors)) if anchors[i] is not None],
+                         key=lambda i: anchors[i][AXIS_OFFSETS[axis]])
+        report = StepReport(name or 'Distribute {0}'.format(axis),
+                            reads=self.anchor_reads + (self.box_reads if mode != EVEN_ANCHORS else 0))
+        if len(indices) < MIN_DISTRIBUTE_ELEMENTS:
+            report.skipped = True
+            self.reports.append(report)
+            return self
+
+        boxes = self.get_boxes(axis, cross_axis)
+        values = [anchors[i][AXIS_OFFSETS[axis]] for i in indices]
+        shifts = get_spacing_shifts(values, [boxes[i] for i in indices], mode)
+        for index, shift in zip(indices, shifts):
+            if abs(shift) >= MOVE_TOLERANCE:
+                self._shift(index, axis, shift)
+                report.moved += 1
+        # The buttons move every element on its own
+        report.move_calls = report.moved
+        self.reports.append(report)
+        return self
+
+    def run(self, steps):
+        for step in steps:
+            if step.direction is not None:
+                self.align(step.direction, step.name)
+            else:
+                self.distribute(step.axis, step.cross_axis, step.mode, step.name)
+        return self
+
+    def apply(self, profile=None, warnings=None):
+        # One transaction with one move call per distinct net offset
+        if profile:
+            profile.read(len(self.elements))
+            profile.count('get_BoundingBox', self.box_reads)
+            transaction = profile.transaction('Compose Layout', warnings)
+        else:
+            transaction = Transaction(self.doc, 'Compose Layout')
+            if warnings is not None:
+                apply_failure_handling(transaction, warnings)
+        with transaction as t:
+            t.Start()
+            self.move_calls = move_elements_by_offsets(self.doc, [element.Id for element in self.elements], self.offsets)
+            t.Commit()
+        if profile:
+            profile.count('MoveElement', self.move_calls)
+        return self.move_calls
+
+    def get_savings(self):
+        # (separate, composed) counts of element reads, move calls and
+        # transactions; every transaction also regenerates the model
+        steps = [report for report in self.reports if not report.skipped]
+        separate = (sum(report.reads for report in steps), sum(report.move_calls for report in steps), len(steps))
+        composed = (self.box_reads + self.anchor_reads, self.move_calls, 1)
+        return separate, composed
+
+def _api_calls(counts):
+    # Reads and move calls, plus Start and Commit of each transaction
+    reads, move_calls, transactions = counts
+    return reads + move_calls + 2 * transactions
+
+def print_composer_report(output, composer):
+    table_data = [[report.name, 'skipped: too few elements with a location' if report.skipped else str(report.moved),
+                   str(report.reads), str(report.move_calls)] for report in composer.reports]
+    output.print_table(table_data=table_data, title='Layout Steps (each run on its own)',
+                       columns=['Step', 'Elements Moved', 'Reads', 'Move Calls'])
+    separate, composed = composer.get_savings()
+    table_data = [[label, str(a), str(b), str(a - b)]
+                  for label, a, b in zip(['Reads', 'Move calls', 'Transactions'], separate, composed)]
+    table_data.append(['API calls', str(_api_calls(separate)), str(_api_calls(composed)),
+                       str(_api_calls(separate) - _api_calls(composed))])
+    output.print_table(table_data=table_data, title='Composed vs Separate Steps',
+                       columns=['', 'Separate', 'Composed', 'Saved'])
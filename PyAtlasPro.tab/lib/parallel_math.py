@@ -0,0 +1,70 @@
+# Pure-math evaluation fanned out over threads in chunks. IronPython has no
+# GIL, so the chunks really run side by side there; under CPython (the
+# benchmarks) they run one after the other on the calling thread.
+#
+# The Revit API may only be called from the thread running the script, so
+# callers extract plain values first, map them here and apply the returned
+# ids or deltas inside their transaction afterwards. Functions passed in must
+# not touch the API or shared state.
+import sys
+
+# Thread start-up costs more than it saves below this many values
+MIN_PARALLEL_VALUES = 4096
+
+# Values handed to a worker at a time
+CHUNK_SIZE = 2048
+
+PARALLEL = sys.platform == 'cli'
+
+def get_worker_count():
+    if PARALLEL:
+        from System import Environment
+        return Environment.ProcessorCount
+    return 1
+
+def split_chunks(count, chunk_size=CHUNK_SIZE, step=1):
+    # (start, end) bounds covering range(count); every start is a multiple of
+    # `step` so records of `step` values are never cut in two
+    chunk_size = max(step, chunk_size - chunk_size % step)
+    return [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+
+def map_chunks(function, values, chunk_size=CHUNK_SIZE, step=1, parallel=None):
+    # `function(values[start:end])` returns a list per chunk; the lists are
+    # joined in chunk order, so the result is the same as function(values).
+    # `parallel` forces threads on or off, e.g. to check results under CPython.
+    if parallel is None:
+        parallel = PARALLEL and len(values) >= MIN_PARALLEL_VALUES
+    bounds = split_chunks(len(values), chunk_size, step)
+    if not parallel or len(bounds) < 2:
+        return list(function(values))
+
+    import threading
+    results = [None] * len(bounds)
+    errors = []
+    lock = threading.Lock()
+    pending = iter(range(len(bounds)))
+
+    def work():
+        while not errors:
+            with lock:
+                index = next(pending, None)
+            if index is None:
+                return
+            start, end = bounds[index]
+            try:
+                results[index] = function(values[start:end])
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=work) for _ in range(min(max(get_worker_count(), 2), len(bounds)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+    joined = []
+    for result in results:
+        joined.extend(result)
+    return joined
@@ -0,0 +1,164 @@
+# Polar layouts shared by Distribute Radial and Circle: elements spread
+# along a full circle, a bound arc or an ellipse, equally spaced by arc
+# length (see curve_distribution for the length table). The path is read from the
+# API once into plain floats, every target position and facing angle is
+# computed from it in one pass (see parallel_math) and the moves and
+# rotations are written together inside the caller's transaction.
+from collections import namedtuple
+from math import atan2, cos, pi, sin, sqrt
+
+from parallel_math import map_chunks
+
+FULL_TURN = 2 * pi
+
+# Radii closer than this (relative) make a circle, spaced by equal angles
+CIRCLE_TOLERANCE = 1e-9
+
+# Point type evaluated by the length table
+_PathPoint = namedtuple('_PathPoint', ['X', 'Y', 'Z'])
+
+# Families face along their local Y axis, a quarter turn from the rotation angle
+FACING_OFFSET = pi / 2
+
+class PolarPath(object):
+    # `center` and the unit `x_axis`/`y_axis` are (x, y, z) tuples; angles are
+    # curve parameters in radians measured from x_axis towards y_axis, as
+    # Revit's arcs and ellipses use them. Closed paths go all the way round
+    # from start_angle and have no end points.
+    __slots__ = ('center', 'radius_x', 'radius_y', 'x_axis', 'y_axis', 'start_angle', 'end_angle', 'closed')
+
+    def __init__(self, center, radius_x, radius_y, x_axis=(1.0, 0.0, 0.0), y_axis=(0.0, 1.0, 0.0),
+                 start_angle=0.0, end_angle=None, closed=True):
+        self.center = center
+        self.radius_x = radius_x
+        self.radius_y = radius_y
+        self.x_axis = x_axis
+        self.y_axis = y_axis
+        self.start_angle = start_angle
+        self.end_angle = start_angle + FULL_TURN if closed or end_angle is None else end_angle
+        self.closed = closed
+
+    def point_at(self, angle):
+        u = self.radius_x * cos(angle)
+        v = self.radius_y * sin(angle)
+        return tuple(c + u * x + v * y for c, x, y in zip(self.center, self.x_axis, self.y_axis))
+
+    def angle_of(self, point):
+        # Parameter of the path point in the direction of `point` from the center
+        d = [p - c for p, c in zip(point, self.center)]
+        u = sum(a * b for a, b in zip(d, self.x_axis)) / self.radius_x
+        v = sum(a * b for a, b in zip(d, self.y_axis)) / self.radius_y
+        return atan2(v, u)
+
+def circle_path(center, radius, start_angle=0.0):
+    # Full circle in plan around an (x, y, z) center
+    return PolarPath(center, radius, radius, start_angle=start_angle)
+
+def _xyz_tuple(point):
+    return (point.X, point.Y, point.Z)
+
+def get_curve_path(curve, start_angle=0.0):
+    # PolarPath of an Arc or Ellipse, or None for any other curve. Bound
+    # curves run between their end parameters; `start_angle` only places the
+    # first element on unbound (closed) ones.
+    from Autodesk.Revit.DB import Arc, Ellipse
+    if isinstance(curve, Arc):
+        radius_x = radius_y = curve.Radius
+    elif isinstance(curve, Ellipse):
+        radius_x, radius_y = curve.RadiusX, curve.RadiusY
+    else:
+        return None
+    center = _xyz_tuple(curve.Center)
+    x_axis = _xyz_tuple(curve.XDirection)
+    y_axis = _xyz_tuple(curve.YDirection)
+    if not curve.IsBound:
+        return PolarPath(center, radius_x, radius_y, x_axis, y_axis, start_angle)
+    return PolarPath(center, radius_x, radius_y, x_axis, y_axis,
+                     curve.GetEndParameter(0), curve.GetEndParameter(1), closed=False)
+
+def get_path_length_table(path):
+    # Arc length along the path against the normalized angle from start_angle to end_angle
+    from curve_distribution import build_path_length_table
+    span = path.end_angle - path.start_angle
+    return build_path_length_table(lambda t: _PathPoint(*path.point_at(path.start_angle + t * span)))
+
+def get_path_distances(total, count, closed):
+    # Closed paths get `count` equal steps round the whole length; open paths
+    # put the first and last element on the end points, or a single one midway
+    if count < 1:
+        return []
+    if closed:
+        return [i * total / count for i in range(count)]
+    if count == 1:
+        return [total / 2.0]
+    return [i * total / float(count - 1) for i in range(count)]
+
+def get_path_angles(path, count):
+    # Angles of `count` points spaced equally along the path. On a circle that
+    # is equal angle steps; an ellipse is walked by arc length, since equal
+    # parameter steps bunch up towards its ends.
+    span = path.end_angle - path.start_angle
+    if abs(path.radius_x - path.radius_y) <= CIRCLE_TOLERANCE * max(path.radius_x, path.radius_y):
+        return [path.start_angle + d for d in get_path_distances(span, count, path.closed)]
+    table = get_path_length_table(path)
+    return [path.start_angle + table.param_at(d) * span for d in get_path_distances(table.total, count, path.closed)]
+
+def _get_chunk_targets(path, angles):
+    # (x, y, z, facing) per angle, facing being the plan angle from the point to the center
+    cx, cy = path.center[0], path.center[1]
+    targets = []
+    for angle in angles:
+        x, y, z = path.point_at(angle)
+        targets.append((x, y, z, atan2(cy - y, cx - x)))
+    return targets
+
+def get_polar_targets(path, count, parallel=None):
+    # Every target of a layout in one pass: (x, y, z, facing angle) tuples
+    return map_chunks(lambda angles: _get_chunk_targets(path, angles), get_path_angles(path, count), parallel=parallel)
+
+def order_along_path(anchors, path):
+    # Anchors in the order their current positions run along the path, so
+    # elements keep their order around it and do not cross each other
+    def key(anchor):
+        angle = path.angle_of((anchor.x, anchor.y, anchor.z)) - path.start_angle
+        return angle % FULL_TURN if path.closed else angle
+    return sorted(anchors, key=key)
+
+def get_mean_radius(anchors, center):
+    # Mean plan distance of the anchors from an (x, y, z) center
+    if not anchors:
+        return 0.0
+    return sum(sqrt((a.x - center[0]) ** 2 + (a.y - center[1]) ** 2) for a in anchors) / len(anchors)
+
+def _normalize_angle(angle):
+    # Same angle within (-pi, pi]
+    angle = angle % FULL_TURN
+    return angle - FULL_TURN if angle > pi else angle
+
+def get_facing_rotations(anchors, targets):
+    # (anchor index, angle) turns that make each point-based element face the
+    # center from its target; anchors must carry their rotation
+    rotations = []
+    for i, (anchor, target) in enumerate(zip(anchors, targets)):
+        if anchor.rotation is None:
+            continue
+        angle = _normalize_angle(target[3] - FACING_OFFSET - anchor.rotation)
+        if abs(angle) > 1e-9:
+            rotations.append((i, angle))
+    return rotations
+
+def apply_polar_layout(doc, anchors, targets, keep_elevation=False, face_center=False):
+    # Single write pass: every element is moved to its target and, with
+    # `face_center`, turned about the vertical axis through its new position.
+    # Must be called inside an open transaction. Returns (moved, rotated).
+    from Autodesk.Revit.DB import ElementTransformUtils, Line, XYZ
+    from element_location_utils import move_anchors
+
+    points = [(x, y, None if keep_elevation else z) for x, y, z, facing in targets]
+    moved = move_anchors(doc, anchors, points)
+    rotations = get_facing_rotations(anchors, targets) if face_center else []
+    for index, angle in rotations:
+        x, y = targets[index][0], targets[index][1]
+        axis = Line.CreateBound(XYZ(x, y, 0), XYZ(x, y, 1))
+        ElementTransformUtils.RotateElement(doc, anchors[index].id, axis, angle)
+    return moved, len(rotations)
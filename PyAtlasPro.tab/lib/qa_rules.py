@@ -0,0 +1,139 @@
+from Autodesk.Revit.DB import FilteredElementCollector, ElementMulticategoryFilter, BuiltInCategory, BuiltInParameter, \
+    CurveElement, Grid, Line, LocationCurve, Wall
+from System.Collections.Generic import List
+
+from wall_analysis import DEFAULT_TOLERANCE, FEET_TO_MM, is_whole_number, get_line_angles, get_axis_deviations
+from wall_check_utils import TABLE_CHUNK_SIZE, PROGRESS_STEP
+
+# Linear element categories collected by default, as BuiltInCategory names
+DEFAULT_CATEGORIES = ['OST_Walls', 'OST_StructuralFraming', 'OST_Grids', 'OST_Lines']
+
+class ElementReading(object):
+    # Values of one element shared by every rule, each read from the API at
+    # most once and only when a rule asks for it
+    _missing = object()
+
+    def __init__(self, element):
+        self.element = element
+        self._curve = self._missing
+        self._length_mm = self._missing
+
+    @property
+    def curve(self):
+        if self._curve is self._missing:
+            element = self.element
+            if isinstance(element, Grid):
+                self._curve = element.Curve
+            elif isinstance(element, CurveElement):
+                self._curve = element.GeometryCurve
+            else:
+                location = element.Location
+                self._curve = location.Curve if isinstance(location, LocationCurve) else None
+        return self._curve
+
+    @property
+    def length_mm(self):
+        if self._length_mm is self._missing:
+            self._length_mm = None
+            length_param = self.element.get_Parameter(BuiltInParameter.CURVE_ELEM_LENGTH)
+            if length_param and length_param.HasValue:
+                self._length_mm = length_param.AsDouble() * FEET_TO_MM
+            elif self.curve is not None and self.curve.IsBound:
+                self._length_mm = self.curve.Length * FEET_TO_MM
+        return self._length_mm
+
+    def parameter_mm(self, builtin_parameter):
+        param = self.element.get_Parameter(builtin_parameter)
+        if not param or not param.HasValue:
+            return None
+        return param.AsDouble() * FEET_TO_MM
+
+class QARule(object):
+    # `check(reading, settings)` returns the offending value as text, or None
+    # when the element passes. `element_class` limits the rule to one class.
+    def __init__(self, name, label, check, element_class=None):
+        self.name = name
+        self.label = label
+        self.check = check
+        self.element_class = element_class
+
+    def applies_to(self, element):
+        return self.element_class is None or isinstance(element, self.element_class)
+
+def _format_mm(value):
+    return '{0:.2f} mm'.format(value)
+
+def _check_whole_length(reading, settings):
+    length_mm = reading.length_mm
+    if length_mm is not None and not is_whole_number(length_mm):
+        return _format_mm(length_mm)
+
+def _check_off_axis(reading, settings):
+    curve = reading.curve
+    if not isinstance(curve, Line):
+        return None
+    start = curve.GetEndPoint(0)
+    end = curve.GetEndPoint(1)
+    angle = get_line_angles([start.X, start.Y, end.X, end.Y])[0]
+    deviation = get_axis_deviations([angle], settings.get('reference_angle', 0.0))[0]
+    if deviation > settings.get('tolerance', DEFAULT_TOLERANCE):
+        return '{0:.3f} deg'.format(deviation)
+
+def _parameter_check(builtin_parameter_name):
+    def check(reading, settings):
+        value = reading.parameter_mm(getattr(BuiltInParameter, builtin_parameter_name))
+        if value is not None and not is_whole_number(value):
+            return _format_mm(value)
+    return check
+
+def _check_wall_type(reading, settings):
+    # A wall's Name is the name of its type
+    allowed = settings.get('wall_types')
+    if not allowed:
+        return None
+    element = reading.element
+    if element.Name not in allowed:
+        return '{0} ({1})'.format(element.Name, _format_mm(element.Width * FEET_TO_MM))
+
+RULES = [
+    QARule('whole_length', 'Length not whole mm', _check_whole_length),
+    QARule('off_axis', 'Off axis', _check_off_axis),
+    QARule('base_offset', 'Base offset not whole mm', _parameter_check('WALL_BASE_OFFSET'), Wall),
+    QARule('top_offset', 'Top offset not whole mm', _parameter_check('WALL_TOP_OFFSET'), Wall),
+    QARule('height', 'Height not whole mm', _parameter_check('WALL_USER_HEIGHT_PARAM'), Wall),
+    QARule('wall_type', 'Wall type not in type list', _check_wall_type, Wall)
+]
+
+def get_rules(names=None):
+    return [rule for rule in RULES if names is None or rule.name in names]
+
+def collect_qa_elements(doc, view, categories=DEFAULT_CATEGORIES):
+    # One collector for every category the rules look at
+    category_list = List[BuiltInCategory]([getattr(BuiltInCategory, name) for name in categories])
+    return FilteredElementCollector(doc, view.Id).WherePasses(ElementMulticategoryFilter(category_list)) \
+        .WhereElementIsNotElementType()
+
+def run_rules(elements, rules, settings, total=0, progress=None):
+    # The single traversal: every rule runs on each element before moving on.
+    # Returns (element, rule, value) findings in collector order.
+    findings = []
+    for i, element in enumerate(elements):
+        reading = ElementReading(element)
+        for rule in rules:
+            if rule.applies_to(element):
+                value = rule.check(reading, settings)
+                if value is not None:
+                    findings.append((element, rule, value))
+        if progress and i % PROGRESS_STEP == 0:
+            progress(i, total)
+    return findings
+
+def print_findings_table(output, findings, title="QA Findings", chunk_size=TABLE_CHUNK_SIZE):
+    columns = ['ID', 'Category', 'Rule', 'Value']
+    total = len(findings)
+    for start in range(0, total, chunk_size):
+        chunk = findings[start:start + chunk_size]
+        table_data = [[output.linkify(element.Id), element.Category.Name if element.Category else '', rule.label, value]
+                      for element, rule, value in chunk]
+        chunk_title = title if total <= chunk_size else "{0} ({1}-{2} of {3})".format(title, start + 1, start + len(chunk), total)
+        output.print_table(table_data=table_data, title=chunk_title, columns=columns)
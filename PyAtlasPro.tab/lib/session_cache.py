@@ -0,0 +1,46 @@
+from pyrevit.coreutils import envvars
+
+# Module globals only survive between runs while pyRevit reuses the engine
+# (rocket mode) and are lost whenever it starts a fresh one. Caches are parked
+# in the AppDomain through pyRevit's env vars instead and live for the whole
+# Revit session either way.
+CACHE_PREFIX = 'PYATLASPRO_CACHE_'
+
+# Names of every cache created this session, so a document can be dropped from all of them
+REGISTRY_KEY = CACHE_PREFIX + '_NAMES'
+
+def _get_registry():
+    names = envvars.get_pyrevit_env_var(REGISTRY_KEY)
+    if names is None:
+        names = set()
+        envvars.set_pyrevit_env_var(REGISTRY_KEY, names)
+    return names
+
+def get_session_cache(name):
+    key = CACHE_PREFIX + name.upper()
+    cache = envvars.get_pyrevit_env_var(key)
+    if cache is None:
+        cache = {}
+        envvars.set_pyrevit_env_var(key, cache)
+        _get_registry().add(name)
+    return cache
+
+def get_document_key(doc):
+    # Saved documents are keyed by path, unsaved ones by title
+    return doc.PathName or doc.Title
+
+def get_document_cache(name, doc):
+    cache = get_session_cache(name)
+    key = get_document_key(doc)
+    if key not in cache:
+        cache[key] = {}
+    return cache[key]
+
+def clear_document_cache(name, doc):
+    get_session_cache(name).pop(get_document_key(doc), None)
+
+def clear_document_caches(doc):
+    # Everything cached for `doc` in any cache, e.g. before the document is closed
+    key = get_document_key(doc)
+    for name in list(_get_registry()):
+        get_session_cache(name).pop(key, None)
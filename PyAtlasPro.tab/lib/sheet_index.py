@@ -0,0 +1,111 @@
+from Autodesk.Revit.DB import FilteredElementCollector, ElementId, Viewport
+
+from change_tracking import start_tracking, get_revision, get_changes_since
+from session_cache import get_document_cache
+
+# Above this many changed elements a full rebuild is cheaper than patching the index
+MAX_INCREMENTAL_CHANGES = 5000
+
+class SheetIndex(object):
+    # Which views are placed on which sheets, keyed by ElementId integer values.
+    # Only the view properties the Heads tools filter on are kept.
+    def __init__(self):
+        self.viewports = {}  # viewport id -> (sheet id, view id)
+        self.sheets = {}     # sheet id -> set of viewport ids
+        self.views = {}      # view id -> view record
+        self.revision = 0
+
+    def add_viewport(self, doc, viewport):
+        viewport_id = viewport.Id.IntegerValue
+        sheet_id = viewport.SheetId.IntegerValue
+        view_id = viewport.ViewId.IntegerValue
+        self.remove_viewport(viewport_id)
+        self.viewports[viewport_id] = (sheet_id, view_id)
+        self.sheets.setdefault(sheet_id, set()).add(viewport_id)
+        if view_id not in self.views:
+            self.update_view(doc.GetElement(viewport.ViewId))
+
+    def remove_viewport(self, viewport_id):
+        placement = self.viewports.pop(viewport_id, None)
+        if placement is not None:
+            self.sheets.get(placement[0], set()).discard(viewport_id)
+
+    def update_view(self, view):
+        self.views[view.Id.IntegerValue] = {
+            'name': view.Name,
+            'view_type': view.ViewType,
+            'is_template': view.IsTemplate,
+            'can_be_printed': view.CanBePrinted
+        }
+
+    def get_sheet_view_ids(self, sheet_id):
+        return [self.viewports[viewport_id][1] for viewport_id in self.sheets.get(sheet_id, ())]
+
+def build_sheet_index(doc):
+    # A single pass over the viewports of the document
+    index = SheetIndex()
+    for viewport in FilteredElementCollector(doc).OfClass(Viewport):
+        index.add_viewport(doc, viewport)
+    return index
+
+def update_sheet_index(doc, index, changes):
+    # Patch the index with the elements added, modified or deleted since it was
+    # built. Returns False when the change set is too large to patch.
+    added, modified, deleted = changes
+    if len(added) + len(modified) + len(deleted) > MAX_INCREMENTAL_CHANGES:
+        return False
+    for element_id in deleted:
+        index.remove_viewport(element_id)
+        index.views.pop(element_id, None)
+    # Only added elements and already indexed ones can affect the index
+    for element_id in added | (modified & (set(index.viewports) | set(index.views))):
+        element = doc.GetElement(ElementId(element_id))
+        if isinstance(element, Viewport):
+            index.add_viewport(doc, element)
+        elif element_id in index.views:
+            index.update_view(element)
+    return True
+
+def get_sheet_index(doc):
+    # Kept for the whole Revit session and patched from DocumentChanged, so
+    # later runs only pay for what changed since the last one
+    start_tracking(doc)
+    cache = get_document_cache('sheet_index', doc)
+    index = cache.get('index')
+    if index is not None:
+        changes = get_changes_since(doc, index.revision)
+        if changes is None or not update_sheet_index(doc, index, changes):
+            index = None
+    if index is None:
+        index = build_sheet_index(doc)
+        cache['index'] = index
+    index.revision = get_revision(doc)
+    return index
+
+def _unique_labels(entries):
+    # entries: (label, view type, view id). Labels used more than once get
+    # the view type, and the view id if that still does not tell them apart.
+    counts = {}
+    for label, view_type, view_id in entries:
+        counts[label] = counts.get(label, 0) + 1
+    entries = [(label if counts[label] == 1 else '{0} ({1})'.format(label, view_type), view_type, view_id)
+               for label, view_type, view_id in entries]
+    counts = {}
+    for label, view_type, view_id in entries:
+        counts[label] = counts.get(label, 0) + 1
+    return [(label if counts[label] == 1 else '{0} [{1}]'.format(label, view_id), view_id)
+            for label, view_type, view_id in entries]
+
+def get_sheet_views(doc, sheets, valid_view_types):
+    # Views placed on `sheets` that Heads tools can work on, as a dict of
+    # unique display name -> view id. Names are prefixed with the sheet
+    # number; views sharing a name on one sheet also get their view type.
+    index = get_sheet_index(doc)
+    entries = []
+    for sheet in sheets:
+        for view_id in index.get_sheet_view_ids(sheet.Id.IntegerValue):
+            record = index.views.get(view_id)
+            if not record or record['view_type'] not in valid_view_types or record['is_template'] or not record['can_be_printed']:
+                continue
+            entries.append(('{0} - {1}'.format(sheet.SheetNumber, record['name']), record['view_type'], view_id))
+    return dict(_unique_labels(entries))
@@ -0,0 +1,187 @@
+import json
+import os
+import time
+
+from Autodesk.Revit.DB import Transaction, TransactionStatus
+
+from change_tracking import start_tracking, get_revision, get_changes_since
+from failure_handling import apply_failure_handling
+
+# Revit API calls every run reports, even when a tool never makes them
+KEY_CALLS = ('get_BoundingBox', 'MoveElement', 'SetElementOverrides', 'ShowBubbleInView', 'HideBubbleInView')
+
+# One JSON record per tool run, shared by every PyAtlasPro button
+LOG_FILE_ID = 'PyAtlasPro_performance'
+LOG_FILE_EXT = 'jsonl'
+
+def get_log_path():
+    from pyrevit.coreutils import appdata
+    return appdata.get_universal_data_file(LOG_FILE_ID, LOG_FILE_EXT)
+
+def get_document_size_mb(doc):
+    # Size of the saved model on disk; unsaved and cloud models have none
+    path = doc.PathName
+    if not path or not os.path.isfile(path):
+        return None
+    return round(os.path.getsize(path) / (1024.0 * 1024.0), 1)
+
+def _status_name(status):
+    if status == TransactionStatus.Committed:
+        return 'committed'
+    if status == TransactionStatus.RolledBack:
+        return 'rolled back'
+    return str(status)
+
+class ProfiledTransaction(object):
+    # Drop-in for Transaction that times Start to Commit/RollBack and counts
+    # the elements the transaction added, modified or deleted. A `warnings`
+    # collector handles the failures of the commit in one pass.
+    def __init__(self, profile, doc, name, warnings=None):
+        self.profile = profile
+        self.doc = doc
+        self.transaction = Transaction(doc, name)
+        self.warnings = warnings
+        if warnings is not None:
+            apply_failure_handling(self.transaction, warnings)
+        self.name = name
+        self.started = None
+        self.revision = None
+        self.failure_count = 0
+
+    def __enter__(self):
+        self.transaction.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self.transaction.__exit__(exc_type, exc_value, traceback)
+
+    def Start(self):
+        self.revision = get_revision(self.doc)
+        self.failure_count = len(self.warnings.failures) if self.warnings is not None else 0
+        self.started = time.time()
+        return self.transaction.Start()
+
+    def Commit(self):
+        # A rollback policy can turn the commit into a rollback
+        status = self.transaction.Commit()
+        self._finish(_status_name(status))
+        return status
+
+    def RollBack(self):
+        status = self.transaction.RollBack()
+        self._finish('rolled back')
+        return status
+
+    def _finish(self, status):
+        seconds = time.time() - self.started
+        changes = get_changes_since(self.doc, self.revision)
+        modified = len(changes[0] | changes[1] | changes[2]) if changes is not None else 0
+        if status == 'committed':
+            self.profile.elements_modified += modified
+        warning_count = len(self.warnings.failures) - self.failure_count if self.warnings is not None else 0
+        self.profile.transactions.append({'name': self.name, 'seconds': round(seconds, 4), 'status': status,
+                                          'elements_modified': modified, 'warnings': warning_count})
+
+class ToolProfile(object):
+    # Measures one run of a tool. Scripts open their transactions through
+    # `transaction()` and report reads and API calls they made; `finish()`
+    # appends the run to the performance log.
+    def __init__(self, tool, doc):
+        start_tracking(doc)
+        self.tool = tool
+        self.doc = doc
+        self.started = time.time()
+        self.elements_read = 0
+        self.elements_modified = 0
+        self.calls = dict((name, 0) for name in KEY_CALLS)
+        self.transactions = []
+
+    def transaction(self, name, warnings=None):
+        return ProfiledTransaction(self, self.doc, name, warnings)
+
+    def count(self, call, number=1):
+        self.calls[call] = self.calls.get(call, 0) + number
+
+    def read(self, number):
+        self.elements_read += number
+
+    def get_record(self):
+        return {
+            'tool': self.tool,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'seconds': round(time.time() - self.started, 4),
+            'document': self.doc.Title,
+            'document_size_mb': get_document_size_mb(self.doc),
+            'elements_read': self.elements_read,
+            'elements_modified': self.elements_modified,
+            'calls': self.calls,
+            'transactions': self.transactions
+        }
+
+    def finish(self, log_path=None):
+        # Logging must never break the tool it measures
+        record = self.get_record()
+        try:
+            with open(log_path or get_log_path(), 'a') as log:
+                log.write(json.dumps(record, sort_keys=True) + '\n')
+        except (IOError, OSError):
+            pass
+        return record
+
+def read_log(log_path=None):
+    # Records of the log, skipping lines cut short by a crash
+    path = log_path or get_log_path()
+    records = []
+    if not os.path.isfile(path):
+        return records
+    with open(path) as log:
+        for line in log:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of a non-empty list
+    values = sorted(values)
+    rank = int(round(fraction * (len(values) - 1)))
+    return values[rank]
+
+def get_element_bucket(count):
+    # Element counts grouped by order of magnitude: 0, 1-9, 10-99, ...
+    if count <= 0:
+        return '0'
+    low = 10 ** (len(str(int(count))) - 1)
+    return '{0}-{1}'.format(low, low * 10 - 1)
+
+# Upper limits of the document size buckets in MB
+SIZE_LIMITS = (50, 200, 500)
+
+def get_size_bucket(size_mb):
+    if size_mb is None:
+        return 'unsaved'
+    for limit in SIZE_LIMITS:
+        if size_mb < limit:
+            return '< {0} MB'.format(limit)
+    return '>= {0} MB'.format(SIZE_LIMITS[-1])
+
+def _group_order(key):
+    tool, size_bucket, element_bucket = key
+    size_order = [get_size_bucket(None)] + [get_size_bucket(limit - 1) for limit in SIZE_LIMITS]
+    size_rank = size_order.index(size_bucket) if size_bucket in size_order else len(size_order)
+    return tool, size_rank, int(element_bucket.split('-')[0])
+
+def summarize_log(records):
+    # p50/p95 run time per tool, document size and element count bucket.
+    # Returns rows sorted by tool: (tool, size bucket, element bucket, runs, p50, p95).
+    groups = {}
+    for record in records:
+        key = (record.get('tool', ''), get_size_bucket(record.get('document_size_mb')),
+               get_element_bucket(record.get('elements_read', 0)))
+        groups.setdefault(key, []).append(record.get('seconds', 0.0))
+    rows = []
+    for key in sorted(groups, key=_group_order):
+        seconds = groups[key]
+        rows.append(key + (len(seconds), percentile(seconds, 0.5), percentile(seconds, 0.95)))
+    return rows
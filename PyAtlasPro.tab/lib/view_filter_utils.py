@@ -0,0 +1,30 @@
+from Autodesk.Revit.DB import FilteredElementCollector, SelectionFilterElement, ElementId
+from System.Collections.Generic import List
+
+# Prefix shared by every temporary filter PyAtlasPro adds to a view
+FILTER_PREFIX = 'PyAtlasPro'
+
+def get_filter_name(tool_name, view):
+    # One filter per tool and view, so checks in different views do not overwrite each other
+    return '{0} {1} - {2}'.format(FILTER_PREFIX, tool_name, view.Id.IntegerValue)
+
+def get_selection_filter(doc, name):
+    for selection_filter in FilteredElementCollector(doc).OfClass(SelectionFilterElement):
+        if selection_filter.Name == name:
+            return selection_filter
+    return None
+
+def apply_selection_filter(doc, view, name, element_ids, override):
+    # Show `element_ids` in `view` with `override` through a single selection
+    # filter, creating the filter the first time and refreshing its ids after.
+    # Must be called inside an open transaction.
+    selection_filter = get_selection_filter(doc, name)
+    if selection_filter is None:
+        if not element_ids:
+            return None
+        selection_filter = SelectionFilterElement.Create(doc, name)
+    selection_filter.SetElementIds(List[ElementId](element_ids))
+    if not view.IsFilterApplied(selection_filter.Id):
+        view.AddFilter(selection_filter.Id)
+    view.SetFilterOverrides(selection_filter.Id, override)
+    return selection_filter
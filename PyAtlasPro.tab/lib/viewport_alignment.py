@@ -0,0 +1,181 @@
+# Keeps viewports in the same place across sheets. Viewports on the target
+# sheets are matched to those of a reference sheet by view type or by view
+# name pattern, the box-center deltas are worked out in one pass and every
+# viewport is moved in a single transaction, viewports sharing a delta with
+# a single MoveElements call.
+from fnmatch import fnmatch
+
+from Autodesk.Revit.DB import ElementId
+
+from change_tracking import get_changes_since, get_revision, start_tracking
+from element_alignment_utils import move_elements_by_offsets
+from session_cache import get_document_cache
+from sheet_index import MAX_INCREMENTAL_CHANGES, get_sheet_index
+
+# How viewports on different sheets are paired up
+MATCH_VIEW_TYPE = 'view_type'
+MATCH_NAME_PATTERN = 'name_pattern'
+
+# Reasons a viewport on a target sheet is left where it is
+NO_MATCH = 'no matching viewport on the reference sheet'
+AMBIGUOUS = 'several viewports match'
+PINNED = 'pinned'
+
+def _outline_tuple(outline):
+    minimum = outline.MinimumPoint
+    maximum = outline.MaximumPoint
+    return (minimum.X, minimum.Y, maximum.X, maximum.Y)
+
+def get_viewport_outlines(doc, viewport_ids):
+    # (min x, min y, max x, max y) box outline per viewport id, kept for the
+    # Revit session. Outlines of viewports, or of their views, changed since
+    # the last run are read again. Elements drawn inside a view are not
+    # tracked, so an annotation moved outside a crop shows on the next change
+    # of its viewport. Returns (outlines, number read from the API).
+    start_tracking(doc)
+    cache = get_document_cache('viewport_outlines', doc)
+    outlines = cache.get('outlines')
+    if outlines is not None:
+        changes = get_changes_since(doc, cache['revision'])
+        if changes is None or sum(len(ids) for ids in changes) > MAX_INCREMENTAL_CHANGES:
+            outlines = None
+        else:
+            changed = changes[0] | changes[1] | changes[2]
+            for viewport_id in [i for i, (view_id, outline) in outlines.items() if i in changed or view_id in changed]:
+                del outlines[viewport_id]
+    if outlines is None:
+        outlines = {}
+        cache['outlines'] = outlines
+
+    reads = 0
+    for viewport_id in viewport_ids:
+        if viewport_id not in outlines:
+            viewport = doc.GetElement(ElementId(viewport_id))
+            outlines[viewport_id] = (viewport.ViewId.IntegerValue, _outline_tuple(viewport.GetBoxOutline()))
+            reads += 1
+    cache['revision'] = get_revision(doc)
+    return dict((viewport_id, outlines[viewport_id][1]) for viewport_id in viewport_ids), reads
+
+def record_moved_outlines(doc, plan):
+    # Called after the move is committed: shift the cached outlines by the
+    # offsets applied, so the next run does not read them again. Anything else
+    # changed along the way leaves the cache to the usual invalidation.
+    cache = get_document_cache('viewport_outlines', doc)
+    outlines = cache.get('outlines')
+    if outlines is None or cache.get('revision') != plan.revision:
+        return
+    changes = get_changes_since(doc, plan.revision)
+    moved = dict((element_id.IntegerValue, offset) for element_id, offset in zip(plan.viewport_ids, plan.offsets))
+    if changes is None or changes[0] or changes[2] or not changes[1] <= set(moved):
+        return
+    for viewport_id, (dx, dy, dz) in moved.items():
+        if viewport_id in outlines:
+            view_id, (min_x, min_y, max_x, max_y) = outlines[viewport_id]
+            outlines[viewport_id] = (view_id, (min_x + dx, min_y + dy, max_x + dx, max_y + dy))
+    cache['revision'] = get_revision(doc)
+
+def get_match_key(record, mode, patterns=()):
+    # Viewports with the same key on two sheets are paired; None never matches.
+    # Name patterns use * and ? wildcards, case-insensitive; the first one that
+    # matches the view name is the key.
+    if mode == MATCH_VIEW_TYPE:
+        return str(record['view_type'])
+    name = record['name'].lower()
+    for i, pattern in enumerate(patterns):
+        if fnmatch(name, pattern.lower()):
+            return i
+    return None
+
+def parse_name_patterns(text):
+    # "*Plan*; Legend*" -> ['*Plan*', 'Legend*']
+    return [pattern.strip() for pattern in text.split(';') if pattern.strip()]
+
+def _get_keyed_viewports(index, sheet_id, mode, patterns):
+    # key -> [viewport ids] for the viewports on a sheet, and the view record of each viewport
+    keyed = {}
+    records = {}
+    for viewport_id in sorted(index.sheets.get(sheet_id, ())):
+        record = index.views.get(index.viewports[viewport_id][1])
+        if record is None:
+            continue
+        records[viewport_id] = record
+        key = get_match_key(record, mode, patterns)
+        if key is not None:
+            keyed.setdefault(key, []).append(viewport_id)
+    return keyed, records
+
+def _center(outline):
+    return ((outline[0] + outline[2]) / 2.0, (outline[1] + outline[3]) / 2.0)
+
+class ViewportPlan(object):
+    # Viewport ids to move with their (dx, dy, 0) offsets, and the viewports
+    # left alone as (sheet number, view name, reason)
+    def __init__(self):
+        self.viewport_ids = []
+        self.offsets = []
+        self.sheets = set()
+        self.skipped = []
+        self.matched = 0
+        self.outline_reads = 0
+        self.cached_outlines = 0
+        self.move_calls = 0
+        self.revision = None
+
+def plan_viewport_alignment(doc, reference_sheet, target_sheets, mode=MATCH_VIEW_TYPE, patterns=()):
+    # Pairs only keys found once on the reference sheet and once on the target
+    # sheet; the offsets move each target box center onto the reference one
+    plan = ViewportPlan()
+    index = get_sheet_index(doc)
+    reference, reference_records = _get_keyed_viewports(index, reference_sheet.Id.IntegerValue, mode, patterns)
+
+    pairs = []
+    for sheet in target_sheets:
+        if sheet.Id == reference_sheet.Id:
+            continue
+        keyed, records = _get_keyed_viewports(index, sheet.Id.IntegerValue, mode, patterns)
+        for key, viewport_ids in sorted(keyed.items()):
+            reference_ids = reference.get(key, [])
+            if not reference_ids:
+                reason = NO_MATCH
+            elif len(reference_ids) > 1 or len(viewport_ids) > 1:
+                reason = AMBIGUOUS
+            else:
+                pairs.append((sheet, viewport_ids[0], reference_ids[0]))
+                continue
+            plan.skipped.extend((sheet.SheetNumber, records[i]['name'], reason) for i in viewport_ids)
+
+    # One pass over the outlines of every viewport involved, mostly from the cache
+    viewport_ids = sorted(set([pair[1] for pair in pairs] + [pair[2] for pair in pairs]))
+    outlines, plan.outline_reads = get_viewport_outlines(doc, viewport_ids)
+    plan.cached_outlines = len(viewport_ids) - plan.outline_reads
+    plan.revision = get_revision(doc)
+    plan.matched = len(pairs)
+
+    for sheet, viewport_id, reference_id in pairs:
+        x, y = _center(outlines[viewport_id])
+        reference_x, reference_y = _center(outlines[reference_id])
+        offset = (reference_x - x, reference_y - y, 0.0)
+        if abs(offset[0]) < 1e-9 and abs(offset[1]) < 1e-9:
+            continue
+        if doc.GetElement(ElementId(viewport_id)).Pinned:
+            plan.skipped.append((sheet.SheetNumber, index.views[index.viewports[viewport_id][1]]['name'], PINNED))
+            continue
+        plan.viewport_ids.append(ElementId(viewport_id))
+        plan.offsets.append(offset)
+        plan.sheets.add(sheet.Id.IntegerValue)
+    return plan
+
+def apply_viewport_alignment(doc, plan):
+    # Must be called inside an open transaction. Returns the number of move calls.
+    plan.move_calls = move_elements_by_offsets(doc, plan.viewport_ids, plan.offsets)
+    return plan.move_calls
+
+def print_viewport_report(output, plan):
+    output.print_md('**{0}** viewports moved on **{1}** sheets with **{2}** move calls; '
+                    '{3} of {4} matched viewports already in place. Outlines read: {5}, from cache: {6}.'.format(
+                        len(plan.viewport_ids), len(plan.sheets), plan.move_calls,
+                        plan.matched - len(plan.viewport_ids) - sum(1 for s in plan.skipped if s[2] == PINNED),
+                        plan.matched, plan.outline_reads, plan.cached_outlines))
+    if plan.skipped:
+        output.print_table(table_data=[list(row) for row in sorted(plan.skipped)], title='Viewports Not Moved',
+                           columns=['Sheet', 'View', 'Reason'])
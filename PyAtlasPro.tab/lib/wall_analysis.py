@@ -0,0 +1,124 @@
+# Wall analyses of the Find panel as pure functions. Nothing here touches the
+# Revit API, so they run the same inside Revit, in a worker process or on a
+# machine without Revit against a saved wall snapshot:
+#
+#   python wall_analysis.py walls.snapshot --analysis off_axis --tolerance 0.5
+import json
+import sys
+from math import atan2, degrees
+
+from parallel_math import map_chunks
+from wall_snapshot import KIND_LINE, KIND_CURVE, read_snapshot
+
+# Internal units are feet
+FEET_TO_MM = 304.8
+
+# Lengths this close to a whole number of millimetres count as whole
+WHOLE_TOLERANCE = 0.01
+
+# Walls deviating less than this many degrees from the reference axes are on axis
+DEFAULT_TOLERANCE = 0.01
+
+def is_whole_number(length):
+    return abs(length - round(length)) < WHOLE_TOLERANCE
+
+def get_line_angles(coords):
+    # Direction of every line in degrees, folded into [0, 180).
+    # `coords` holds start X, start Y, end X, end Y per line.
+    return [degrees(atan2(coords[i + 3] - coords[i + 1], coords[i + 2] - coords[i])) % 180.0
+            for i in range(0, len(coords), 4)]
+
+def get_axis_deviations(angles, reference_angle):
+    # Smallest angle between each line and the reference axis or its perpendicular
+    deviations = []
+    for angle in angles:
+        remainder = (angle - reference_angle) % 90.0
+        deviations.append(min(remainder, 90.0 - remainder))
+    return deviations
+
+def get_line_deviations(coords, reference_angle, parallel=None):
+    # Axis deviation of every line in `coords` (4 values per line), evaluated
+    # in chunks on worker threads where the interpreter allows it
+    return map_chunks(lambda chunk: get_axis_deviations(get_line_angles(chunk), reference_angle),
+                      coords, step=4, parallel=parallel)
+
+def get_non_whole_flags(lengths_mm, parallel=None):
+    # True for every length that is known and not a whole number of millimetres
+    return map_chunks(lambda chunk: [length is not None and not is_whole_number(length) for length in chunk],
+                      lengths_mm, parallel=parallel)
+
+def _rows(snapshot, ids):
+    # Row numbers of the snapshot, limited to `ids` (integer element ids) if given
+    if ids is None:
+        return range(snapshot.count)
+    index = snapshot.get_index()
+    return sorted(index[i] for i in ids if i in index)
+
+def non_whole_walls(snapshot, ids=None):
+    # (wall id, length in mm) of walls whose length is not a whole number of millimetres
+    wall_ids = snapshot.columns['id']
+    lengths = snapshot.columns['length']
+    rows = _rows(snapshot, ids)
+    lengths_mm = [lengths[row] * FEET_TO_MM for row in rows]
+    flags = get_non_whole_flags(lengths_mm)
+    return [(wall_ids[row], length_mm) for row, length_mm, flagged in zip(rows, lengths_mm, flags) if flagged]
+
+def room_bounding_walls(snapshot, ids=None):
+    wall_ids = snapshot.columns['id']
+    room_bounding = snapshot.columns['room_bounding']
+    return [wall_ids[row] for row in _rows(snapshot, ids) if room_bounding[row]]
+
+def off_axis_walls(snapshot, reference_angle=0.0, tolerance=DEFAULT_TOLERANCE, ids=None):
+    # Wall ids split into 'off_axis', 'on_axis' and 'curved' like the Isolate Off Axis tool
+    columns = snapshot.columns
+    buckets = {'off_axis': [], 'on_axis': [], 'curved': []}
+    line_rows = []
+    coords = []
+    for row in _rows(snapshot, ids):
+        if columns['kind'][row] == KIND_CURVE:
+            buckets['curved'].append(columns['id'][row])
+        elif columns['kind'][row] == KIND_LINE:
+            line_rows.append(row)
+            coords.extend((columns['start_x'][row], columns['start_y'][row],
+                           columns['end_x'][row], columns['end_y'][row]))
+    deviations = get_line_deviations(coords, reference_angle)
+    for row, deviation in zip(line_rows, deviations):
+        buckets['off_axis' if deviation > tolerance else 'on_axis'].append(columns['id'][row])
+    return buckets
+
+ANALYSES = {
+    'non_whole': non_whole_walls,
+    'room_bounding': room_bounding_walls,
+    'off_axis': off_axis_walls
+}
+
+def run_analysis(path, name, ids=None, **options):
+    # Entry point for worker processes: only a file path and plain values go in
+    # and plain lists come out, so arguments and results pickle cheaply
+    snapshot = read_snapshot(path)
+    try:
+        result = ANALYSES[name](snapshot, ids=ids, **options)
+        if isinstance(result, dict):
+            return dict((key, list(value)) for key, value in result.items())
+        return list(result)
+    finally:
+        snapshot.close()
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description='Run a Find panel wall analysis on a saved wall snapshot.')
+    parser.add_argument('snapshot', help='file written by the Export Wall Snapshot button')
+    parser.add_argument('--analysis', choices=sorted(ANALYSES), default='non_whole')
+    parser.add_argument('--reference-angle', type=float, default=0.0, help='off_axis only, in degrees')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='off_axis only, in degrees')
+    args = parser.parse_args(argv)
+
+    options = {}
+    if args.analysis == 'off_axis':
+        options = {'reference_angle': args.reference_angle, 'tolerance': args.tolerance}
+    json.dump(run_analysis(args.snapshot, args.analysis, **options), sys.stdout)
+    sys.stdout.write('\n')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+from array import array
+from math import atan2, degrees
+
+from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, ElementId, LocationCurve, Line, Wall, XYZ
+
+from change_tracking import start_tracking, get_revision, get_changes_since
+from session_cache import get_document_cache
+from wall_analysis import DEFAULT_TOLERANCE, get_line_deviations
+
+# Reference axes
+PROJECT_NORTH = 'project'
+TRUE_NORTH = 'true'
+GRID = 'grid'
+
+# Result buckets
+OFF_AXIS = 'off_axis'
+ON_AXIS = 'on_axis'
+CURVED = 'curved'
+
+class WallCurves(object):
+    # Straight wall location lines of a view as flat coordinate arrays
+    # (start X, start Y, end X, end Y per wall) plus the ids of curved walls
+    def __init__(self):
+        self.line_ids = []
+        self.coords = array('d')
+        self.curved_ids = []
+
+    def all_ids(self):
+        return set(i.IntegerValue for i in self.line_ids) | set(i.IntegerValue for i in self.curved_ids)
+
+def extract_wall_curves(doc, view):
+    # The only pass through the Revit API: one location curve read per wall
+    curves = WallCurves()
+    walls = FilteredElementCollector(doc, view.Id).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType()
+    for wall in walls:
+        location = wall.Location
+        if not isinstance(location, LocationCurve):
+            continue
+        curve = location.Curve
+        if isinstance(curve, Line):
+            start = curve.GetEndPoint(0)
+            end = curve.GetEndPoint(1)
+            curves.line_ids.append(wall.Id)
+            curves.coords.extend((start.X, start.Y, end.X, end.Y))
+        else:
+            curves.curved_ids.append(wall.Id)
+    return curves
+
+def classify_wall_curves(curves, reference_angle=0.0, tolerance=DEFAULT_TOLERANCE):
+    # Pure math over the extracted coordinates; only the ids come back
+    deviations = get_line_deviations(curves.coords, reference_angle)
+    buckets = {OFF_AXIS: [], ON_AXIS: [], CURVED: list(curves.curved_ids)}
+    for wall_id, deviation in zip(curves.line_ids, deviations):
+        buckets[OFF_AXIS if deviation > tolerance else ON_AXIS].append(wall_id)
+    return buckets
+
+def get_reference_angle(doc, reference, grid=None):
+    # Angle of the reference axis in degrees, measured from project east
+    if reference == TRUE_NORTH:
+        position = doc.ActiveProjectLocation.GetProjectPosition(XYZ.Zero)
+        return degrees(position.Angle)
+    elif reference == GRID and grid is not None:
+        curve = grid.Curve
+        start = curve.GetEndPoint(0)
+        end = curve.GetEndPoint(1)
+        return degrees(atan2(end.Y - start.Y, end.X - start.X))
+    return 0.0
+
+def _is_stale(doc, view, entry):
+    changes = get_changes_since(doc, entry['revision'])
+    if changes is None:
+        return True
+    added, modified, deleted = changes
+    # Crop, view range or hidden elements change which walls the view collects
+    if view.Id.IntegerValue in modified:
+        return True
+    wall_ids = entry['wall_ids']
+    if wall_ids & modified or wall_ids & deleted:
+        return True
+    for element_id in added:
+        if isinstance(doc.GetElement(ElementId(element_id)), Wall):
+            return True
+    return False
+
+def get_wall_buckets(doc, view, reference_angle=0.0, tolerance=DEFAULT_TOLERANCE):
+    # Wall curves are cached per view for the Revit session and thrown away as
+    # soon as the view, a wall in it changes or a wall is added to the document
+    start_tracking(doc)
+    cache = get_document_cache('wall_axis', doc)
+    key = view.Id.IntegerValue
+    entry = cache.get(key)
+    if entry is None or _is_stale(doc, view, entry):
+        curves = extract_wall_curves(doc, view)
+        entry = {'curves': curves, 'wall_ids': curves.all_ids(), 'results': {}}
+        cache[key] = entry
+    entry['revision'] = get_revision(doc)
+
+    settings = (round(reference_angle, 9), tolerance)
+    if settings not in entry['results']:
+        entry['results'][settings] = classify_wall_curves(entry['curves'], reference_angle, tolerance)
+    return entry['results'][settings]
+
+def _keep_wall_buckets(doc, view, revision):
+    # Temporary hide/isolate marks the view as modified but leaves the walls it
+    # holds alone. When the tool's own transaction, started at `revision`, is
+    # the only change since the buckets were stamped, they stay valid.
+    entry = get_document_cache('wall_axis', doc).get(view.Id.IntegerValue)
+    if entry is None or entry['revision'] != revision:
+        return
+    changes = get_changes_since(doc, revision)
+    if changes is not None and not changes[0] and not changes[2] and changes[1] <= set([view.Id.IntegerValue]):
+        entry['revision'] = get_revision(doc)
+
+def remember_isolation(doc, view, wall_ids, revision):
+    # Call after the isolation started at `revision` has been committed, so
+    # the next click can tell it apart from an isolation made by hand or by
+    # another tool
+    _keep_wall_buckets(doc, view, revision)
+    cache = get_document_cache('wall_axis_isolation', doc)
+    cache[view.Id.IntegerValue] = {
+        'ids': set(wall_id.IntegerValue for wall_id in wall_ids),
+        'revision': get_revision(doc)
+    }
+
+def forget_isolation(doc, view, revision):
+    # Call after the reset started at `revision` has been committed
+    _keep_wall_buckets(doc, view, revision)
+    get_document_cache('wall_axis_isolation', doc).pop(view.Id.IntegerValue, None)
+
+def is_own_isolation(doc, view):
+    # True when the temporary isolation of `view` is still the one this tool
+    # made: any later change to the view replaces or resets it
+    record = get_document_cache('wall_axis_isolation', doc).get(view.Id.IntegerValue)
+    if record is None:
+        return False
+    changes = get_changes_since(doc, record['revision'])
+    return changes is not None and view.Id.IntegerValue not in changes[1] | changes[2]
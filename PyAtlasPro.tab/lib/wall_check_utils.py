@@ -0,0 +1,256 @@
+import io
+import json
+import os
+import re
+
+from Autodesk.Revit.DB import FilteredElementCollector, ElementCategoryFilter, BuiltInCategory, BuiltInParameter, ElementId, UnitUtils, DisplayUnitType
+
+from change_tracking import start_tracking, get_revision, get_changes_since
+from session_cache import get_document_cache
+from wall_analysis import get_non_whole_flags
+
+# Columns always shown for a flagged wall
+ID_COLUMN = 'ID'
+LENGTH_COLUMN = 'Length (mm)'
+
+# Parameter columns read for flagged walls unless changed with Shift+Click
+DEFAULT_COLUMNS = ['Base Constraint', 'Unconnected Height', 'Mark', 'Comments']
+
+# Rows sent to the output window per print_table call
+TABLE_CHUNK_SIZE = 500
+
+# Walls evaluated between two progress bar updates
+PROGRESS_STEP = 200
+
+# Export formats and the rows previewed in the output window when exporting
+CSV = 'csv'
+JSONL = 'jsonl'
+PREVIEW_ROWS = 100
+
+def collect_view_walls(doc, view):
+    wall_filter = ElementCategoryFilter(BuiltInCategory.OST_Walls)
+    return FilteredElementCollector(doc, view.Id).WherePasses(wall_filter).WhereElementIsNotElementType()
+
+def get_wall_length_mm(wall):
+    length_param = wall.get_Parameter(BuiltInParameter.CURVE_ELEM_LENGTH)
+    if not length_param or not length_param.HasValue:
+        return None
+    return UnitUtils.ConvertFromInternalUnits(length_param.AsDouble(), DisplayUnitType.DUT_MILLIMETERS)
+
+def find_non_whole_walls(walls, total=0, progress=None):
+    # First stage: only the length parameter is read for every wall, and the
+    # lengths are checked a chunk at a time so unflagged walls are let go.
+    # Returns (wall, length in mm) pairs for walls whose length is not whole.
+    flagged = []
+    read = []
+    for i, wall in enumerate(walls):
+        read.append((wall, get_wall_length_mm(wall)))
+        if len(read) == PROGRESS_STEP:
+            flagged.extend(_keep_flagged(read))
+            read = []
+        if progress and i % PROGRESS_STEP == 0:
+            progress(i, total)
+    flagged.extend(_keep_flagged(read))
+    return flagged
+
+def _keep_flagged(read):
+    flags = get_non_whole_flags([length_mm for wall, length_mm in read])
+    return [pair for pair, flagged in zip(read, flags) if flagged]
+
+def _get_length_cache(doc):
+    # wall id -> (length in mm, flagged), kept for the Revit session. Walls
+    # modified or deleted since the last run are dropped so they are read
+    # again, together with their cached table rows.
+    # Returns the cache and whether it had to start empty.
+    start_tracking(doc)
+    cache = get_document_cache('wall_check', doc)
+    lengths = cache.get('lengths')
+    if lengths is not None:
+        changes = get_changes_since(doc, cache['revision'])
+        if changes is None:
+            lengths = None
+        else:
+            added, modified, deleted = changes
+            rows = cache.get('rows', {}).get('rows', {})
+            for wall_id in modified | deleted:
+                lengths.pop(wall_id, None)
+                rows.pop(wall_id, None)
+    cold = lengths is None
+    if cold:
+        lengths = {}
+        cache['lengths'] = lengths
+        cache.pop('rows', None)
+    cache['revision'] = get_revision(doc)
+    return lengths, cold
+
+def get_row_cache(doc, columns):
+    # wall id -> table row for the current column set
+    cache = get_document_cache('wall_check', doc)
+    entry = cache.get('rows')
+    if entry is None or entry['columns'] != tuple(columns):
+        entry = {'columns': tuple(columns), 'rows': {}}
+        cache['rows'] = entry
+    return entry['rows']
+
+def _store_lengths(lengths, wall_ids, lengths_mm):
+    # The rounding checks run off the API thread once every length is read
+    for wall_id, length_mm, flagged in zip(wall_ids, lengths_mm, get_non_whole_flags(lengths_mm)):
+        lengths[wall_id] = (length_mm, flagged)
+
+def scan_view_walls(doc, view, progress=None):
+    # Lengths of the walls in `view`, reading only walls that are new or have
+    # changed since the previous scan. Only ids and lengths are kept, never
+    # the walls themselves. Returns (integer ids of the walls in the view, the
+    # length cache, ids read on this run).
+    lengths, cold = _get_length_cache(doc)
+    walls = collect_view_walls(doc, view)
+    if cold:
+        total = walls.GetElementCount()
+        view_ids = []
+        lengths_mm = []
+        for i, wall in enumerate(walls):
+            lengths_mm.append(get_wall_length_mm(wall))
+            view_ids.append(wall.Id.IntegerValue)
+            if progress and i % PROGRESS_STEP == 0:
+                progress(i, total)
+        _store_lengths(lengths, view_ids, lengths_mm)
+        return view_ids, lengths, set(view_ids)
+
+    # Warm cache: only ids are collected, walls are loaded for the changes alone
+    view_ids = [wall_id.IntegerValue for wall_id in walls.ToElementIds()]
+    stale = [wall_id for wall_id in view_ids if wall_id not in lengths]
+    lengths_mm = []
+    for i, wall_id in enumerate(stale):
+        lengths_mm.append(get_wall_length_mm(doc.GetElement(ElementId(wall_id))))
+        if progress and i % PROGRESS_STEP == 0:
+            progress(i, len(stale))
+    _store_lengths(lengths, stale, lengths_mm)
+    return view_ids, lengths, set(stale)
+
+def get_flagged_walls(view_ids, lengths):
+    # (wall id, length in mm) of the walls whose length is not whole
+    return [(wall_id, lengths[wall_id][0]) for wall_id in view_ids if lengths[wall_id][1]]
+
+def plan_highlights(doc, view, mode, flagged_ids, changed_ids):
+    # Wall ids to highlight and to clear in `view`, relative to what the last
+    # run highlighted there in the same mode. Everything is highlighted again
+    # when that is unknown or the view or its Wall Check filter has changed.
+    # Returns (to highlight, to clear, full refresh).
+    cache = get_document_cache('wall_check', doc)
+    view_id = view.Id.IntegerValue
+    record = cache.get('highlights', {}).get((view_id, mode))
+    flagged = set(flagged_ids)
+    if record is not None:
+        changes = get_changes_since(doc, record['revision'])
+        if changes is None or view_id in changes[1] | changes[2] or record['filter_id'] in changes[2]:
+            record = None
+    if record is None:
+        return flagged, set(), True
+    previous = record['ids']
+    return (flagged - previous) | (flagged & changed_ids), previous - flagged, False
+
+def remember_highlights(doc, view, mode, flagged_ids, filter_id=None):
+    # Call after the highlight transaction has been committed
+    cache = get_document_cache('wall_check', doc)
+    cache.setdefault('highlights', {})[(view.Id.IntegerValue, mode)] = {
+        'ids': set(flagged_ids),
+        'filter_id': filter_id,
+        'revision': get_revision(doc)
+    }
+
+def get_highlighted_walls(doc, view, mode):
+    # Wall ids the last run in this session highlighted in `view` in `mode`
+    record = get_document_cache('wall_check', doc).get('highlights', {}).get((view.Id.IntegerValue, mode))
+    return set(record['ids']) if record else set()
+
+def get_parameter_text(param):
+    if not param or not param.HasValue:
+        return ''
+    return param.AsString() or param.AsValueString() or ''
+
+def read_wall_row(wall, length_mm, columns, linkify=None):
+    # Second stage: only the displayed columns are read, and only for flagged walls.
+    # Without `linkify` the ID column holds the plain integer id.
+    row = []
+    for column in columns:
+        if column == ID_COLUMN:
+            row.append(linkify(wall.Id) if linkify else str(wall.Id.IntegerValue))
+        elif column == LENGTH_COLUMN:
+            row.append(str(length_mm))
+        else:
+            row.append(get_parameter_text(wall.LookupParameter(column)))
+    return row
+
+def get_table_columns(parameter_columns):
+    return [ID_COLUMN, LENGTH_COLUMN] + [c for c in parameter_columns if c not in (ID_COLUMN, LENGTH_COLUMN)]
+
+def print_wall_table(output, doc, flagged, columns, title="Identified Walls", chunk_size=TABLE_CHUNK_SIZE,
+                     rows=None, loaded=None):
+    # Stream the table to the output window in chunks instead of one huge table.
+    # `flagged` holds (wall id, length in mm). Rows found in `rows` are reused;
+    # other walls are taken from `loaded` or loaded one chunk at a time.
+    rows = {} if rows is None else rows
+    loaded = loaded or {}
+    total = len(flagged)
+    for start in range(0, total, chunk_size):
+        chunk = flagged[start:start + chunk_size]
+        table_data = []
+        for wall_id, length_mm in chunk:
+            if wall_id not in rows:
+                wall = loaded.get(wall_id) or doc.GetElement(ElementId(wall_id))
+                rows[wall_id] = read_wall_row(wall, length_mm, columns, output.linkify)
+            table_data.append(rows[wall_id])
+        chunk_title = title if total <= chunk_size else "{0} ({1}-{2} of {3})".format(title, start + 1, start + len(chunk), total)
+        output.print_table(table_data=table_data, title=chunk_title, columns=columns)
+        output.update_progress(start + len(chunk), total)
+
+def get_export_path(doc, view, export_format, folder=None):
+    # One file per document and view, overwritten by the next export so two
+    # model versions can be diffed file against file
+    if not folder:
+        from pyrevit.coreutils import appdata
+        folder = os.path.dirname(appdata.get_data_file('PyAtlasPro', export_format))
+    name = re.sub(r'[^\w\- ]+', '_', 'Wall Check - {0} - {1}'.format(doc.Title, view.Name))
+    return os.path.join(folder, '{0}.{1}'.format(name, export_format))
+
+class WallRowWriter(object):
+    # Streams rows to CSV or JSON Lines; nothing but the current row is kept
+    def __init__(self, path, columns, export_format):
+        self.columns = columns
+        self.export_format = export_format
+        self.count = 0
+        self.file = io.open(path, 'w', newline='', encoding='utf-8')
+        if export_format == CSV:
+            import csv
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(columns)
+
+    def write(self, row):
+        if self.export_format == CSV:
+            self.writer.writerow(row)
+        else:
+            self.file.write(u'{0}\n'.format(json.dumps(dict(zip(self.columns, row)), sort_keys=True)))
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+def export_wall_rows(doc, flagged, columns, path, export_format, loaded=None, progress=None,
+                     chunk_size=TABLE_CHUNK_SIZE):
+    # Write the flagged walls sorted by id. Walls not in `loaded` are loaded
+    # one chunk at a time and dropped once their rows are written.
+    # Returns the number of rows written.
+    loaded = loaded or {}
+    flagged = sorted(flagged)
+    writer = WallRowWriter(path, columns, export_format)
+    try:
+        for start in range(0, len(flagged), chunk_size):
+            chunk = flagged[start:start + chunk_size]
+            walls = [loaded.get(wall_id) or doc.GetElement(ElementId(wall_id)) for wall_id, length_mm in chunk]
+            for wall, (wall_id, length_mm) in zip(walls, chunk):
+                writer.write(read_wall_row(wall, length_mm, columns))
+            if progress:
+                progress(start + len(chunk), len(flagged))
+    finally:
+        writer.close()
+    return writer.count
@@ -0,0 +1,213 @@
+# Columnar wall snapshot of a document in one binary file:
+#
+#   'PAWS' | header length (uint32) | JSON header | columns
+#
+# Every column is a raw little-endian array starting on an 8 byte boundary,
+# so readers can memory-map the file and use the columns in place. Reading
+# needs no Revit API; only export_wall_snapshot does.
+import json
+import struct
+import sys
+from array import array
+
+MAGIC = b'PAWS'
+VERSION = 1
+ALIGNMENT = 8
+
+# Location kinds
+KIND_NONE = 0
+KIND_LINE = 1
+KIND_CURVE = 2
+
+# Column name and array typecode. Element ids are 32 bit up to Revit 2023.
+COLUMNS = (
+    ('id', 'i'),
+    ('kind', 'b'),
+    ('start_x', 'd'),
+    ('start_y', 'd'),
+    ('start_z', 'd'),
+    ('end_x', 'd'),
+    ('end_y', 'd'),
+    ('end_z', 'd'),
+    ('length', 'd'),
+    ('room_bounding', 'b'),
+    ('level_id', 'i')
+)
+
+# Columns can be used in place only where memoryview.cast exists (CPython 3)
+try:
+    ZERO_COPY = hasattr(memoryview, 'cast') and sys.byteorder == 'little'
+except NameError:
+    ZERO_COPY = False
+
+def _to_bytes(values):
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes() if hasattr(values, 'tobytes') else values.tostring()
+
+def _from_bytes(typecode, data):
+    values = array(typecode)
+    if hasattr(values, 'frombytes'):
+        values.frombytes(data)
+    else:
+        values.fromstring(data)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+def _padding(offset):
+    return (ALIGNMENT - offset % ALIGNMENT) % ALIGNMENT
+
+class WallSnapshot(object):
+    # One row per wall; `columns` maps each column name to a sequence
+    def __init__(self, columns, document='', revision=None):
+        self.columns = columns
+        self.document = document
+        self.revision = revision
+        self.count = len(columns['id'])
+        self._index = None
+        self._mapped = None
+        self._views = []
+
+    def get_index(self):
+        # Element id -> row number, built on first use
+        if self._index is None:
+            self._index = dict((wall_id, row) for row, wall_id in enumerate(self.columns['id']))
+        return self._index
+
+    def close(self):
+        # Views into the mapped file must be released before it can be closed
+        if self._mapped is not None:
+            self.columns = {}
+            for view in reversed(self._views):
+                view.release()
+            self._views = []
+            self._mapped.close()
+            self._mapped = None
+
+def new_columns():
+    return dict((name, array(typecode)) for name, typecode in COLUMNS)
+
+def write_snapshot(snapshot, path):
+    # Column offsets depend on the header length, so the header is laid out
+    # twice: once to measure it and once with the final offsets
+    def build_header(start):
+        columns = []
+        offset = start
+        for name, typecode in COLUMNS:
+            offset += _padding(offset)
+            itemsize = array(typecode).itemsize
+            columns.append({'name': name, 'typecode': typecode, 'offset': offset, 'itemsize': itemsize})
+            offset += itemsize * snapshot.count
+        return json.dumps({'version': VERSION, 'document': snapshot.document, 'revision': snapshot.revision,
+                           'count': snapshot.count, 'columns': columns}, sort_keys=True).encode('utf-8')
+
+    header = build_header(0)
+    while True:
+        start = len(MAGIC) + 4 + len(header)
+        final = build_header(start + _padding(start))
+        if len(final) == len(header):
+            break
+        header = final
+    header = final
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        position = len(MAGIC) + 4 + len(header)
+        for column in json.loads(header.decode('utf-8'))['columns']:
+            f.write(b'\0' * (column['offset'] - position))
+            data = _to_bytes(array(column['typecode'], snapshot.columns[column['name']]))
+            f.write(data)
+            position = column['offset'] + len(data)
+    return path
+
+def read_snapshot(path):
+    # Columns are memoryviews over the mapped file where the interpreter
+    # supports it (CPython 3), otherwise they are copied into arrays
+    import mmap
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(MAGIC)] != MAGIC:
+        mapped.close()
+        raise ValueError('Not a wall snapshot: {0}'.format(path))
+    header_length = struct.unpack('<I', mapped[len(MAGIC):len(MAGIC) + 4])[0]
+    header = json.loads(mapped[len(MAGIC) + 4:len(MAGIC) + 4 + header_length].decode('utf-8'))
+    if header['version'] != VERSION:
+        mapped.close()
+        raise ValueError('Unsupported wall snapshot version {0}'.format(header['version']))
+
+    count = header['count']
+    columns = {}
+    views = []
+    if ZERO_COPY:
+        views.append(memoryview(mapped))
+    for column in header['columns']:
+        start = column['offset']
+        end = start + column['itemsize'] * count
+        if ZERO_COPY:
+            views.append(views[0][start:end])
+            views.append(views[-1].cast(column['typecode']))
+            columns[column['name']] = views[-1]
+        else:
+            columns[column['name']] = _from_bytes(column['typecode'], mapped[start:end])
+
+    snapshot = WallSnapshot(columns, header.get('document', ''), header.get('revision'))
+    if ZERO_COPY:
+        snapshot._mapped = mapped
+        snapshot._views = views
+    else:
+        mapped.close()
+    return snapshot
+
+def collect_wall_columns(doc):
+    # The only pass through the Revit API: every wall of the document once
+    from Autodesk.Revit.DB import FilteredElementCollector, BuiltInCategory, BuiltInParameter, LocationCurve, Line
+
+    columns = new_columns()
+    walls = FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Walls).WhereElementIsNotElementType()
+    for wall in walls:
+        location = wall.Location
+        kind = KIND_NONE
+        start = end = None
+        if isinstance(location, LocationCurve):
+            curve = location.Curve
+            kind = KIND_LINE if isinstance(curve, Line) else KIND_CURVE
+            if curve.IsBound:
+                start = curve.GetEndPoint(0)
+                end = curve.GetEndPoint(1)
+        length_param = wall.get_Parameter(BuiltInParameter.CURVE_ELEM_LENGTH)
+        room_bounding_param = wall.get_Parameter(BuiltInParameter.WALL_ATTR_ROOM_BOUNDING)
+
+        columns['id'].append(wall.Id.IntegerValue)
+        columns['kind'].append(kind)
+        for prefix, point in (('start_', start), ('end_', end)):
+            columns[prefix + 'x'].append(point.X if point else 0.0)
+            columns[prefix + 'y'].append(point.Y if point else 0.0)
+            columns[prefix + 'z'].append(point.Z if point else 0.0)
+        columns['length'].append(length_param.AsDouble() if length_param and length_param.HasValue else 0.0)
+        columns['room_bounding'].append(1 if room_bounding_param and room_bounding_param.AsInteger() == 1 else 0)
+        columns['level_id'].append(wall.LevelId.IntegerValue)
+    return columns
+
+def get_snapshot_path(doc):
+    # One file per document in pyRevit's data folder
+    import hashlib
+    import re
+    from pyrevit.coreutils import appdata
+    from session_cache import get_document_key
+
+    title = re.sub(r'[^\w\-]+', '_', doc.Title) or 'document'
+    digest = hashlib.md5(get_document_key(doc).encode('utf-8')).hexdigest()[:8]
+    return appdata.get_data_file('PyAtlasPro_walls_{0}_{1}'.format(title, digest), 'snapshot')
+
+def export_wall_snapshot(doc, path=None):
+    from change_tracking import start_tracking, get_revision
+
+    start_tracking(doc)
+    snapshot = WallSnapshot(collect_wall_columns(doc), doc.Title, get_revision(doc))
+    path = path or get_snapshot_path(doc)
+    write_snapshot(snapshot, path)
+    return snapshot, path
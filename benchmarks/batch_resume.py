@@ -0,0 +1,91 @@
+# Run a batch of stand-in models through lib/batch_queue.py, take it down
+# halfway with a simulated crash and resume it from the checkpoint. Checks
+# that every model ends up done exactly once, that only one model is open
+# at a time and that closed models leave nothing in the session caches.
+#
+#   python benchmarks/batch_resume.py --models 20 --crash-at 7
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from fakerevit import pyrevit_stub
+from fakerevit.documents import SimulatedCrash, StandInOpener
+from scenarios import TAB_DIR
+
+sys.path.insert(0, os.path.join(TAB_DIR, 'lib'))
+
+
+def cached_documents():
+    # Document keys still held by any session cache
+    keys = set()
+    for value in pyrevit_stub.domain_data.values():
+        if isinstance(value, dict):
+            keys.update(key for key in value if isinstance(key, str) and key.endswith('.rvt'))
+    return keys
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Crash and resume a batch run on stand-in models.')
+    parser.add_argument('--models', type=int, default=20)
+    parser.add_argument('--crash-at', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    fakerevit.install()
+    from batch_operations import get_operations
+    from batch_queue import DONE, BatchQueue, run_batch
+    from session_cache import clear_document_caches
+
+    folder = tempfile.mkdtemp(prefix='batch_')
+    try:
+        paths = [os.path.join(folder, 'Model {0:02d}.rvt'.format(i)) for i in range(args.models)]
+        operations = get_operations()
+        names = [operation.name for operation in operations]
+        crash_path = paths[args.crash_at]
+
+        first = StandInOpener(crash_on=[crash_path])
+        start = time.time()
+        try:
+            run_batch(BatchQueue(paths, names, folder), first, operations, on_closed=clear_document_caches)
+        except SimulatedCrash:
+            pass
+        print('first run     {0:>8.3f}s  {1:>3} models opened  (crashed on model {2})'.format(
+            time.time() - start, len(first.opened), args.crash_at))
+
+        second = StandInOpener()
+        start = time.time()
+        queue = BatchQueue(paths, names, folder)
+        run_batch(queue, second, operations, on_closed=clear_document_caches)
+        print('resumed run   {0:>8.3f}s  {1:>3} models opened'.format(time.time() - start, len(second.opened)))
+
+        errors = []
+        if first.opened + second.opened != paths[:args.crash_at + 1] + paths[args.crash_at:]:
+            errors.append('models were opened out of order or more than once')
+        if queue.get_counts()[DONE] != len(paths):
+            errors.append('{0} of {1} models done'.format(queue.get_counts()[DONE], len(paths)))
+        if queue.get_model(crash_path)['attempts'] != 2:
+            errors.append('crashed model attempted {0} times'.format(queue.get_model(crash_path)['attempts']))
+        if max(first.max_open, second.max_open) != 1:
+            errors.append('{0} models open at once'.format(max(first.max_open, second.max_open)))
+        if cached_documents() & set(paths):
+            errors.append('session caches still hold {0} closed models'.format(len(cached_documents() & set(paths))))
+        with open(queue.get_model(paths[0])['results']) as f:
+            results = json.load(f)['results']
+        print('model 00      ' + json.dumps(dict((name, results[name]) for name in ('find_walls', 'level_heads', 'grid_heads')),
+                                           sort_keys=True))
+        for error in errors:
+            print('ERROR ' + error)
+        return 1 if errors else 0
+    finally:
+        shutil.rmtree(folder, True)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
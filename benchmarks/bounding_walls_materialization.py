@@ -0,0 +1,67 @@
+# Compare how many walls reach Python in Bounding Walls before and after the
+# room-bounding test moved into an ElementParameterFilter.
+#
+#   python benchmarks/bounding_walls_materialization.py --size 100000
+import argparse
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from fakerevit import api, factory
+from run_benchmarks import run_scenario
+from scenarios import FIND, script_path
+
+SCRIPT = script_path(FIND, 'Bounding Walls.pushbutton')
+
+
+def legacy_bounding_walls(doc):
+    # The collection strategy the script used before: every wall in the
+    # document is materialized and tested in a Python loop
+    db = fakerevit.db
+    active_view = doc.ActiveView
+    walls = db.FilteredElementCollector(doc).OfCategory(db.BuiltInCategory.OST_Walls) \
+        .WhereElementIsNotElementType().ToElements()
+    with db.Transaction(doc, 'Isolate Room-Bounding Walls') as t:
+        t.Start()
+        ids = []
+        for wall in walls:
+            param = wall.get_Parameter(db.BuiltInParameter.WALL_ATTR_ROOM_BOUNDING)
+            if param and param.AsInteger() == 1:
+                ids.append(wall.Id)
+        active_view.IsolateElementsTemporary(ids)
+        t.Commit()
+
+
+def build(size):
+    # Half of the walls sit on other levels and are not visible in the active view
+    doc = factory.new_document()
+    factory.add_walls(doc, size, hidden_ratio=0.5)
+    return doc, [], {}, []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args(argv)
+    fakerevit.install()
+
+    doc = build(args.size)[0]
+    fakerevit.activate(doc)
+    start = time.time()
+    legacy_bounding_walls(doc)
+    before = dict(api.calls, seconds=time.time() - start, isolated=len(doc.ActiveView.isolated))
+
+    after = run_scenario('Bounding Walls', SCRIPT, build, args.size)
+    after_calls = dict(after['api_calls'], seconds=after['seconds'], isolated=len(fakerevit.pyrevit_stub.revit.doc.ActiveView.isolated))
+
+    print('{0:<24} {1:>12} {2:>12}'.format('', 'before', 'after'))
+    for key in ('elements_materialized', 'Element.get_Parameter', 'isolated', 'seconds'):
+        print('{0:<24} {1:>12} {2:>12}'.format(key, round(before.get(key, 0), 3), round(after_calls.get(key, 0), 3)))
+
+
+if __name__ == '__main__':
+    main()
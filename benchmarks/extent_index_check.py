@@ -0,0 +1,117 @@
+# Check lib/extent_index.py against brute force on random boxes and time it
+# on large selections: overlap pairs, equal gaps and overlap resolution on
+# sparse, stacked and dense boxes.
+#
+#   python benchmarks/extent_index_check.py --size 100000
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from scenarios import TAB_DIR
+
+sys.path.insert(0, os.path.join(TAB_DIR, 'lib'))
+
+from extent_index import ExtentIndex, get_equal_gap_shifts, resolve_overlaps, shift_boxes
+
+
+def random_boxes(count, seed, spread):
+    # Tag and text note sized boxes scattered over a sheet-sized area
+    rng = random.Random(seed)
+    boxes = []
+    for _ in range(count):
+        u = rng.uniform(0, spread)
+        v = rng.uniform(0, spread / 4.0)
+        boxes.append((u, v, u + rng.uniform(0.5, 6.0), v + rng.uniform(0.3, 1.0)))
+    return boxes
+
+
+def brute_force_overlaps(boxes, tolerance=1e-6):
+    pairs = []
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            a, b = boxes[i], boxes[j]
+            if a[0] < b[2] - tolerance and b[0] < a[2] - tolerance and a[1] < b[3] - tolerance and b[1] < a[3] - tolerance:
+                pairs.append((i, j))
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check and time the sweep-and-prune extent index.')
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args(argv)
+    errors = []
+
+    small = random_boxes(1500, 1, 1500.0)
+    start = time.time()
+    expected = brute_force_overlaps(small)
+    brute_seconds = time.time() - start
+    start = time.time()
+    found = ExtentIndex(small).overlaps()
+    print('{0:>7} boxes  brute force {1:>7.3f}s  sweep {2:>7.3f}s  {3} overlaps'.format(
+        len(small), brute_seconds, time.time() - start, len(found)))
+    if found != expected:
+        errors.append('overlap pairs differ from brute force')
+    index = ExtentIndex(small)
+    for k in range(0, len(small), 30):
+        neighbours = [j for i, j in expected if i == k] + [i for i, j in expected if j == k]
+        if index.query(small[k]) != sorted([k] + neighbours):
+            errors.append('query differs from brute force')
+            break
+
+    # Right after Align Left every box starts at the same u
+    aligned = [(0.0, b[1], b[2] - b[0], b[3]) for b in small]
+    if ExtentIndex(aligned).overlaps() != brute_force_overlaps(aligned):
+        errors.append('overlap pairs of aligned boxes differ from brute force')
+    aligned = [(0.0, b[1], b[2] - b[0], b[3]) for b in random_boxes(args.size, 4, args.size * 0.2)]
+    start = time.time()
+    pairs = ExtentIndex(aligned).overlaps()
+    print('{0:>7} boxes  aligned    {1:>7.3f}s  {2} overlaps'.format(len(aligned), time.time() - start, len(pairs)))
+
+    boxes = random_boxes(args.size, 2, args.size * 0.2)
+    start = time.time()
+    pairs = ExtentIndex(boxes).overlaps()
+    print('{0:>7} boxes  overlaps   {1:>7.3f}s  {2} overlaps'.format(len(boxes), time.time() - start, len(pairs)))
+
+    start = time.time()
+    resolved = shift_boxes(boxes, resolve_overlaps(boxes))
+    left = ExtentIndex(resolved).overlaps()
+    print('{0:>7} boxes  resolve    {1:>7.3f}s  {2} overlaps left'.format(len(boxes), time.time() - start, len(left)))
+    if left:
+        errors.append('{0} overlaps left after resolving'.format(len(left)))
+
+    # Stacked tags (every box on the same spot) and a dense pile of them are
+    # the worst case: each box is pushed past everything placed before it
+    stacked = [(0.0, 0.0, 2.0, 1.0)] * args.size
+    dense = random_boxes(args.size, 5, args.size * 0.002)
+    for name, crowded in (('stacked', stacked), ('dense', dense)):
+        start = time.time()
+        resolved = shift_boxes(crowded, resolve_overlaps(crowded, gap=0.1))
+        left = ExtentIndex(resolved).overlaps()
+        print('{0:>7} boxes  {1:<10} {2:>7.3f}s  {3} overlaps left'.format(len(crowded), name, time.time() - start, len(left)))
+        if left:
+            errors.append('{0} overlaps left after resolving {1} boxes'.format(len(left), name))
+    small = random_boxes(300, 6, 3.0)
+    if brute_force_overlaps(shift_boxes(small, resolve_overlaps(small))):
+        errors.append('brute force finds overlaps left after resolving')
+
+    start = time.time()
+    sparse = random_boxes(args.size, 3, args.size * 6.0)
+    spaced = sorted(shift_boxes(sparse, get_equal_gap_shifts(sparse)))
+    gaps = [b[0] - a[2] for a, b in zip(spaced, spaced[1:])]
+    print('{0:>7} boxes  equal gaps {1:>7.3f}s  gap {2:.4f} - {3:.4f}'.format(
+        len(sparse), time.time() - start, min(gaps), max(gaps)))
+    if max(gaps) - min(gaps) > 1e-6:
+        errors.append('gaps are not equal')
+
+    for error in errors:
+        print('ERROR ' + error)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
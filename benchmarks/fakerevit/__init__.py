@@ -0,0 +1,30 @@
+# Headless stand-in for the Revit API and pyRevit.
+# Call install() before importing any PyAtlasPro script or lib module.
+import sys
+import types
+
+from fakerevit import api
+from fakerevit import db
+from fakerevit import pyrevit_stub
+from fakerevit import system
+
+
+def install():
+    autodesk = types.ModuleType('Autodesk')
+    autodesk_revit = types.ModuleType('Autodesk.Revit')
+    autodesk.Revit = autodesk_revit
+    autodesk_revit.DB = db
+    modules = {
+        'Autodesk': autodesk,
+        'Autodesk.Revit': autodesk_revit,
+        'Autodesk.Revit.DB': db,
+    }
+    modules.update(system.build_modules())
+    modules.update(pyrevit_stub.build_modules(db))
+    sys.modules.update(modules)
+
+
+def activate(doc, selection=None):
+    # Make `doc` the document pyrevit.revit hands to scripts and reset all counters
+    pyrevit_stub.set_document(doc, [e.Id for e in selection or []])
+    api.reset()
@@ -0,0 +1,45 @@
+# Call counting shared by every fake Revit API object.
+# Each recorded call is attributed to the transaction that is open at the time.
+import time
+from collections import Counter
+
+calls = Counter()
+transactions = []
+_open = []
+
+
+def record(name, count=1):
+    calls[name] += count
+    if _open:
+        _open[-1]['calls'] += count
+
+
+def begin_transaction(name):
+    entry = {'name': name, 'calls': 0, 'seconds': 0.0, 'status': 'started',
+             '_start': time.time()}
+    _open.append(entry)
+    return entry
+
+
+def end_transaction(entry, status):
+    entry['seconds'] = time.time() - entry.pop('_start')
+    entry['status'] = status
+    _open.remove(entry)
+    transactions.append(entry)
+
+
+def in_transaction():
+    return bool(_open)
+
+
+def reset():
+    calls.clear()
+    del transactions[:]
+    del _open[:]
+
+
+def snapshot():
+    return {
+        'api_calls': dict(calls),
+        'transactions': [dict(t) for t in transactions],
+    }
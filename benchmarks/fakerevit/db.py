@@ -0,0 +1,1353 @@
+# Pure-Python stand-in for the parts of Autodesk.Revit.DB used by PyAtlasPro.
+# Installed as the `Autodesk.Revit.DB` module by fakerevit.install().
+import math as _math
+
+from fakerevit import api as _api
+
+
+class _EnumMember(object):
+    def __init__(self, owner, name, value):
+        self._owner = owner
+        self._name = name
+        self.value__ = value
+
+    def __repr__(self):
+        return '{0}.{1}'.format(self._owner, self._name)
+
+    def __str__(self):
+        return self._name
+
+    def __eq__(self, other):
+        return isinstance(other, _EnumMember) and other._owner == self._owner and other._name == self._name
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self._owner, self._name))
+
+
+class _EnumType(type):
+    # Any attribute of an enum class resolves to a member, so scripts may use
+    # built-in categories and parameters the stand-in never heard about.
+    def __getattr__(cls, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        members = cls.__dict__['_members']
+        if name not in members:
+            members[name] = _EnumMember(cls.__name__, name, len(members))
+        return members[name]
+
+
+def _enum(name):
+    return _EnumType(name, (object,), {'_members': {}})
+
+
+BuiltInCategory = _enum('BuiltInCategory')
+BuiltInParameter = _enum('BuiltInParameter')
+ViewType = _enum('ViewType')
+DatumEnds = _enum('DatumEnds')
+DisplayUnitType = _enum('DisplayUnitType')
+StorageType = _enum('StorageType')
+TemporaryViewMode = _enum('TemporaryViewMode')
+FailureSeverity = _enum('FailureSeverity')
+FailureProcessingResult = _enum('FailureProcessingResult')
+TransactionStatus = _enum('TransactionStatus')
+
+
+# Built-in parameters turned into ElementIds, so parameter filters can find them again
+_builtin_parameters = {}
+
+
+class ElementId(object):
+    __slots__ = ('IntegerValue',)
+
+    def __init__(self, value):
+        if isinstance(value, _EnumMember):
+            _builtin_parameters[-1000000 - value.value__] = value
+            value = -1000000 - value.value__
+        self.IntegerValue = int(value)
+
+    def __eq__(self, other):
+        return isinstance(other, ElementId) and other.IntegerValue == self.IntegerValue
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.IntegerValue)
+
+    def __repr__(self):
+        return 'ElementId({0})'.format(self.IntegerValue)
+
+    def __str__(self):
+        return str(self.IntegerValue)
+
+
+ElementId.InvalidElementId = ElementId(-1)
+
+
+class XYZ(object):
+    __slots__ = ('X', 'Y', 'Z')
+
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.X = float(x)
+        self.Y = float(y)
+        self.Z = float(z)
+
+    def __add__(self, other):
+        return XYZ(self.X + other.X, self.Y + other.Y, self.Z + other.Z)
+
+    def __sub__(self, other):
+        return XYZ(self.X - other.X, self.Y - other.Y, self.Z - other.Z)
+
+    def __mul__(self, value):
+        return XYZ(self.X * value, self.Y * value, self.Z * value)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, value):
+        return XYZ(self.X / value, self.Y / value, self.Z / value)
+
+    __div__ = __truediv__
+
+    def __neg__(self):
+        return XYZ(-self.X, -self.Y, -self.Z)
+
+    def __repr__(self):
+        return 'XYZ({0}, {1}, {2})'.format(self.X, self.Y, self.Z)
+
+    def Add(self, other):
+        return self + other
+
+    def Subtract(self, other):
+        return self - other
+
+    def Multiply(self, value):
+        return self * value
+
+    def GetLength(self):
+        return _math.sqrt(self.X * self.X + self.Y * self.Y + self.Z * self.Z)
+
+    def Normalize(self):
+        length = self.GetLength()
+        return XYZ(self.X / length, self.Y / length, self.Z / length) if length else XYZ()
+
+    def DotProduct(self, other):
+        return self.X * other.X + self.Y * other.Y + self.Z * other.Z
+
+    def CrossProduct(self, other):
+        return XYZ(self.Y * other.Z - self.Z * other.Y,
+                   self.Z * other.X - self.X * other.Z,
+                   self.X * other.Y - self.Y * other.X)
+
+    def DistanceTo(self, other):
+        return (self - other).GetLength()
+
+    def IsAlmostEqualTo(self, other, tolerance=1e-9):
+        return self.DistanceTo(other) <= tolerance
+
+
+XYZ.Zero = XYZ(0, 0, 0)
+XYZ.BasisX = XYZ(1, 0, 0)
+XYZ.BasisY = XYZ(0, 1, 0)
+XYZ.BasisZ = XYZ(0, 0, 1)
+
+
+class Outline(object):
+    def __init__(self, minimum, maximum):
+        self.MinimumPoint = minimum
+        self.MaximumPoint = maximum
+
+
+class BoundingBoxXYZ(object):
+    def __init__(self, minimum=None, maximum=None):
+        self.Min = minimum or XYZ()
+        self.Max = maximum or XYZ()
+
+
+class Color(object):
+    def __init__(self, red, green, blue):
+        self.Red = red
+        self.Green = green
+        self.Blue = blue
+
+
+class OverrideGraphicSettings(object):
+    def __init__(self):
+        self.projection_line_color = None
+        self.cut_line_color = None
+
+    def SetProjectionLineColor(self, color):
+        self.projection_line_color = color
+        return self
+
+    def SetCutLineColor(self, color):
+        self.cut_line_color = color
+        return self
+
+
+class UnitUtils(object):
+    _factors = {'DUT_MILLIMETERS': 304.8, 'DUT_METERS': 0.3048, 'DUT_DECIMAL_FEET': 1.0}
+
+    @staticmethod
+    def ConvertFromInternalUnits(value, unit):
+        return value * UnitUtils._factors.get(str(unit), 1.0)
+
+    @staticmethod
+    def ConvertToInternalUnits(value, unit):
+        return value / UnitUtils._factors.get(str(unit), 1.0)
+
+
+# Curves ---------------------------------------------------------------------
+
+class GeometryObject(object):
+    pass
+
+
+class Curve(GeometryObject):
+    IsBound = True
+    IsCyclic = False
+
+    @property
+    def Length(self):
+        _api.record('Curve.Length')
+        return self._length()
+
+    def GetEndPoint(self, index):
+        _api.record('Curve.GetEndPoint')
+        if not self.IsBound:
+            raise Exception('Unbound curves have no end points.')
+        return self._point_at(0.0 if index == 0 else 1.0)
+
+    def Evaluate(self, parameter, normalized):
+        _api.record('Curve.Evaluate')
+        if not normalized:
+            return self._point_at_raw(parameter)
+        return self._point_at(parameter)
+
+    def _point_at_raw(self, parameter):
+        return self._point_at(parameter / self._length())
+
+    def _moved(self, vector):
+        raise NotImplementedError
+
+
+class Line(Curve):
+    def __init__(self, start, end):
+        self._start = start
+        self._end = end
+
+    @staticmethod
+    def CreateBound(start, end):
+        _api.record('Line.CreateBound')
+        return Line(start, end)
+
+    @property
+    def Direction(self):
+        return (self._end - self._start).Normalize()
+
+    def _length(self):
+        return self._start.DistanceTo(self._end)
+
+    def _point_at(self, t):
+        return self._start + (self._end - self._start) * t
+
+    def _moved(self, vector):
+        return Line(self._start + vector, self._end + vector)
+
+
+class Arc(Curve):
+    IsCyclic = True
+    Period = 2 * _math.pi
+
+    def __init__(self, center, radius, start_angle, end_angle, x_axis=None, y_axis=None, bound=True):
+        self.Center = center
+        self.Radius = radius
+        self._start_angle = start_angle
+        self._end_angle = end_angle
+        self.XDirection = x_axis or XYZ.BasisX
+        self.YDirection = y_axis or XYZ.BasisY
+        self.IsBound = bound
+
+    @staticmethod
+    def Create(center, radius, start_angle, end_angle, x_axis, y_axis):
+        _api.record('Arc.Create')
+        bound = (end_angle - start_angle) < 2 * _math.pi - 1e-9
+        return Arc(center, radius, start_angle, end_angle, x_axis, y_axis, bound)
+
+    def _length(self):
+        return self.Radius * (self._end_angle - self._start_angle)
+
+    def _point_at(self, t):
+        return self._point_at_raw(self._start_angle + (self._end_angle - self._start_angle) * t)
+
+    def _point_at_raw(self, angle):
+        return (self.Center + self.XDirection * (self.Radius * _math.cos(angle))
+                + self.YDirection * (self.Radius * _math.sin(angle)))
+
+    def GetEndParameter(self, index):
+        _api.record('Curve.GetEndParameter')
+        if not self.IsBound:
+            raise Exception('Unbound curves have no end parameters.')
+        return self._start_angle if index == 0 else self._end_angle
+
+    def _moved(self, vector):
+        return Arc(self.Center + vector, self.Radius, self._start_angle, self._end_angle,
+                   self.XDirection, self.YDirection, self.IsBound)
+
+
+class Ellipse(Curve):
+    IsCyclic = True
+    Period = 2 * _math.pi
+
+    def __init__(self, center, x_radius, y_radius, start_angle=0.0, end_angle=2 * _math.pi, bound=True):
+        self.Center = center
+        self.RadiusX = x_radius
+        self.RadiusY = y_radius
+        self.XDirection = XYZ.BasisX
+        self.YDirection = XYZ.BasisY
+        self._start_angle = start_angle
+        self._end_angle = end_angle
+        self.IsBound = bound
+
+    def _point_at(self, t):
+        return self._point_at_raw(self._start_angle + (self._end_angle - self._start_angle) * t)
+
+    def _point_at_raw(self, angle):
+        return self.Center + XYZ(self.RadiusX * _math.cos(angle), self.RadiusY * _math.sin(angle), 0)
+
+    def _length(self):
+        # Numerical length; only the stand-in needs it
+        steps = 2000
+        total = 0.0
+        previous = self._point_at(0.0)
+        for i in range(1, steps + 1):
+            point = self._point_at(i / float(steps))
+            total += previous.DistanceTo(point)
+            previous = point
+        return total
+
+    def GetEndParameter(self, index):
+        _api.record('Curve.GetEndParameter')
+        if not self.IsBound:
+            raise Exception('Unbound curves have no end parameters.')
+        return self._start_angle if index == 0 else self._end_angle
+
+    def _moved(self, vector):
+        return Ellipse(self.Center + vector, self.RadiusX, self.RadiusY,
+                       self._start_angle, self._end_angle, self.IsBound)
+
+
+class HermiteSpline(Curve):
+    # Polyline-backed spline whose parameter is spaced by control point
+    # index, not by length, like Revit's splines
+    def __init__(self, points):
+        self._points = list(points)
+
+    def _point_at(self, t):
+        segments = len(self._points) - 1
+        position = min(max(t, 0.0), 1.0) * segments
+        index = min(int(position), segments - 1)
+        local = position - index
+        # ease the local parameter so equal parameter steps give unequal lengths
+        local = local * local * (3 - 2 * local)
+        start = self._points[index]
+        return start + (self._points[index + 1] - start) * local
+
+    def _length(self):
+        return sum(self._points[i].DistanceTo(self._points[i + 1]) for i in range(len(self._points) - 1))
+
+    def _moved(self, vector):
+        return HermiteSpline([p + vector for p in self._points])
+
+
+# Locations -----------------------------------------------------------------
+
+class Location(object):
+    def __init__(self, owner=None):
+        self._owner = owner
+
+    def Move(self, vector):
+        _api.record('Location.Move')
+        _require_transaction(self._owner)
+        self._owner._translate(vector)
+        return True
+
+
+class LocationPoint(Location):
+    def __init__(self, point, owner=None, rotation=0.0):
+        Location.__init__(self, owner)
+        self._point = point
+        self._rotation = rotation
+
+    @property
+    def Rotation(self):
+        _api.record('LocationPoint.Rotation')
+        return self._rotation
+
+    @property
+    def Point(self):
+        _api.record('LocationPoint.Point')
+        return self._point
+
+    @Point.setter
+    def Point(self, value):
+        _api.record('LocationPoint.Point.set')
+        _require_transaction(self._owner)
+        self._point = value
+
+    def Move(self, vector):
+        _api.record('Location.Move')
+        _require_transaction(self._owner)
+        self._point = self._point + vector
+        return True
+
+
+class LocationCurve(Location):
+    def __init__(self, curve, owner=None):
+        Location.__init__(self, owner)
+        self._curve = curve
+
+    @property
+    def Curve(self):
+        _api.record('LocationCurve.Curve')
+        return self._curve
+
+    @Curve.setter
+    def Curve(self, value):
+        _api.record('LocationCurve.Curve.set')
+        _require_transaction(self._owner)
+        self._curve = value
+
+    def Move(self, vector):
+        _api.record('Location.Move')
+        _require_transaction(self._owner)
+        self._curve = self._curve._moved(vector)
+        return True
+
+
+# Parameters ----------------------------------------------------------------
+
+class Definition(object):
+    def __init__(self, name):
+        self.Name = name
+
+
+class Parameter(object):
+    def __init__(self, name, value, storage=None, builtin=None, getter=None):
+        self.Definition = Definition(name)
+        self._value = value
+        self._getter = getter
+        self.StorageType = storage or StorageType.String
+        self.BuiltIn = builtin
+        self.Id = ElementId(-1000 - abs(hash(name)) % 100000)
+
+    def _get(self):
+        return self._getter() if self._getter else self._value
+
+    @property
+    def HasValue(self):
+        return self._get() is not None
+
+    def AsString(self):
+        _api.record('Parameter.AsString')
+        value = self._get()
+        return value if isinstance(value, str) else None
+
+    def AsValueString(self):
+        _api.record('Parameter.AsValueString')
+        value = self._get()
+        return None if value is None else str(value)
+
+    def AsDouble(self):
+        _api.record('Parameter.AsDouble')
+        return float(self._get() or 0.0)
+
+    def AsInteger(self):
+        _api.record('Parameter.AsInteger')
+        return int(self._get() or 0)
+
+    def AsElementId(self):
+        _api.record('Parameter.AsElementId')
+        value = self._get()
+        return value if isinstance(value, ElementId) else ElementId.InvalidElementId
+
+    def Set(self, value):
+        _api.record('Parameter.Set')
+        _require_transaction(self._owner)
+        self._value = value
+        return True
+
+
+# Elements ------------------------------------------------------------------
+
+class Category(object):
+    def __init__(self, builtin):
+        self.BuiltInCategory = builtin
+        self.Name = str(builtin).replace('OST_', '')
+        self.Id = ElementId(-2000000 - builtin.value__)
+
+
+class Element(object):
+    category = None
+    view_specific = False
+    Pinned = False
+
+    def __init__(self, name=None, location=None, size=None):
+        self.Id = ElementId.InvalidElementId
+        self.Document = None
+        self.Name = name or self.__class__.__name__
+        self.OwnerViewId = ElementId.InvalidElementId
+        self._location = location
+        if location is not None:
+            location._owner = self
+        self._size = size or XYZ(1, 1, 1)
+        self._params = {}
+        self._level_id = ElementId.InvalidElementId
+        # None means visible in every view
+        self._visible_views = None
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(self.__class__.__name__, self.Id.IntegerValue)
+
+    @property
+    def Category(self):
+        return Category(self.category) if self.category else None
+
+    @property
+    def Location(self):
+        _api.record('Element.Location')
+        return self._location
+
+    @property
+    def LevelId(self):
+        _api.record('Element.LevelId')
+        return self._level_id
+
+    @property
+    def Parameters(self):
+        _api.record('Element.Parameters')
+        return list(self._params.values())
+
+    def add_parameter(self, parameter):
+        parameter._owner = self
+        self._params[parameter.BuiltIn or parameter.Definition.Name] = parameter
+        return parameter
+
+    def get_Parameter(self, builtin):
+        _api.record('Element.get_Parameter')
+        return self._params.get(builtin)
+
+    def LookupParameter(self, name):
+        _api.record('Element.LookupParameter')
+        for param in self._params.values():
+            if param.Definition.Name == name:
+                return param
+        return None
+
+    def _anchor(self):
+        location = self._location
+        if isinstance(location, LocationPoint):
+            return location._point
+        if isinstance(location, LocationCurve):
+            curve = location._curve
+            return (curve._point_at(0.0) + curve._point_at(1.0)) / 2
+        return XYZ()
+
+    def _extent(self):
+        location = self._location
+        if isinstance(location, LocationCurve) and location._curve.IsBound:
+            start = location._curve._point_at(0.0)
+            end = location._curve._point_at(1.0)
+            half = self._size / 2
+            return (XYZ(min(start.X, end.X) - half.X, min(start.Y, end.Y) - half.Y, min(start.Z, end.Z)),
+                    XYZ(max(start.X, end.X) + half.X, max(start.Y, end.Y) + half.Y, max(start.Z, end.Z) + self._size.Z))
+        center = self._anchor()
+        half = self._size / 2
+        return center - half, center + half
+
+    def get_BoundingBox(self, view):
+        _api.record('Element.get_BoundingBox')
+        if view is None and self.view_specific:
+            return None
+        minimum, maximum = self._extent()
+        return BoundingBoxXYZ(minimum, maximum)
+
+    @property
+    def BoundingBox(self):
+        element = self
+
+        class _Indexer(object):
+            def __getitem__(self, view):
+                return element.get_BoundingBox(view)
+
+        return _Indexer()
+
+    def _translate(self, vector):
+        location = self._location
+        if isinstance(location, LocationPoint):
+            location._point = location._point + vector
+        elif isinstance(location, LocationCurve):
+            location._curve = location._curve._moved(vector)
+
+    def _rotate(self, axis, angle):
+        location = self._location
+        if isinstance(location, LocationPoint):
+            location._rotation = (location._rotation + angle) % (2 * _math.pi)
+
+
+class ElementType(Element):
+    pass
+
+
+class WallType(ElementType):
+    pass
+
+
+class FamilyInstance(Element):
+    category = BuiltInCategory.OST_GenericModel
+
+
+class StructuralBeam(FamilyInstance):
+    # A framing instance placed along a curve; Revit exposes it as a FamilyInstance
+    category = BuiltInCategory.OST_StructuralFraming
+
+    def __init__(self, curve):
+        FamilyInstance.__init__(self, 'Beam', LocationCurve(curve), XYZ(0.5, 0.5, 1))
+
+
+class IndependentTag(Element):
+    category = BuiltInCategory.OST_Tags
+    view_specific = True
+
+
+class TextNote(Element):
+    category = BuiltInCategory.OST_TextNotes
+    view_specific = True
+
+    def __init__(self, coord, size=None):
+        Element.__init__(self, 'Text Note', Location(), size or XYZ(2, 0.5, 0))
+        self._coord = coord
+
+    @property
+    def Coord(self):
+        _api.record('TextNote.Coord')
+        return self._coord
+
+    @Coord.setter
+    def Coord(self, value):
+        _api.record('TextNote.Coord.set')
+        _require_transaction(self)
+        self._coord = value
+
+    def _anchor(self):
+        return self._coord
+
+    def _translate(self, vector):
+        self._coord = self._coord + vector
+
+
+class DirectShape(Element):
+    category = BuiltInCategory.OST_GenericModel
+
+    def __init__(self):
+        Element.__init__(self, 'Direct Shape', None, XYZ(0, 0, 0))
+        self._shape = []
+
+    @staticmethod
+    def CreateElement(doc, category_id):
+        _api.record('DirectShape.CreateElement')
+        _require_transaction()
+        return doc.add(DirectShape())
+
+    def SetShape(self, shape):
+        _api.record('DirectShape.SetShape')
+        _require_transaction(self)
+        self._shape = list(shape)
+
+
+class CurveElement(Element):
+    def __init__(self, curve, name=None):
+        Element.__init__(self, name, LocationCurve(curve), XYZ(0, 0, 0))
+
+    @property
+    def GeometryCurve(self):
+        _api.record('CurveElement.GeometryCurve')
+        return self._location._curve
+
+
+class ModelCurve(CurveElement):
+    category = BuiltInCategory.OST_Lines
+
+
+class DetailCurve(CurveElement):
+    category = BuiltInCategory.OST_Lines
+    view_specific = True
+
+
+class Wall(Element):
+    category = BuiltInCategory.OST_Walls
+
+    # Like Revit, a wall's Name is the name of its type
+    def __init__(self, curve, room_bounding=True, height=10.0, width=0.5, type_name='Basic Wall'):
+        Element.__init__(self, type_name, LocationCurve(curve), XYZ(width, width, height))
+        self.add_parameter(Parameter('Length', None, StorageType.Double,
+                                     BuiltInParameter.CURVE_ELEM_LENGTH,
+                                     getter=lambda: self._location._curve._length()))
+        self.add_parameter(Parameter('Room Bounding', 1 if room_bounding else 0, StorageType.Integer,
+                                     BuiltInParameter.WALL_ATTR_ROOM_BOUNDING))
+        self.add_parameter(Parameter('Unconnected Height', height, StorageType.Double,
+                                     BuiltInParameter.WALL_USER_HEIGHT_PARAM))
+        self.add_parameter(Parameter('Base Offset', 0.0, StorageType.Double,
+                                     BuiltInParameter.WALL_BASE_OFFSET))
+        self.add_parameter(Parameter('Top Offset', 0.0, StorageType.Double,
+                                     BuiltInParameter.WALL_TOP_OFFSET))
+        self.add_parameter(Parameter('Width', width, StorageType.Double,
+                                     BuiltInParameter.WALL_ATTR_WIDTH_PARAM))
+        for name in ('Comments', 'Mark', 'Type Name', 'Family Name', 'Phase Created',
+                     'Structural Usage', 'Location Line', 'Volume', 'Area'):
+            self.add_parameter(Parameter(name, name.lower()))
+
+    @property
+    def Width(self):
+        return self._size.X
+
+
+class DatumPlane(Element):
+    def __init__(self, name):
+        Element.__init__(self, name)
+        self._bubbles = {}
+        self._hidden_in = set()
+
+    def CanBeVisibleInView(self, view):
+        _api.record('DatumPlane.CanBeVisibleInView')
+        return view.Id not in self._hidden_in and view.ViewType != ViewType.DraftingView
+
+    def IsBubbleVisibleInView(self, end, view):
+        _api.record('DatumPlane.IsBubbleVisibleInView')
+        if view.Id in self._hidden_in:
+            raise Exception('Datum is not visible in view.')
+        return self._bubbles.get((view.Id, end), True)
+
+    def _set_bubble(self, end, view, visible):
+        _require_transaction(self)
+        if view.Id in self._hidden_in:
+            raise Exception('Datum is not visible in view.')
+        self._bubbles[(view.Id, end)] = visible
+
+    def ShowBubbleInView(self, end, view):
+        _api.record('DatumPlane.ShowBubbleInView')
+        self._set_bubble(end, view, True)
+
+    def HideBubbleInView(self, end, view):
+        _api.record('DatumPlane.HideBubbleInView')
+        self._set_bubble(end, view, False)
+
+
+class Level(DatumPlane):
+    category = BuiltInCategory.OST_Levels
+
+    def __init__(self, name, elevation=0.0):
+        DatumPlane.__init__(self, name)
+        self.Elevation = elevation
+
+
+class Grid(DatumPlane):
+    category = BuiltInCategory.OST_Grids
+
+    def __init__(self, name, curve):
+        DatumPlane.__init__(self, name)
+        self._curve = curve
+
+    @property
+    def Curve(self):
+        _api.record('Grid.Curve')
+        return self._curve
+
+
+# Views ---------------------------------------------------------------------
+
+class View(Element):
+    category = BuiltInCategory.OST_Views
+
+    def __init__(self, name, view_type=None, right=None, up=None):
+        Element.__init__(self, name)
+        self.ViewType = view_type or ViewType.FloorPlan
+        self.IsTemplate = False
+        self.CanBePrinted = True
+        self.RightDirection = right or XYZ.BasisX
+        self.UpDirection = up or XYZ.BasisY
+        self.ViewDirection = XYZ.BasisZ
+        self.overrides = {}
+        self.filters = {}
+        self.isolated = None
+
+    def SetElementOverrides(self, element_id, settings):
+        _api.record('View.SetElementOverrides')
+        _require_transaction(self)
+        self.overrides[element_id] = settings
+
+    def GetElementOverrides(self, element_id):
+        _api.record('View.GetElementOverrides')
+        return self.overrides.get(element_id, OverrideGraphicSettings())
+
+    def AddFilter(self, filter_id):
+        _api.record('View.AddFilter')
+        _require_transaction(self)
+        self.filters[filter_id] = OverrideGraphicSettings()
+
+    def RemoveFilter(self, filter_id):
+        _api.record('View.RemoveFilter')
+        _require_transaction(self)
+        del self.filters[filter_id]
+
+    def GetFilters(self):
+        _api.record('View.GetFilters')
+        return list(self.filters)
+
+    def IsFilterApplied(self, filter_id):
+        _api.record('View.IsFilterApplied')
+        return filter_id in self.filters
+
+    def SetFilterOverrides(self, filter_id, settings):
+        _api.record('View.SetFilterOverrides')
+        _require_transaction(self)
+        self.filters[filter_id] = settings
+
+    def IsolateElementsTemporary(self, element_ids):
+        _api.record('View.IsolateElementsTemporary')
+        _require_transaction(self)
+        self.isolated = list(element_ids)
+
+    def IsInTemporaryViewMode(self, mode):
+        _api.record('View.IsInTemporaryViewMode')
+        return self.isolated is not None
+
+    def DisableTemporaryViewMode(self, mode):
+        _api.record('View.DisableTemporaryViewMode')
+        _require_transaction(self)
+        self.isolated = None
+
+
+class ViewPlan(View):
+    pass
+
+
+class ViewSection(View):
+    def __init__(self, name, view_type=None):
+        View.__init__(self, name, view_type or ViewType.Section, XYZ.BasisX, XYZ.BasisZ)
+
+
+class View3D(View):
+    def __init__(self, name):
+        View.__init__(self, name, ViewType.ThreeD)
+
+
+class ViewSheet(View):
+    category = BuiltInCategory.OST_Sheets
+
+    def __init__(self, number, name):
+        View.__init__(self, name, ViewType.DrawingSheet)
+        self.SheetNumber = number
+        self._placed = []
+
+    def GetAllPlacedViews(self):
+        _api.record('ViewSheet.GetAllPlacedViews')
+        return list(self._placed)
+
+
+class Viewport(Element):
+    category = BuiltInCategory.OST_Viewports
+
+    def __init__(self, sheet_id, view_id):
+        Element.__init__(self, 'Viewport')
+        self.SheetId = sheet_id
+        self.ViewId = view_id
+
+    def GetBoxOutline(self):
+        _api.record('Viewport.GetBoxOutline')
+        minimum, maximum = self._extent()
+        return Outline(minimum, maximum)
+
+    def GetBoxCenter(self):
+        _api.record('Viewport.GetBoxCenter')
+        return self._anchor()
+
+    @staticmethod
+    def Create(doc, sheet_id, view_id, point):
+        _api.record('Viewport.Create')
+        _require_transaction()
+        viewport = doc.add(Viewport(sheet_id, view_id))
+        viewport._location = LocationPoint(point, viewport)
+        doc._elements[sheet_id.IntegerValue]._placed.append(view_id)
+        return viewport
+
+
+class SelectionFilterElement(Element):
+    def __init__(self, name):
+        Element.__init__(self, name)
+        self._ids = []
+
+    @staticmethod
+    def Create(doc, name):
+        _api.record('SelectionFilterElement.Create')
+        _require_transaction()
+        return doc.add(SelectionFilterElement(name))
+
+    def GetElementIds(self):
+        return list(self._ids)
+
+    def SetElementIds(self, element_ids):
+        _api.record('SelectionFilterElement.SetElementIds')
+        _require_transaction(self)
+        self._ids = list(element_ids)
+
+
+# Document, collectors and transactions --------------------------------------
+
+def _require_transaction(element=None):
+    if not _api.in_transaction():
+        raise Exception('Attempt to modify the model outside of a transaction.')
+    if element is not None and element.Document is not None:
+        element.Document._modified.add(element.Id)
+        # Models built with `_warning` post one warning per changed element, like overlapping walls
+        if element.Document._warning:
+            element.Document._failures.append(FailureMessage(element.Document._warning, [element.Id]))
+
+
+class FailureMessage(object):
+    def __init__(self, description, element_ids, severity=None, has_resolutions=False):
+        self._description = description
+        self._element_ids = list(element_ids)
+        self._severity = severity or FailureSeverity.Warning
+        self._has_resolutions = has_resolutions
+
+    def GetDescriptionText(self):
+        return self._description
+
+    def GetFailingElementIds(self):
+        return list(self._element_ids)
+
+    def GetSeverity(self):
+        return self._severity
+
+    def HasResolutions(self):
+        return self._has_resolutions
+
+
+class FailuresAccessor(object):
+    def __init__(self, messages):
+        self._messages = list(messages)
+        self._handled = set()
+
+    def GetFailureMessages(self):
+        return list(self._messages)
+
+    def DeleteWarning(self, message):
+        _api.record('FailuresAccessor.DeleteWarning')
+        self._handled.add(id(message))
+
+    def ResolveFailure(self, message):
+        _api.record('FailuresAccessor.ResolveFailure')
+        self._handled.add(id(message))
+
+    def _remaining(self):
+        return [message for message in self._messages if id(message) not in self._handled]
+
+
+class IFailuresPreprocessor(object):
+    pass
+
+
+class FailureHandlingOptions(object):
+    def __init__(self):
+        self.preprocessor = None
+
+    def SetFailuresPreprocessor(self, preprocessor):
+        self.preprocessor = preprocessor
+        return self
+
+    def SetClearAfterRollback(self, clear):
+        return self
+
+
+class _Event(object):
+    # .NET style event: handlers are attached with += and removed with -=
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def fire(self, sender, args):
+        for handler in list(self.handlers):
+            handler(sender, args)
+
+
+class DocumentChangedEventArgs(object):
+    def __init__(self, doc, added, modified, deleted):
+        self._doc = doc
+        self._added = list(added)
+        self._modified = list(modified)
+        self._deleted = list(deleted)
+
+    def is_empty(self):
+        return not (self._added or self._modified or self._deleted)
+
+    def GetDocument(self):
+        return self._doc
+
+    def GetAddedElementIds(self):
+        return list(self._added)
+
+    def GetModifiedElementIds(self):
+        return list(self._modified)
+
+    def GetDeletedElementIds(self):
+        return list(self._deleted)
+
+
+class DocumentClosingEventArgs(object):
+    def __init__(self, doc):
+        self.Document = doc
+
+
+class Application(object):
+    def __init__(self):
+        self.DocumentChanged = _Event()
+        self.DocumentClosing = _Event()
+        self.VersionNumber = '2023'
+
+
+class ProjectPosition(object):
+    def __init__(self, angle=0.0):
+        self.Angle = angle
+        self.EastWest = 0.0
+        self.NorthSouth = 0.0
+        self.Elevation = 0.0
+
+
+class ProjectLocation(object):
+    def __init__(self, angle=0.0):
+        self._position = ProjectPosition(angle)
+
+    def GetProjectPosition(self, point):
+        _api.record('ProjectLocation.GetProjectPosition')
+        return self._position
+
+
+# One Revit session per process, like the real thing
+application = Application()
+
+
+class Document(object):
+    def __init__(self, title='Synthetic Model'):
+        self.Title = title
+        self.PathName = ''
+        self.IsWorkshared = False
+        self.IsFamilyDocument = False
+        self.ActiveView = None
+        self._elements = {}
+        self._next_id = 1000
+        self.Application = application
+        self.ActiveProjectLocation = ProjectLocation()
+        # Warning posted for every element a transaction changes, and the failures waiting for commit
+        self._warning = None
+        self._failures = []
+        # Element ids changed by the open transaction, reported on commit
+        self._added = set()
+        self._modified = set()
+        self._deleted = set()
+
+    def add(self, element):
+        element.Id = ElementId(self._next_id)
+        element.Document = self
+        self._next_id += 1
+        self._elements[element.Id.IntegerValue] = element
+        if _api.in_transaction():
+            self._added.add(element.Id)
+        return element
+
+    def Close(self, save_modified=True):
+        _api.record('Document.Close')
+        self.Application.DocumentClosing.fire(self.Application, DocumentClosingEventArgs(self))
+        return True
+
+    def GetElement(self, element_id):
+        _api.record('Document.GetElement')
+        key = element_id.IntegerValue if isinstance(element_id, ElementId) else int(element_id)
+        return self._elements.get(key)
+
+    def Delete(self, element_id):
+        _api.record('Document.Delete')
+        _require_transaction()
+        element = self._elements.pop(element_id.IntegerValue, None)
+        if element is None:
+            return []
+        self._deleted.add(element_id)
+        for view in self._elements.values():
+            if isinstance(view, View):
+                view.filters.pop(element_id, None)
+        return [element_id]
+
+    def all_elements(self):
+        return list(self._elements.values())
+
+
+class ElementCategoryFilter(object):
+    def __init__(self, category):
+        self.category = category
+
+    def PassesElement(self, element):
+        return element.category == self.category
+
+
+class ElementMulticategoryFilter(object):
+    def __init__(self, categories):
+        self.categories = set(categories)
+
+    def PassesElement(self, element):
+        return element.category in self.categories
+
+
+class ElementClassFilter(object):
+    def __init__(self, element_class):
+        self.element_class = element_class
+
+    def PassesElement(self, element):
+        return isinstance(element, self.element_class)
+
+
+class ParameterValueProvider(object):
+    def __init__(self, parameter_id):
+        self.parameter = _builtin_parameters.get(parameter_id.IntegerValue)
+
+    def value(self, element):
+        param = element._params.get(self.parameter)
+        return param._get() if param else None
+
+
+class FilterNumericEquals(object):
+    def test(self, value, rule_value):
+        return value == rule_value
+
+
+class FilterNumericGreater(object):
+    def test(self, value, rule_value):
+        return value > rule_value
+
+
+class FilterNumericLess(object):
+    def test(self, value, rule_value):
+        return value < rule_value
+
+
+class FilterIntegerRule(object):
+    def __init__(self, provider, evaluator, value):
+        self.provider = provider
+        self.evaluator = evaluator
+        self.value = value
+
+    def passes(self, element):
+        value = self.provider.value(element)
+        return value is not None and self.evaluator.test(value, self.value)
+
+
+class FilterDoubleRule(FilterIntegerRule):
+    def __init__(self, provider, evaluator, value, epsilon):
+        FilterIntegerRule.__init__(self, provider, evaluator, value)
+
+
+class ElementParameterFilter(object):
+    # Evaluated natively inside the collector: no element reaches Python
+    def __init__(self, rule, inverted=False):
+        self.rules = rule if isinstance(rule, list) else [rule]
+        self.inverted = inverted
+
+    def PassesElement(self, element):
+        return all(rule.passes(element) for rule in self.rules) != self.inverted
+
+
+class FilteredElementCollector(object):
+    def __init__(self, doc, view_id=None):
+        _api.record('FilteredElementCollector')
+        self._doc = doc
+        self._view_id = view_id
+        self._filters = []
+
+    def _narrow(self, predicate):
+        self._filters.append(predicate)
+        return self
+
+    def OfCategory(self, category):
+        return self._narrow(lambda e: e.category == category)
+
+    def OfClass(self, element_class):
+        return self._narrow(lambda e: isinstance(e, element_class))
+
+    def WherePasses(self, element_filter):
+        return self._narrow(element_filter.PassesElement)
+
+    def WhereElementIsNotElementType(self):
+        return self._narrow(lambda e: not isinstance(e, ElementType))
+
+    def WhereElementIsElementType(self):
+        return self._narrow(lambda e: isinstance(e, ElementType))
+
+    def _matches(self):
+        view_id = self._view_id
+        for element in self._doc._elements.values():
+            if view_id is not None:
+                if isinstance(element, View):
+                    continue
+                if element.OwnerViewId != ElementId.InvalidElementId and element.OwnerViewId != view_id:
+                    continue
+                if element._visible_views is not None and view_id not in element._visible_views:
+                    continue
+            if all(predicate(element) for predicate in self._filters):
+                yield element
+
+    def __iter__(self):
+        for element in self._matches():
+            _api.record('elements_materialized')
+            yield element
+
+    def ToElements(self):
+        _api.record('FilteredElementCollector.ToElements')
+        return list(self)
+
+    def ToElementIds(self):
+        _api.record('FilteredElementCollector.ToElementIds')
+        return [element.Id for element in self._matches()]
+
+    def GetElementCount(self):
+        return sum(1 for _ in self._matches())
+
+    def FirstElement(self):
+        for element in self:
+            return element
+        return None
+
+
+class Transaction(object):
+    def __init__(self, doc, name=''):
+        self._doc = doc
+        self._name = name
+        self._entry = None
+        self._options = FailureHandlingOptions()
+
+    def GetFailureHandlingOptions(self):
+        return self._options
+
+    def SetFailureHandlingOptions(self, options):
+        self._options = options
+
+    def _process_failures(self):
+        # Without a preprocessor every remaining failure stops the commit with a dialog
+        doc = self._doc
+        accessor = FailuresAccessor(doc._failures)
+        doc._failures = []
+        result = FailureProcessingResult.Continue
+        if accessor._messages and self._options.preprocessor is not None:
+            result = self._options.preprocessor.PreprocessFailures(accessor)
+        remaining = accessor._remaining()
+        if remaining:
+            _api.record('FailureDialog', len(remaining))
+        return result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._entry is not None:
+            self.RollBack()
+        return False
+
+    def Start(self):
+        _api.record('Transaction.Start')
+        self._entry = _api.begin_transaction(self._name)
+        return TransactionStatus.Started
+
+    def Commit(self):
+        _api.record('Transaction.Commit')
+        if self._process_failures() == FailureProcessingResult.ProceedWithRollBack:
+            return self.RollBack()
+        _api.end_transaction(self._entry, 'committed')
+        self._entry = None
+        doc = self._doc
+        changes = DocumentChangedEventArgs(doc, doc._added, doc._modified - doc._added, doc._deleted)
+        doc._added, doc._modified, doc._deleted = set(), set(), set()
+        if not changes.is_empty():
+            doc.Application.DocumentChanged.fire(doc.Application, changes)
+        return TransactionStatus.Committed
+
+    def RollBack(self):
+        _api.record('Transaction.RollBack')
+        _api.end_transaction(self._entry, 'rolled back')
+        self._entry = None
+        self._doc._added, self._doc._modified, self._doc._deleted = set(), set(), set()
+        self._doc._failures = []
+        return TransactionStatus.RolledBack
+
+
+class TransactionGroup(object):
+    # Rolling back undoes the transactions committed inside the group. Only
+    # element creation is undone here, which is all the previews use.
+    def __init__(self, doc, name=''):
+        self._doc = doc
+        self._name = name
+        self._first_id = None
+        self._first_transaction = None
+
+    def Start(self):
+        _api.record('TransactionGroup.Start')
+        self._first_id = self._doc._next_id
+        self._first_transaction = len(_api.transactions)
+
+    def Assimilate(self):
+        _api.record('TransactionGroup.Assimilate')
+        self._first_id = None
+
+    def RollBack(self):
+        _api.record('TransactionGroup.RollBack')
+        doc = self._doc
+        added = [key for key in doc._elements if key >= self._first_id]
+        for key in added:
+            del doc._elements[key]
+        for entry in _api.transactions[self._first_transaction:]:
+            entry['status'] = 'rolled back'
+        self._first_id = None
+        if added:
+            changes = DocumentChangedEventArgs(doc, set(), set(), set(ElementId(key) for key in added))
+            doc.Application.DocumentChanged.fire(doc.Application, changes)
+
+
+class ElementTransformUtils(object):
+    @staticmethod
+    def MoveElement(doc, element_id, vector):
+        _api.record('ElementTransformUtils.MoveElement')
+        _require_transaction(doc._elements[element_id.IntegerValue])
+        doc._elements[element_id.IntegerValue]._translate(vector)
+
+    @staticmethod
+    def RotateElement(doc, element_id, axis, angle):
+        # Only vertical axes through a point element's location are modelled
+        _api.record('ElementTransformUtils.RotateElement')
+        element = doc._elements[element_id.IntegerValue]
+        _require_transaction(element)
+        element._rotate(axis, angle)
+
+    @staticmethod
+    def MoveElements(doc, element_ids, vector):
+        _api.record('ElementTransformUtils.MoveElements')
+        _require_transaction()
+        for element_id in element_ids:
+            element = doc._elements[element_id.IntegerValue]
+            _require_transaction(element)
+            element._translate(vector)
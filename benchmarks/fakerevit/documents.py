@@ -0,0 +1,55 @@
+# Stand-in document factory for lib/batch_queue.py: opens a synthetic model
+# for every path so queues, checkpoints and resumes can be exercised without
+# Revit. Documents are built by `builder(doc)` and keyed by path like saved
+# Revit models.
+import os
+
+from fakerevit import factory
+
+
+class SimulatedCrash(BaseException):
+    # Not an Exception, so the batch cannot catch it: like Revit going down
+    pass
+
+
+def default_builder(doc):
+    factory.add_walls(doc, 200)
+    factory.add_levels(doc, 5)
+    factory.add_grids(doc, 10)
+    factory.add_sheets(doc, 4, views_per_sheet=2)
+
+
+class StandInOpener(object):
+    # `crash_on` paths take the whole batch down the first time they are
+    # opened; `fail_on` paths cannot be opened at all.
+    def __init__(self, builder=default_builder, crash_on=(), fail_on=()):
+        self.builder = builder
+        self.crash_on = set(crash_on)
+        self.fail_on = set(fail_on)
+        self.open_documents = []
+        self.max_open = 0
+        self.opened = []
+        self.saved = []
+
+    def open(self, path):
+        self.opened.append(path)
+        if path in self.crash_on:
+            self.crash_on.discard(path)
+            raise SimulatedCrash(path)
+        if path in self.fail_on:
+            raise IOError('Cannot open {0}'.format(path))
+        doc = factory.new_document(os.path.splitext(os.path.basename(path))[0])
+        doc.PathName = path
+        self.builder(doc)
+        self.open_documents.append(doc)
+        self.max_open = max(self.max_open, len(self.open_documents))
+        return doc
+
+    def close(self, doc, save_path=None):
+        if save_path:
+            with open(save_path, 'w') as f:
+                f.write(doc.Title)
+            self.saved.append(save_path)
+        doc.Close(False)
+        self.open_documents.remove(doc)
+        return save_path
@@ -0,0 +1,145 @@
+# Builders for synthetic documents. Every builder takes a seed so repeated
+# runs produce identical models and therefore comparable reports.
+import math
+import random
+
+from fakerevit import db
+
+
+_document_count = [0]
+
+
+def new_document(title='Synthetic Model'):
+    # Titles are numbered so session caches keyed by document never mix models
+    _document_count[0] += 1
+    doc = db.Document('{0} {1}'.format(title, _document_count[0]))
+    doc.ActiveView = doc.add(db.ViewPlan('Level 1', db.ViewType.FloorPlan))
+    return doc
+
+
+def add_family_instances(doc, count, seed=1, spread=1000.0):
+    rng = random.Random(seed)
+    elements = []
+    for i in range(count):
+        point = db.XYZ(rng.uniform(0, spread), rng.uniform(0, spread), 0)
+        size = db.XYZ(rng.uniform(1, 4), rng.uniform(1, 4), 3)
+        elements.append(doc.add(db.FamilyInstance('Family {0}'.format(i), db.LocationPoint(point), size)))
+    return elements
+
+
+def add_text_notes(doc, count, seed=2, spread=1000.0):
+    rng = random.Random(seed)
+    elements = []
+    for i in range(count):
+        note = db.TextNote(db.XYZ(rng.uniform(0, spread), rng.uniform(0, spread), 0),
+                           db.XYZ(rng.uniform(1, 6), 0.5, 0))
+        note.OwnerViewId = doc.ActiveView.Id
+        elements.append(doc.add(note))
+    return elements
+
+
+def add_annotations(doc, count, seed=3, spread=1000.0):
+    # Mixed selection of tags and text notes, as found in annotation-heavy views
+    rng = random.Random(seed)
+    elements = []
+    for i in range(count):
+        point = db.XYZ(rng.uniform(0, spread), rng.uniform(0, spread), 0)
+        if i % 2:
+            element = db.TextNote(point, db.XYZ(rng.uniform(1, 6), 0.5, 0))
+        else:
+            element = db.IndependentTag('Tag {0}'.format(i), db.LocationPoint(point), db.XYZ(1.5, 0.5, 0))
+        element.OwnerViewId = doc.ActiveView.Id
+        elements.append(doc.add(element))
+    return elements
+
+
+def add_walls(doc, count, seed=4, non_whole_ratio=0.2, off_axis_ratio=0.1,
+              curved_ratio=0.02, room_bounding_ratio=0.7, hidden_ratio=0.0):
+    # `hidden_ratio` of the walls sit on other levels and are not visible in the active view
+    rng = random.Random(seed)
+    walls = []
+    for i in range(count):
+        start = db.XYZ(rng.uniform(0, 5000), rng.uniform(0, 5000), 0)
+        length_mm = float(rng.randint(500, 12000))
+        if rng.random() < non_whole_ratio:
+            length_mm += rng.uniform(0.1, 0.9)
+        length = length_mm / 304.8
+        roll = rng.random()
+        if roll < curved_ratio:
+            radius = length / math.pi
+            curve = db.Arc(start, radius, 0.0, math.pi)
+        elif roll < curved_ratio + off_axis_ratio:
+            angle = math.radians(rng.uniform(5, 85))
+            curve = db.Line(start, start + db.XYZ(math.cos(angle), math.sin(angle), 0) * length)
+        elif rng.random() < 0.5:
+            curve = db.Line(start, start + db.XYZ(length, 0, 0))
+        else:
+            curve = db.Line(start, start + db.XYZ(0, length, 0))
+        # Every tenth wall is of a second type
+        wall = db.Wall(curve, rng.random() < room_bounding_ratio, type_name='Generic - 300mm' if i % 10 == 9 else 'Basic Wall')
+        wall._level_id = db.ElementId(1)
+        if rng.random() < hidden_ratio:
+            wall._visible_views = set()
+            wall._level_id = db.ElementId(2)
+        walls.append(doc.add(wall))
+    return walls
+
+
+def add_beams(doc, count, seed=5, non_whole_ratio=0.2, off_axis_ratio=0.1):
+    rng = random.Random(seed)
+    beams = []
+    for i in range(count):
+        start = db.XYZ(rng.uniform(0, 5000), rng.uniform(0, 5000), 10)
+        length_mm = float(rng.randint(1000, 9000))
+        if rng.random() < non_whole_ratio:
+            length_mm += rng.uniform(0.1, 0.9)
+        angle = math.radians(rng.uniform(5, 85)) if rng.random() < off_axis_ratio else 0.0
+        end = start + db.XYZ(math.cos(angle), math.sin(angle), 0) * (length_mm / 304.8)
+        beams.append(doc.add(db.StructuralBeam(db.Line(start, end))))
+    return beams
+
+
+def add_model_curve(doc, curve):
+    return doc.add(db.ModelCurve(curve))
+
+
+def add_levels(doc, count):
+    return [doc.add(db.Level('Level {0:03d}'.format(i), i * 12.0)) for i in range(count)]
+
+
+def add_grids(doc, count):
+    grids = []
+    for i in range(count):
+        if i % 2:
+            curve = db.Line(db.XYZ(i * 20.0, 0, 0), db.XYZ(i * 20.0, 500, 0))
+        else:
+            curve = db.Line(db.XYZ(0, i * 20.0, 0), db.XYZ(500, i * 20.0, 0))
+        grids.append(doc.add(db.Grid('G{0:03d}'.format(i), curve)))
+    return grids
+
+
+def add_sheets(doc, sheet_count, views_per_sheet=1, jitter=0.0, seed=5):
+    # Sheets holding plans, sections and 3D views; every view name is shared
+    # by two sheets so name collisions show up in the Heads tools. `jitter`
+    # scatters the viewports around their usual spot on each sheet (in feet).
+    kinds = [db.ViewType.FloorPlan, db.ViewType.Section, db.ViewType.Elevation, db.ViewType.ThreeD]
+    rng = random.Random(seed)
+    sheets = []
+    for s in range(sheet_count):
+        sheet = doc.add(db.ViewSheet('A{0:04d}'.format(s), 'Sheet {0}'.format(s)))
+        for v in range(views_per_sheet):
+            kind = kinds[(s + v) % len(kinds)]
+            name = 'View {0}-{1}'.format(s // 2, v)
+            if kind == db.ViewType.ThreeD:
+                view = db.View3D(name)
+            elif kind == db.ViewType.FloorPlan:
+                view = db.ViewPlan(name, kind)
+            else:
+                view = db.ViewSection(name, kind)
+            doc.add(view)
+            sheet._placed.append(view.Id)
+            viewport = doc.add(db.Viewport(sheet.Id, view.Id))
+            offset = db.XYZ(rng.uniform(-jitter, jitter), rng.uniform(-jitter, jitter), 0) if jitter else db.XYZ()
+            viewport._location = db.LocationPoint(db.XYZ(1.0 + v, 1.0, 0) + offset, viewport)
+        sheets.append(sheet)
+    return sheets
@@ -0,0 +1,217 @@
+# Stand-in for the pyrevit modules used by the pushbutton scripts.
+# Dialog answers come from `responses`, keyed by dialog title or message;
+# a callable response receives the offered items and returns the choice.
+import atexit
+import os
+import shutil
+import tempfile
+import types
+
+from fakerevit import api as _api
+from fakerevit import db as _db
+
+responses = {}
+outputs = []
+# AppDomain data: survives between button presses for the whole session
+domain_data = {}
+# pyRevit's per-user data folder, kept out of the real one
+data_dir = tempfile.mkdtemp(prefix='fakerevit_')
+atexit.register(shutil.rmtree, data_dir, True)
+
+
+def _answer(key, items, default):
+    if key in responses:
+        value = responses[key]
+        return value(items) if callable(value) else value
+    return default
+
+
+class Selection(object):
+    def __init__(self):
+        self.ids = []
+
+    def GetElementIds(self):
+        _api.record('Selection.GetElementIds')
+        return list(self.ids)
+
+    def SetElementIds(self, ids):
+        self.ids = list(ids)
+
+
+class UIDocument(object):
+    def __init__(self, doc):
+        self.Document = doc
+        self.Selection = Selection()
+
+    @property
+    def ActiveView(self):
+        return self.Document.ActiveView
+
+    def RefreshActiveView(self):
+        _api.record('UIDocument.RefreshActiveView')
+
+
+class Output(object):
+    def __init__(self):
+        self.tables = []
+        self.lines = []
+        self.progress = []
+
+    def linkify(self, element_ids, title=None):
+        return '<a>{0}</a>'.format(element_ids)
+
+    def print_table(self, table_data, title='', columns=None, **kwargs):
+        self.tables.append({'title': title, 'rows': len(table_data), 'columns': list(columns or [])})
+
+    def print_md(self, text):
+        self.lines.append(text)
+
+    def print_html(self, text):
+        self.lines.append(text)
+
+    def indeterminate_progress(self, state):
+        pass
+
+    def update_progress(self, current, total):
+        self.progress.append((current, total))
+
+    def reset_progress(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class ScriptConfig(object):
+    def get_option(self, name, default_value=None):
+        return getattr(self, name, default_value)
+
+
+config = ScriptConfig()
+
+
+def get_config(section=None):
+    return config
+
+
+def save_config():
+    pass
+
+
+def exit():
+    raise SystemExit()
+
+
+def get_output():
+    output = Output()
+    outputs.append(output)
+    return output
+
+
+class SelectFromList(object):
+    @staticmethod
+    def show(items, title='', **kwargs):
+        return _answer(title, items, list(items))
+
+
+class CommandSwitchWindow(object):
+    @staticmethod
+    def show(options, message='', **kwargs):
+        options = list(options)
+        return _answer(message, options, options[0] if options else None)
+
+
+def select_sheets(title='Select Sheets', multiple=True, **kwargs):
+    doc = revit.doc
+    sheets = [e for e in doc.all_elements() if isinstance(e, _db.ViewSheet)]
+    if not multiple:
+        return _answer(title, sheets, sheets[0] if sheets else None)
+    return _answer(title, sheets, sheets)
+
+
+def alert(message, title='', **kwargs):
+    outputs.append(message)
+    return _answer(message, None, True)
+
+
+def ask_for_string(default=None, prompt='', title='', **kwargs):
+    return _answer(prompt if prompt in responses else title, None, default)
+
+
+revit = types.ModuleType('pyrevit.revit')
+revit.doc = None
+revit.uidoc = None
+
+
+def get_selection():
+    uidoc = revit.uidoc
+    return [uidoc.Document.GetElement(i) for i in uidoc.Selection.GetElementIds()]
+
+
+revit.get_selection = get_selection
+
+
+def pick_element(message=''):
+    return _answer(message, None, None)
+
+
+revit.pick_element = pick_element
+
+
+def get_universal_data_file(file_id, file_ext, add_cmd_name=False):
+    return os.path.join(data_dir, 'pyRevit_{0}.{1}'.format(file_id, file_ext))
+
+
+def get_data_file(file_id, file_ext, add_cmd_name=False):
+    return os.path.join(data_dir, 'pyRevit_2023_{0}.{1}'.format(file_id, file_ext))
+
+
+def build_modules(db_module):
+    pyrevit = types.ModuleType('pyrevit')
+    forms = types.ModuleType('pyrevit.forms')
+    script = types.ModuleType('pyrevit.script')
+    coreutils = types.ModuleType('pyrevit.coreutils')
+    envvars = types.ModuleType('pyrevit.coreutils.envvars')
+    envvars.get_pyrevit_env_var = domain_data.get
+    envvars.set_pyrevit_env_var = domain_data.__setitem__
+    coreutils.envvars = envvars
+    appdata = types.ModuleType('pyrevit.coreutils.appdata')
+    appdata.get_universal_data_file = get_universal_data_file
+    appdata.get_data_file = get_data_file
+    coreutils.appdata = appdata
+
+    forms.SelectFromList = SelectFromList
+    forms.CommandSwitchWindow = CommandSwitchWindow
+    forms.select_sheets = select_sheets
+    forms.alert = alert
+    forms.ask_for_string = ask_for_string
+    script.get_output = get_output
+    script.exit = exit
+    script.get_config = get_config
+    script.save_config = save_config
+
+    pyrevit.revit = revit
+    pyrevit.forms = forms
+    pyrevit.script = script
+    pyrevit.coreutils = coreutils
+    pyrevit.DB = db_module
+    revit.DB = db_module
+
+    return {
+        'pyrevit': pyrevit,
+        'pyrevit.revit': revit,
+        'pyrevit.forms': forms,
+        'pyrevit.script': script,
+        'pyrevit.coreutils': coreutils,
+        'pyrevit.coreutils.envvars': envvars,
+        'pyrevit.coreutils.appdata': appdata,
+    }
+
+
+def set_document(doc, selection_ids=None):
+    revit.doc = doc
+    revit.uidoc = UIDocument(doc)
+    revit.uidoc.Selection.SetElementIds(selection_ids or [])
+    responses.clear()
+    del outputs[:]
+    config.__dict__.clear()
@@ -0,0 +1,56 @@
+# Minimal stand-ins for the .NET namespaces imported by the scripts.
+import types
+
+
+class _TypedList(list):
+    def Add(self, item):
+        self.append(item)
+
+    @property
+    def Count(self):
+        return len(self)
+
+
+class _GenericList(object):
+    # Supports the IronPython `List[ElementId]()` construction syntax
+    def __getitem__(self, item_type):
+        return _TypedList
+
+
+class Color(object):
+    def __init__(self, name, r, g, b):
+        self.Name = name
+        self.R = r
+        self.G = g
+        self.B = b
+
+    @staticmethod
+    def FromArgb(r, g, b):
+        return Color('Custom', r, g, b)
+
+
+Color.Red = Color('Red', 255, 0, 0)
+
+
+def build_modules():
+    system = types.ModuleType('System')
+    collections = types.ModuleType('System.Collections')
+    generic = types.ModuleType('System.Collections.Generic')
+    drawing = types.ModuleType('System.Drawing')
+    generic.List = _GenericList()
+    drawing.Color = Color
+    system.Collections = collections
+    collections.Generic = generic
+    system.Drawing = drawing
+
+    clr = types.ModuleType('clr')
+    clr.AddReference = lambda name: None
+    clr.AddReferenceByPartialName = lambda name: None
+
+    return {
+        'System': system,
+        'System.Collections': collections,
+        'System.Collections.Generic': generic,
+        'System.Drawing': drawing,
+        'clr': clr,
+    }
@@ -0,0 +1,94 @@
+# Run Align and Distribute pipelines once button by button and once through
+# Compose Layout on identical synthetic selections, check both leave every
+# element in the same place and compare the API calls and transactions.
+#
+#   python benchmarks/layout_composer_check.py --size 10000
+import argparse
+import os
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from fakerevit import api, factory, pyrevit_stub
+from run_benchmarks import forget_lib_modules, run_script
+from scenarios import ALIGNMENT, COMPOSE, DISTRIBUTE, script_path
+
+BUTTONS = {
+    'align left': script_path(ALIGNMENT, 'Left.pushbutton'),
+    'align right': script_path(ALIGNMENT, 'Right.pushbutton'),
+    'align top': script_path(ALIGNMENT, 'Top.pushbutton'),
+    'align bottom': script_path(ALIGNMENT, 'Bottom.pushbutton'),
+    'align horizontal': script_path(ALIGNMENT, 'Horizontal.pushbutton'),
+    'align vertical': script_path(ALIGNMENT, 'Vertical.pushbutton'),
+    'distribute horizontal': script_path(DISTRIBUTE, 'Horizontal.pushbutton'),
+    'distribute vertical': script_path(DISTRIBUTE, 'Vertical.pushbutton'),
+}
+SPACING_MODES = {'anchors': 'anchors', 'no overlap': 'anchors_no_overlap', 'gaps': 'gaps'}
+
+PIPELINES = [
+    ('family instances', factory.add_family_instances, 'Align Left, Distribute Vertical, Align Top'),
+    ('annotations', factory.add_annotations, 'Align Left, Distribute Vertical (gaps), Align Horizontal'),
+    ('annotations', factory.add_annotations, 'Distribute Horizontal (no overlap), Align Bottom, Distribute Vertical'),
+]
+
+COMPOSE_SCRIPT = script_path(COMPOSE, 'Compose.pushbutton')
+
+
+def _positions(elements):
+    return [element.get_BoundingBox(None) or element.get_BoundingBox(element.Document.ActiveView)
+            for element in elements]
+
+
+def _run_separately(add_elements, pipeline, size):
+    doc = factory.new_document()
+    elements = add_elements(doc, size)
+    fakerevit.activate(doc, elements)
+    for step in pipeline.split(','):
+        name, _, mode = step.strip().lower().partition(' (')
+        pyrevit_stub.config.__dict__.clear()
+        if mode:
+            pyrevit_stub.config.spacing_mode = SPACING_MODES[mode.rstrip(')')]
+        forget_lib_modules()
+        run_script(BUTTONS[name], [])
+    return elements, api.snapshot()
+
+
+def _run_composed(add_elements, pipeline, size):
+    doc = factory.new_document()
+    elements = add_elements(doc, size)
+    fakerevit.activate(doc, elements)
+    pyrevit_stub.responses['Compose Layout'] = pipeline
+    forget_lib_modules()
+    run_script(COMPOSE_SCRIPT, [])
+    return elements, api.snapshot()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare Compose Layout with running its steps one by one.')
+    parser.add_argument('--size', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    fakerevit.install()
+    errors = []
+    for label, add_elements, pipeline in PIPELINES:
+        separate, separate_calls = _run_separately(add_elements, pipeline, args.size)
+        composed, composed_calls = _run_composed(add_elements, pipeline, args.size)
+        worst = 0.0
+        for a, b in zip(_positions(separate), _positions(composed)):
+            worst = max(worst, abs(a.Min.X - b.Min.X), abs(a.Min.Y - b.Min.Y), abs(a.Min.Z - b.Min.Z))
+        print('{0:<17} {1}'.format(label, pipeline))
+        print('    separate {0:>8} calls {1:>2} transactions   composed {2:>8} calls {3:>2} transactions'
+              '   largest difference {4:.2e} ft'.format(
+                  sum(separate_calls['api_calls'].values()), len(separate_calls['transactions']),
+                  sum(composed_calls['api_calls'].values()), len(composed_calls['transactions']), worst))
+        if worst > 1e-6:
+            errors.append('{0}: positions differ by up to {1} ft'.format(pipeline, worst))
+    for error in errors:
+        print('ERROR ' + error)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
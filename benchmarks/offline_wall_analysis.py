@@ -0,0 +1,94 @@
+# Export a synthetic model to a wall snapshot, then run the Find analyses on
+# it without the fake Revit API: in this process and in worker processes.
+# Results are checked against the live tools' own code paths.
+#
+#   python benchmarks/offline_wall_analysis.py --size 100000 --workers 3
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from fakerevit import api, factory
+from scenarios import TAB_DIR
+
+sys.path.insert(0, os.path.join(TAB_DIR, 'lib'))
+
+ANALYSES = ['non_whole', 'room_bounding', 'off_axis']
+
+
+def live_results(doc):
+    # What Find walls, Bounding Walls and Isolate Off Axis compute through the API
+    from wall_axis_utils import get_wall_buckets
+    from wall_check_utils import collect_view_walls, find_non_whole_walls
+    view = doc.ActiveView
+    walls = collect_view_walls(doc, view)
+    room_bounding = [w.Id.IntegerValue for w in walls
+                     if w.get_Parameter(fakerevit.db.BuiltInParameter.WALL_ATTR_ROOM_BOUNDING).AsInteger() == 1]
+    buckets = get_wall_buckets(doc, view)
+    return {
+        'non_whole': sorted(w.Id.IntegerValue for w, length in find_non_whole_walls(collect_view_walls(doc, view))),
+        'room_bounding': sorted(room_bounding),
+        'off_axis': dict((key, sorted(i.IntegerValue for i in value)) for key, value in buckets.items()),
+    }
+
+
+def normalize(name, result):
+    if name == 'non_whole':
+        return sorted(wall_id for wall_id, length in result)
+    if name == 'off_axis':
+        return dict((key, sorted(value)) for key, value in result.items())
+    return sorted(result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the Find analyses offline on a wall snapshot.')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--workers', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    fakerevit.install()
+    doc = factory.new_document()
+    factory.add_walls(doc, args.size)
+    fakerevit.activate(doc)
+    from wall_analysis import run_analysis
+    from wall_snapshot import export_wall_snapshot
+
+    path = os.path.join(tempfile.mkdtemp(prefix='wall_snapshot_'), 'walls.snapshot')
+    start = time.time()
+    export_wall_snapshot(doc, path)
+    print('export           {0:>8.3f}s  {1:>9} API calls  {2:>10} bytes'.format(
+        time.time() - start, sum(api.calls.values()), os.path.getsize(path)))
+
+    start = time.time()
+    serial = dict((name, run_analysis(path, name)) for name in ANALYSES)
+    print('offline serial   {0:>8.3f}s'.format(time.time() - start))
+
+    start = time.time()
+    pool = multiprocessing.Pool(args.workers)
+    try:
+        parallel = dict(zip(ANALYSES, pool.starmap(run_analysis, [(path, name) for name in ANALYSES])))
+    finally:
+        pool.close()
+        pool.join()
+    print('offline workers  {0:>8.3f}s  ({1} processes)'.format(time.time() - start, args.workers))
+
+    api.reset()
+    start = time.time()
+    live = live_results(doc)
+    print('live API         {0:>8.3f}s  {1:>9} API calls'.format(time.time() - start, sum(api.calls.values())))
+
+    mismatches = [name for name in ANALYSES
+                  if normalize(name, serial[name]) != live[name] or normalize(name, parallel[name]) != live[name]]
+    for name in mismatches:
+        print('MISMATCH ' + name)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# Run the pure-math stages of Isolate Off Axis, Find walls and the Distribute
+# buttons through lib/parallel_math.py serially and on threads, and check
+# that both give the same results. CPython has a GIL, so the threaded timings
+# here only show the chunking overhead; the speed-up needs IronPython.
+#
+#   python benchmarks/parallel_math_check.py --size 100000
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from fakerevit import factory
+from scenarios import TAB_DIR
+
+sys.path.insert(0, os.path.join(TAB_DIR, 'lib'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare serial and threaded pure-math stages.')
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    fakerevit.install()
+    from element_location_utils import extract_anchors, get_move_deltas
+    from polar_layout import PolarPath, get_polar_targets
+    from wall_analysis import get_line_deviations, get_non_whole_flags
+    from wall_axis_utils import extract_wall_curves
+
+    doc = factory.new_document()
+    factory.add_walls(doc, args.size)
+    curves = extract_wall_curves(doc, doc.ActiveView)
+    rng = random.Random(7)
+    lengths_mm = [rng.uniform(500, 12000) if i % 3 else float(rng.randint(500, 12000)) for i in range(args.size)]
+    anchors = extract_anchors(factory.add_family_instances(doc, args.size), doc.ActiveView)
+    targets = [(rng.uniform(0, 1000), None, None) if i % 5 else None for i in range(len(anchors))]
+    ellipse = PolarPath((500.0, 500.0, 0.0), 600.0, 300.0, start_angle=0.3, end_angle=2.5, closed=False)
+
+    stages = [
+        ('off axis deviations', lambda parallel: get_line_deviations(curves.coords, 12.5, parallel=parallel)),
+        ('non-whole lengths', lambda parallel: get_non_whole_flags(lengths_mm, parallel=parallel)),
+        ('distribute deltas', lambda parallel: get_move_deltas(anchors, targets, parallel=parallel)),
+        ('polar targets', lambda parallel: get_polar_targets(ellipse, args.size, parallel=parallel)),
+    ]
+    mismatches = []
+    for name, stage in stages:
+        timings = []
+        results = []
+        for parallel in (False, True):
+            start = time.time()
+            results.append(stage(parallel))
+            timings.append(time.time() - start)
+        print('{0:<20} {1:>9} values  serial {2:>7.3f}s  threaded {3:>7.3f}s'.format(
+            name, len(results[0]), timings[0], timings[1]))
+        if results[0] != results[1]:
+            mismatches.append(name)
+    for name in mismatches:
+        print('MISMATCH ' + name)
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+# Drive every PyAtlasPro pushbutton against synthetic models without Revit.
+#
+#   python benchmarks/run_benchmarks.py --sizes 100,10000 --output report.json
+#   python benchmarks/run_benchmarks.py --compare old.json --output new.json
+#
+# Reports are plain JSON with sorted keys so two releases can be diffed.
+import argparse
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from fakerevit import api
+from scenarios import SCENARIOS, TAB_DIR
+
+LIB_DIR = os.path.join(TAB_DIR, 'lib')
+DEFAULT_SIZES = [100, 10000, 100000]
+
+
+def forget_lib_modules():
+    # Without rocket mode pyRevit starts every button press with a fresh
+    # engine, so lib modules are imported again on each run. The main report
+    # measures that cold case; startup_latency.py compares it with reuse.
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None) or ''
+        if module_file.startswith(LIB_DIR):
+            del sys.modules[name]
+
+
+def run_script(path, inputs):
+    answers = list(inputs)
+    builtins = __import__('builtins')
+    original_input = builtins.input
+    builtins.input = lambda prompt='': answers.pop(0)
+    sys.path.insert(0, LIB_DIR)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            runpy.run_path(path, run_name='__main__')
+    except SystemExit:
+        pass
+    finally:
+        builtins.input = original_input
+        sys.path.remove(LIB_DIR)
+
+
+def activate_scenario(builder, size):
+    # Build the model, make it the active document and preload the dialog
+    # answers. Returns the answers for input() prompts.
+    doc, selection, responses, inputs = builder(size)
+    fakerevit.activate(doc, selection)
+    responses = dict(responses)
+    # Saved script settings are passed under 'config'; everything else answers a dialog
+    config = responses.pop('config', {})
+    fakerevit.pyrevit_stub.config.__dict__.update(config)
+    fakerevit.pyrevit_stub.responses.update(responses)
+    return inputs
+
+
+def run_scenario(name, path, builder, size, warmup=0):
+    # `warmup` runs happen first on the same model and are not measured,
+    # so repeat clicks that hit session caches can be benchmarked. A builder
+    # can return an 'edit' response: a callable that changes the model
+    # between the warmup runs and the measured one, and a 'check' response: a
+    # callable that returns an error message when the measured run's API call
+    # counts are wrong.
+    inputs = activate_scenario(builder, size)
+    edit = fakerevit.pyrevit_stub.responses.pop('edit', None)
+    check = fakerevit.pyrevit_stub.responses.pop('check', None)
+    error = None
+    start = time.time()
+    try:
+        for i in range(warmup):
+            forget_lib_modules()
+            run_script(path, inputs)
+        if edit:
+            edit(fakerevit.pyrevit_stub.revit.doc)
+        api.reset()
+        forget_lib_modules()
+        start = time.time()
+        run_script(path, inputs)
+    except Exception as exc:
+        error = '{0}: {1}'.format(type(exc).__name__, exc)
+    seconds = time.time() - start
+    result = api.snapshot()
+    transactions = result.pop('transactions')
+    result.update({
+        'tool': name,
+        'size': size,
+        'seconds': round(seconds, 4),
+        'total_api_calls': sum(result['api_calls'].values()),
+        'transactions': len(transactions),
+        'transaction_calls': [t['calls'] for t in transactions],
+        'transaction_seconds': [round(t['seconds'], 4) for t in transactions],
+    })
+    if not error and check:
+        error = check(result['api_calls'])
+    if error:
+        result['error'] = error
+    return result
+
+
+def compare(previous, current):
+    before = dict(((r['tool'], r['size']), r) for r in previous)
+    lines = []
+    for result in current:
+        old = before.get((result['tool'], result['size']))
+        if not old:
+            continue
+        lines.append('{0:<32} {1:>7}  calls {2:>9} -> {3:<9}  seconds {4:>8.3f} -> {5:.3f}'.format(
+            result['tool'], result['size'], old['total_api_calls'], result['total_api_calls'],
+            old['seconds'], result['seconds']))
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark PyAtlasPro tools against a fake Revit API.')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='comma separated element counts')
+    parser.add_argument('--tools', default='', help='only run tools whose name contains this text')
+    parser.add_argument('--output', help='write the JSON report to this file')
+    parser.add_argument('--compare', help='previous JSON report to compare against')
+    args = parser.parse_args(argv)
+
+    fakerevit.install()
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    results = []
+    for scenario in SCENARIOS:
+        name, path, builder = scenario[:3]
+        warmup = scenario[3] if len(scenario) > 3 else 0
+        if args.tools.lower() not in name.lower():
+            continue
+        for size in sizes:
+            result = run_scenario(name, path, builder, size, warmup)
+            results.append(result)
+            print('{0:<32} {1:>7}  {2:>8.3f}s  {3:>9} calls  {4} transactions{5}'.format(
+                name, size, result['seconds'], result['total_api_calls'], result['transactions'],
+                '  ERROR ' + result['error'] if 'error' in result else ''))
+
+    if args.compare:
+        with open(args.compare) as f:
+            for line in compare(json.load(f)['results'], results):
+                print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'sizes': sizes, 'results': results}, f, indent=2, sort_keys=True)
+
+    return 1 if any('error' in r for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
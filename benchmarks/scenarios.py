@@ -0,0 +1,290 @@
+# Benchmark scenarios: one synthetic model per PyAtlasPro tool and size.
+# Each builder returns (doc, selection, responses, inputs). An optional fourth
+# entry is the number of unmeasured runs before the measured one.
+import itertools
+import json
+import math
+import os
+
+from fakerevit import db
+from fakerevit import factory
+from fakerevit import pyrevit_stub
+
+TAB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'PyAtlasPro.tab')
+
+ALIGNMENT = os.path.join('02 - Alignment.Panel', 'Element.stack', 'Alignment.pulldown')
+DISTRIBUTE = os.path.join('02 - Alignment.Panel', 'Element.stack', 'Distribute.pulldown')
+FIND_PANEL = '03 - Find.Panel'
+FIND = os.path.join(FIND_PANEL, 'Find.stack')
+COMPOSE = os.path.join('02 - Alignment.Panel', 'Element.stack')
+HEADS = os.path.join('04 - Heads.Panel', 'align1.stack')
+PERFORMANCE = '05 - Performance.Panel'
+
+
+def script_path(*parts):
+    return os.path.join(TAB_DIR, *(parts + ('script.py',)))
+
+
+def _annotation_selection(size):
+    doc = factory.new_document()
+    return doc, factory.add_annotations(doc, size), {}, []
+
+
+def _point_selection(size):
+    doc = factory.new_document()
+    return doc, factory.add_family_instances(doc, size), {}, []
+
+
+def _answers(*values):
+    # Answers the text boxes of one dialog title in turn, starting over when used up
+    answers = itertools.cycle(values)
+    return lambda items: next(answers)
+
+
+def _spacing_selection(title, *answers, **config):
+    # Distances typed into the tool's text boxes; `choices` answers its preview window
+    choices = config.pop('choices', None)
+
+    def build(size):
+        doc = factory.new_document()
+        responses = {title: _answers(*answers), 'config': config}
+        if choices:
+            responses['{0}: apply the previewed positions?'.format(title)] = _answers(*choices)
+        return doc, factory.add_family_instances(doc, size), responses, []
+    return build
+
+
+def _annotations_with_config(**config):
+    def build(size):
+        doc, selection, responses, inputs = _annotation_selection(size)
+        return doc, selection, {'config': config}, inputs
+    return build
+
+
+def _curved_selection(size):
+    doc = factory.new_document()
+    elements = factory.add_family_instances(doc, size)
+    points = [db.XYZ(i * 100.0, (i % 2) * 150.0, 0) for i in range(8)]
+    path = factory.add_model_curve(doc, db.HermiteSpline(points))
+    return doc, elements + [path], {}, []
+
+
+def _circle_selection(size):
+    doc = factory.new_document()
+    elements = factory.add_family_instances(doc, size)
+    circle = factory.add_model_curve(doc, db.Arc(db.XYZ(0, 0, 0), 500.0, 0.0, 2 * math.pi, bound=False))
+    return doc, [circle] + elements, {}, []
+
+
+def _path_selection(curve, **config):
+    # Elements to spread along `curve`, selected after it
+    def build(size):
+        doc = factory.new_document()
+        elements = factory.add_family_instances(doc, size)
+        path = factory.add_model_curve(doc, curve)
+        return doc, [path] + elements, {'config': config}, []
+    return build
+
+
+def _pipeline(builder, pipeline):
+    # Selection from `builder` with the steps typed into Compose Layout
+    def build(size):
+        doc, selection, responses, inputs = builder(size)
+        return doc, selection, {'Compose Layout': pipeline}, inputs
+    return build
+
+
+def _with_warnings(builder, warning='Highlighted elements overlap.'):
+    # Every element the tool changes posts a warning at commit
+    def build(size):
+        built = builder(size)
+        built[0]._warning = warning
+        return built
+    return build
+
+
+def _walls(size):
+    doc = factory.new_document()
+    factory.add_walls(doc, size)
+    return doc, [], {}, []
+
+
+def _walls_without_reads(size):
+    # The measured run must take every wall from the cache
+    def check(api_calls):
+        reads = api_calls.get('Element.Location', 0)
+        if reads:
+            return '{0} wall locations read; expected the cached walls'.format(reads)
+    doc, selection, responses, inputs = _walls(size)
+    responses['check'] = check
+    return doc, selection, responses, inputs
+
+
+def _with_config(builder, **config):
+    # The builder's model with script config set, e.g. the shared warning policy
+    def build(size):
+        doc, selection, responses, inputs = builder(size)
+        responses.setdefault('config', {}).update(config)
+        return doc, selection, responses, inputs
+    return build
+
+
+def _walls_with_config(**config):
+    def build(size):
+        doc, selection, responses, inputs = _walls(size)
+        return doc, selection, {'config': config}, inputs
+    return build
+
+
+def _walls_edited(count):
+    # Move `count` walls between the warmup run and the measured one
+    def edit(doc):
+        walls = db.FilteredElementCollector(doc).OfCategory(db.BuiltInCategory.OST_Walls).ToElements()
+        with db.Transaction(doc, 'Edit Walls') as t:
+            t.Start()
+            for wall in walls[:count]:
+                db.ElementTransformUtils.MoveElement(doc, wall.Id, db.XYZ(1, 0, 0))
+            t.Commit()
+
+    def build(size):
+        doc, selection, responses, inputs = _walls(size)
+        return doc, selection, {'edit': edit}, inputs
+    return build
+
+
+def _walls_highlighted(size):
+    # Find Walls highlights with overrides first; the measured run must reset
+    # every one of them
+    holder = {}
+
+    def edit(doc):
+        from run_benchmarks import forget_lib_modules, run_script
+        forget_lib_modules()
+        run_script(script_path(FIND, 'Find walls.pushbutton'), [])
+
+    def check(api_calls):
+        left = [settings for settings in holder['doc'].ActiveView.overrides.values() if settings.projection_line_color]
+        if left or not api_calls.get('View.SetElementOverrides'):
+            return '{0} wall highlights left after clearing'.format(len(left))
+
+    doc, selection, responses, inputs = _walls(size)
+    holder['doc'] = doc
+    return doc, selection, {'edit': edit, 'check': check}, inputs
+
+
+def _qa_model(size):
+    # Mostly walls with some beams and grids; one wall in ten is not of an allowed type
+    doc = factory.new_document()
+    factory.add_walls(doc, size - size // 5)
+    factory.add_beams(doc, size // 5 - size // 100)
+    factory.add_grids(doc, size // 100)
+    return doc, [], {'config': {'wall_types': ['Basic Wall']}}, []
+
+
+def _heads(datum_builder, action):
+    # `size` is the number of (datum, view) pairs: 100 datums across size / 100 views
+    def build(size):
+        doc = factory.new_document()
+        datum_count = min(size, 100)
+        factory.add_sheets(doc, max(1, size // datum_count))
+        datum_builder(doc, datum_count)
+        return doc, [], {'Choose action:': action}, []
+    return build
+
+
+def _viewport_sheets(mode='Match Viewports by View Type', patterns=None, edited=0):
+    # `size` viewports, four per sheet, scattered around the same spots; the
+    # first sheet is the reference. `edited` viewports are nudged between the
+    # warmup run and the measured one.
+    def edit(doc):
+        viewports = [e for e in doc.all_elements() if isinstance(e, db.Viewport)]
+        with db.Transaction(doc, 'Nudge Viewports') as t:
+            t.Start()
+            for viewport in viewports[-edited:]:
+                db.ElementTransformUtils.MoveElement(doc, viewport.Id, db.XYZ(0.1, 0, 0))
+            t.Commit()
+
+    def build(size):
+        doc = factory.new_document()
+        factory.add_sheets(doc, max(2, size // 4), views_per_sheet=4, jitter=0.05)
+        responses = {'Match viewports:': mode}
+        if patterns:
+            responses['Align Viewports'] = patterns
+        if edited:
+            responses['edit'] = edit
+        return doc, [], responses, []
+    return build
+
+
+def _performance_log(size):
+    # `size` logged runs spread over a few tools and element counts
+    doc = factory.new_document()
+    path = pyrevit_stub.get_universal_data_file('PyAtlasPro_performance', 'jsonl')
+    tools = ['Align Left', 'Distribute Grid', 'Find Walls', 'Grid Heads']
+    with open(path, 'w') as log:
+        for i in range(size):
+            log.write(json.dumps({'tool': tools[i % len(tools)], 'seconds': (i % 97) / 10.0,
+                                  'document_size_mb': (i % 7) * 100.0, 'elements_read': 10 ** (i % 5),
+                                  'elements_modified': 0, 'calls': {'MoveElement': i % 3}}) + '\n')
+    return doc, [], {}, []
+
+
+SCENARIOS = [
+    ('Align Left', script_path(ALIGNMENT, 'Left.pushbutton'), _annotation_selection),
+    ('Align Right', script_path(ALIGNMENT, 'Right.pushbutton'), _annotation_selection),
+    ('Align Top', script_path(ALIGNMENT, 'Top.pushbutton'), _annotation_selection),
+    ('Align Bottom', script_path(ALIGNMENT, 'Bottom.pushbutton'), _annotation_selection),
+    ('Align Horizontal', script_path(ALIGNMENT, 'Horizontal.pushbutton'), _annotation_selection),
+    ('Align Vertical', script_path(ALIGNMENT, 'Vertical.pushbutton'), _annotation_selection),
+    ('Distribute Horizontal', script_path(DISTRIBUTE, 'Horizontal.pushbutton'), _point_selection),
+    ('Distribute Vertical', script_path(DISTRIBUTE, 'Vertical.pushbutton'), _point_selection),
+    ('Distribute Horizontal (warnings)', script_path(DISTRIBUTE, 'Horizontal.pushbutton'), _with_warnings(_point_selection)),
+    ('Distribute Horizontal (rollback)', script_path(DISTRIBUTE, 'Horizontal.pushbutton'),
+     _with_warnings(_with_config(_point_selection, warning_policy='rollback'))),
+    ('Distribute Horizontal (gaps)', script_path(DISTRIBUTE, 'Horizontal.pushbutton'),
+     _annotations_with_config(spacing_mode='gaps')),
+    ('Distribute Vertical (no overlap)', script_path(DISTRIBUTE, 'Vertical.pushbutton'),
+     _annotations_with_config(spacing_mode='anchors_no_overlap')),
+    ('Compose Layout', script_path(COMPOSE, 'Compose.pushbutton'),
+     _pipeline(_point_selection, 'Align Left, Distribute Vertical, Align Top')),
+    ('Compose Layout (gaps)', script_path(COMPOSE, 'Compose.pushbutton'),
+     _pipeline(_annotation_selection, 'Align Left, Distribute Vertical (gaps), Align Horizontal')),
+    ('Distribute Grid', script_path(DISTRIBUTE, 'Grid.pushbutton'), _spacing_selection('Distribute Grid', '1000', '1000')),
+    ('Distribute Grid (changed once)', script_path(DISTRIBUTE, 'Grid.pushbutton'),
+     _spacing_selection('Distribute Grid', '500', '500', '1000', '1000', choices=('Change Distances', 'Apply'))),
+    ('Distribute Grid (no preview)', script_path(DISTRIBUTE, 'Grid.pushbutton'),
+     _spacing_selection('Distribute Grid', '1000', '1000', preview=False)),
+    ('Distribute Golden', script_path(DISTRIBUTE, 'Golden.pushbutton'), _spacing_selection('Distribute Golden', '100')),
+    ('Distribute Radial', script_path(DISTRIBUTE, 'Radial.pushbutton'), _spacing_selection('Distribute Radial', '5000')),
+    ('Distribute Radial (face center)', script_path(DISTRIBUTE, 'Radial.pushbutton'),
+     _spacing_selection('Distribute Radial', '', face_center=True)),
+    ('Distribute Circle', script_path(DISTRIBUTE, 'Circle.pushbutton'), _circle_selection),
+    ('Distribute Circle (arc)', script_path(DISTRIBUTE, 'Circle.pushbutton'),
+     _path_selection(db.Arc(db.XYZ(500, 500, 0), 400.0, 0.25 * math.pi, 0.75 * math.pi))),
+    ('Distribute Circle (ellipse)', script_path(DISTRIBUTE, 'Circle.pushbutton'),
+     _path_selection(db.Ellipse(db.XYZ(500, 500, 0), 600.0, 300.0, bound=False), face_center=True)),
+    ('Distribute Curved', script_path(DISTRIBUTE, 'Curved.pushbutton'), _curved_selection),
+    ('Find Walls', script_path(FIND, 'Find walls.pushbutton'), _walls),
+    ('Find Walls (filter)', script_path(FIND, 'Find walls.pushbutton'), _walls_with_config(highlight_mode='filter')),
+    ('Find Walls (overrides, warnings)', script_path(FIND, 'Find walls.pushbutton'),
+     _with_warnings(_walls_with_config(highlight_mode='overrides'), 'Highlighted walls overlap.')),
+    ('Find Walls (export)', script_path(FIND, 'Find walls.pushbutton'), _walls_with_config(export_format='csv')),
+    # a second check after three walls were edited
+    ('Find Walls (re-check)', script_path(FIND, 'Find walls.pushbutton'), _walls_edited(3), 1),
+    ('Clear Wall Check', script_path(FIND_PANEL, 'Clear Wall Check.pushbutton'), _walls_highlighted),
+    ('Bounding Walls', script_path(FIND, 'Bounding Walls.pushbutton'), _walls),
+    ('Isolate Off Axis', script_path(FIND, 'Isolate Off Axis.pushbutton'), _walls),
+    ('QA Check', script_path(FIND_PANEL, 'QA Check.pushbutton'), _qa_model),
+    ('Export Wall Snapshot', script_path(FIND_PANEL, 'Export Wall Snapshot.pushbutton'), _walls),
+    # isolate, turn off, then measure turning it on again from the cache
+    ('Isolate Off Axis (toggle)', script_path(FIND, 'Isolate Off Axis.pushbutton'), _walls_without_reads, 2),
+    ('Align Viewports', script_path(HEADS, 'Viewports.pushbutton'), _viewport_sheets()),
+    ('Align Viewports (patterns)', script_path(HEADS, 'Viewports.pushbutton'),
+     _viewport_sheets('Match Viewports by View Name Pattern', '*-0; *-2')),
+    ('Align Viewports (repeat)', script_path(HEADS, 'Viewports.pushbutton'), _viewport_sheets(edited=10), 1),
+    ('Level Heads', script_path(HEADS, 'Level.pushbutton'), _heads(factory.add_levels, 'Turn Off Left Level Heads')),
+    ('Grid Heads', script_path(HEADS, 'Grid.pushbutton'), _heads(factory.add_grids, 'Turn Off A-Side Grid Heads')),
+    # the same action again: every bubble is already in the requested state and the sheet index is cached
+    ('Grid Heads (repeat)', script_path(HEADS, 'Grid.pushbutton'), _heads(factory.add_grids, 'Turn Off A-Side Grid Heads'), 1),
+    ('Performance Report', script_path(PERFORMANCE, 'Performance Report.pushbutton'), _performance_log),
+]
@@ -0,0 +1,111 @@
+# Time the first press of a button after its lib modules were unloaded
+# against a repeated press with them kept loaded, for every PyAtlasPro tool.
+#
+#   python benchmarks/startup_latency.py --size 10 --repeat 5
+#
+# This is a proxy on the fake Revit API, not a pyRevit engine start. A cold
+# press runs in this process after forget_lib_modules(), with the lib modules
+# compiled again from source (no cached bytecode), which is the part of a
+# fresh engine that PyAtlasPro controls. Starting the IronPython engine and
+# loading the real Revit API are not included. A warm press runs the same
+# button again with the lib modules still loaded, as rocket mode reuses them.
+import argparse
+import contextlib
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import fakerevit
+from run_benchmarks import activate_scenario, forget_lib_modules, run_script
+from scenarios import SCENARIOS
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def find_scenario(name):
+    for scenario in SCENARIOS:
+        if scenario[0] == name:
+            return scenario
+    raise KeyError(name)
+
+
+@contextlib.contextmanager
+def no_bytecode_cache():
+    # Point the bytecode cache at an empty folder and write nothing to it, so
+    # every import compiles its module from source
+    folder = tempfile.mkdtemp()
+    prefix, dont_write = sys.pycache_prefix, sys.dont_write_bytecode
+    sys.pycache_prefix, sys.dont_write_bytecode = folder, True
+    try:
+        yield
+    finally:
+        sys.pycache_prefix, sys.dont_write_bytecode = prefix, dont_write
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def time_cold(name, size, repeat):
+    fakerevit.install()
+    path, builder = find_scenario(name)[1:3]
+    seconds = []
+    for i in range(repeat):
+        inputs = activate_scenario(builder, size)
+        forget_lib_modules()
+        importlib.invalidate_caches()
+        with no_bytecode_cache():
+            start = time.time()
+            run_script(path, inputs)
+            seconds.append(time.time() - start)
+    return seconds
+
+
+def time_warm(name, size, repeat):
+    fakerevit.install()
+    path, builder = find_scenario(name)[1:3]
+    forget_lib_modules()
+    inputs = activate_scenario(builder, size)
+    # The first press loads the lib modules; the measured ones reuse them
+    run_script(path, inputs)
+    seconds = []
+    for i in range(repeat):
+        inputs = activate_scenario(builder, size)
+        start = time.time()
+        run_script(path, inputs)
+        seconds.append(time.time() - start)
+    return seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare cold and warm engine button presses.')
+    parser.add_argument('--size', type=int, default=10, help='element count of each synthetic model')
+    parser.add_argument('--repeat', type=int, default=5, help='measured presses per tool and mode')
+    parser.add_argument('--tools', default='', help='only run tools whose name contains this text')
+    args = parser.parse_args(argv)
+
+    print('Fake-API proxy: cold is a first press after unloading and recompiling the lib modules,')
+    print('not a pyRevit engine start.')
+    print('{0:<28} {1:>10} {2:>10} {3:>8}'.format('tool', 'cold ms', 'warm ms', 'ratio'))
+    names = []
+    for scenario in SCENARIOS:
+        if args.tools.lower() in scenario[0].lower() and scenario[0] not in names:
+            names.append(scenario[0])
+    for name in names:
+        cold = median(time_cold(name, args.size, args.repeat))
+        warm = median(time_warm(name, args.size, args.repeat))
+        print('{0:<28} {1:>10.1f} {2:>10.1f} {3:>7.0f}x'.format(name, cold * 1000, warm * 1000, cold / max(warm, 1e-6)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())